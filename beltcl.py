@@ -148,7 +148,7 @@ class Gt2BeltClamp (object):
     CBASE_L = CB_L + CS + 2*CCYL_R
 
     def __init__(self, base_h, midblock, name):
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.base_place = (0,0,0)
         # Clamp base
         self.CBASE_H = base_h
@@ -470,7 +470,7 @@ def shp_topbeltclamp (railaxis = 'x', bot_norm = '-z', pos = V0, extra=1):
 def fco_topbeltclamp (railaxis = 'x', bot_norm = '-z', pos = V0, extra=1,
                       name = "bclamp"):
 
-    doc = FreeCAD.ActiveDocument
+    doc = fcfun.get_doc()
     shptopbeltclamp = shp_topbeltclamp (railaxis = railaxis,
                                         bot_norm = bot_norm,
                                         pos = pos, extra= extra)
@@ -485,7 +485,7 @@ def fco_topbeltclamp (railaxis = 'x', bot_norm = '-z', pos = V0, extra=1,
 
 # ----------- shp_topbeltclamp_dir
 
-class BeltClamp (object):
+class BeltClamp (fc_clss.LeanShp):
 
     """ Similar to shp_topbeltclamp, but with any direction, and 
         can have a base
@@ -601,7 +601,7 @@ class BeltClamp (object):
                  intol = 0,
                  name = 'belt_clamp' ):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.name = name
 
         # if more tolerance is needed in the center
@@ -871,10 +871,12 @@ class BeltClamp (object):
             fco_clamp = doc.addObject("Part::Feature", name )
             fco_clamp.Shape = shp_clamp
             self.fco = fco_clamp
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Clamp object with no fco")
         
@@ -1377,6 +1379,11 @@ class DoubleBeltClamp (shp_clss.Obj3D):
                 4: up base
                 5: down base
 
+        mirror_build: 1: the clamp blocks and the bolt of one side are the
+                      mirror image of the other side. It should give the
+                      same piece, it is checked against the pieces built
+                      without mirroring by fcregress
+
     """
     def __init__(self, 
                 axis_h = VZ,
@@ -1392,8 +1399,9 @@ class DoubleBeltClamp (shp_clss.Obj3D):
                 extra=1,
                 wfco = 1,
                 intol = 0,
-                name = 'double_belt_clamp' ):
-        doc = FreeCAD.ActiveDocument
+                name = 'double_belt_clamp',
+                mirror_build = 0):
+        doc = fcfun.get_doc()
         self.name = name
         
         self.axis_d = axis_d
@@ -1534,14 +1542,21 @@ class DoubleBeltClamp (shp_clss.Obj3D):
                                              pos = clampblock_1_pos - clampblock_side_add)
         
         shp_cyl_2 = fcfun.shp_cyl(CCYL_R, clamp_tot_h, self.axis_h, clampcyl_pos_2 - FreeCAD.Vector(0,0,self.base_h/2))
-        shp_clampblock_2_a = fcfun.shp_box_dir(box_w = cb_wall_w,
+        if mirror_build == 1:
+            # the clamp blocks of side 2 are the mirror image of side 1,
+            # on the plane normal to axis_d. The cylinders are not, they
+            # are on different heights
+            shp_clampblock_2_a = shp_clampblock_1_a.mirror(V0, self.axis_d)
+            shp_clampblock_2_b = shp_clampblock_1_b.mirror(V0, self.axis_d)
+        else:
+            shp_clampblock_2_a = fcfun.shp_box_dir(box_w = cb_wall_w,
                                              box_d = CB_L,
                                              box_h = clamp_tot_h,
                                              fc_axis_h = self.axis_h,
                                              fc_axis_d = self.axis_d,
                                              cw=1, cd=1, ch=0,
                                              pos = clampblock_2_pos + clampblock_side_add)
-        shp_clampblock_2_b = fcfun.shp_box_dir(box_w = cb_wall_w,
+            shp_clampblock_2_b = fcfun.shp_box_dir(box_w = cb_wall_w,
                                              box_d = CB_L,
                                              box_h = clamp_tot_h,
                                              fc_axis_h = self.axis_h,
@@ -1568,7 +1583,11 @@ class DoubleBeltClamp (shp_clss.Obj3D):
                                             support=0,
                                             fc_normal = self.axis_h,
                                             pos=pos_bolt_1)
-                shp_bolt_2 = fcfun.shp_bolt_dir(
+                if mirror_build == 1:
+                    # bolt 2 is the mirror image of bolt 1
+                    shp_bolt_2 = shp_bolt_1.mirror(V0, self.axis_d)
+                else:
+                    shp_bolt_2 = fcfun.shp_bolt_dir(
                                             r_shank = bolt_shank_r,
                                             l_bolt = base_h + extra,
                                             r_head = bolt_head_r,
@@ -0,0 +1,441 @@
+# ----------------------------------------------------------------------------
+# -- Belt path
+# -- comps library
+# -- Path of a belt going around a list of pulleys and idlers:
+# -- length, number of teeth, wrap angles, wire and shape
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The belt path is calculated on the plane of the belt, with 2D coordinates
+# (d, w) and only floats, so it is fast to evaluate many positions of the
+# pulleys. The FreeCAD wire and the shape are only made when they are asked
+# (belt_path_wire, shp_belt_path). Then, the 2D coordinates are taken along
+# axis_d and axis_w, from pos
+#
+# Each pulley (or idler) is a tuple (pos_dw, rad, side):
+#   pos_dw: tuple (d, w) with the center of the pulley
+#   rad: radius of the pitch line of the belt on the pulley
+#        (see gt_pulley_pitch_r and gt_idler_pitch_r)
+#   side:  1: the belt goes around the pulley counterclockwise
+#             (pulley on the left of the belt path)
+#         -1: the belt goes around the pulley clockwise
+#             (pulley on the right of the belt path)
+#
+# If the path is counterclockwise, the pulleys inside the belt loop have
+# side 1 and the idlers outside the loop (on the back of the belt) have
+# side -1
+#
+#      axis_w
+#        :             side -1
+#        :              ( )
+#        :  ___________/   \___________
+#        : /     <-----           <--- \
+#        :( 1  )                   ( 0  )  side 1
+#        : \_____________--->________/
+#        :
+#        :.................. axis_d
+#
+# The radius with the sign of the side (srad = side * rad) is used in the
+# calculations: a tangent point is at: center - srad * nl
+# where nl is the normal to the left of the direction of the belt.
+# So the tangent from pulley 1 to pulley 2, with an angle theta is:
+#        sin(phi - theta) = (srad2 - srad1) / dist
+# phi is the angle of the line from center 1 to center 2, dist its length
+#
+# To make a path of a belt that has its ends clamped, the ends can be
+# given as pulleys of radius 0, with closed = 0
+
+import math
+import logging
+import FreeCAD
+import Part
+import DraftVecUtils
+
+import os
+import sys
+# directory this file is
+filepath = os.getcwd()
+# to get the components
+# In FreeCAD can be added: Preferences->General->Macro->Macro path
+sys.path.append(filepath)
+
+import kcomp
+import fcfun
+
+from fcfun import V0, VX, VY
+
+
+logger = logging.getLogger(__name__)
+
+TWO_PI = 2 * math.pi
+
+
+def gt_pulley_pitch_r (n_teeth, pitch = 2.):
+    """ Radius of the pitch line of the belt on a GT pulley
+
+    Parameters:
+    -----------
+    n_teeth : int
+        number of teeth of the pulley
+    pitch : float
+        separation of the teeth of the belt: 2 for GT2
+
+    Returns:
+    --------
+    float: radius of the pitch line
+    """
+    return n_teeth * pitch / TWO_PI
+
+
+def gt_idler_pitch_r (idler_r, back = 1, d_belt = kcomp.GT2):
+    """ Radius of the pitch line of the belt on an idler pulley
+    (a bearing or a pulley without teeth)
+
+    Parameters:
+    -----------
+    idler_r : float
+        external radius of the idler
+    back : int
+        1: the back of the belt (no teeth) touches the idler
+        0: the teeth of the belt touch the idler
+    d_belt : dict
+        dimensions of the belt, see kcomp.GT
+
+    Returns:
+    --------
+    float: radius of the pitch line
+    """
+    if back == 1:
+        return idler_r + d_belt['BELT_H'] - d_belt['TOOTH_H'] - d_belt['PLD']
+    else:
+        return idler_r + d_belt['TOOTH_H'] + d_belt['PLD']
+
+
+def tangent_seg (c1_dw, srad1, c2_dw, srad2):
+    """ Tangent line that goes from circle 1 to circle 2
+
+    Parameters:
+    -----------
+    c1_dw : tuple (d, w)
+        center of circle 1
+    srad1 : float
+        radius of circle 1 with the sign of its side
+    c2_dw : tuple (d, w)
+        center of circle 2
+    srad2 : float
+        radius of circle 2 with the sign of its side
+
+    Returns:
+    --------
+    tuple (theta, length, t1_dw, t2_dw)
+        theta: angle of the direction of the belt, in radians
+        length: length of the tangent line
+        t1_dw, t2_dw: tangent points on circle 1 and 2
+    0 if there is no tangent line
+    """
+    dd = c2_dw[0] - c1_dw[0]
+    dw = c2_dw[1] - c1_dw[1]
+    dist = math.hypot(dd, dw)
+    srad_dif = srad2 - srad1
+    if dist <= abs(srad_dif):
+        logger.error('No tangent line between circles at %s and %s',
+                     str(c1_dw), str(c2_dw))
+        return 0
+    theta = math.atan2(dw, dd) - math.asin(srad_dif / dist)
+    length = math.sqrt(dist * dist - srad_dif * srad_dif)
+    # normal to the left of the direction of the belt
+    nl_d = - math.sin(theta)
+    nl_w = math.cos(theta)
+    t1_dw = (c1_dw[0] - srad1 * nl_d, c1_dw[1] - srad1 * nl_w)
+    t2_dw = (c2_dw[0] - srad2 * nl_d, c2_dw[1] - srad2 * nl_w)
+    return (theta, length, t1_dw, t2_dw)
+
+
+def belt_path (pulley_list, pitch = 2., closed = 1, offset = 0):
+    """ Calculates the path of a belt around a list of pulleys.
+    No FreeCAD shapes are made
+
+    Parameters:
+    -----------
+    pulley_list : list of tuples (pos_dw, rad, side)
+        pulleys and idlers, in the order of the belt, see the beginning
+        of this file
+    pitch : float
+        separation of the teeth of the belt, to calculate the number of
+        teeth: 2 for GT2
+    closed : int
+        1: the belt goes from the last pulley to the first one
+        0: the belt ends at the first and the last pulley
+    offset : float
+        distance of the path to the right of the pitch line. It is added
+        to the radius with the sign of the side. It is used to make
+        the sides of the belt
+
+    Returns:
+    --------
+    dict with:
+        'length' : total length of the belt
+        'teeth' : length / pitch (float, it should be an integer to have
+                  a closed belt)
+        'tan_len' : list of the length of the tangent lines
+        'tan_pts' : list of tuples with the 2 tangent points of each line
+        'tan_ang' : list of the angles of the direction of the belt on
+                    each tangent line
+        'wrap' : list of the wrap angles (radians) on each pulley.
+                 0 on the ends of an open belt
+        'arc_len' : list of the length of the belt on each pulley
+    0 if the path cannot be made
+    """
+    n_pull = len(pulley_list)
+    if n_pull < 2:
+        logger.error('At least 2 pulleys are needed for a belt path')
+        return 0
+
+    srad_list = [side * rad + offset for (pos_dw, rad, side) in pulley_list]
+    if closed == 1:
+        n_tan = n_pull
+    else:
+        n_tan = n_pull - 1
+
+    tan_len = []
+    tan_pts = []
+    tan_ang = []
+    for i in range(n_tan):
+        j = (i + 1) % n_pull
+        tan_i = tangent_seg(pulley_list[i][0], srad_list[i],
+                            pulley_list[j][0], srad_list[j])
+        if tan_i == 0:
+            return 0
+        theta, length, t1_dw, t2_dw = tan_i
+        tan_ang.append(theta)
+        tan_len.append(length)
+        tan_pts.append((t1_dw, t2_dw))
+
+    wrap = [0.] * n_pull
+    arc_len = [0.] * n_pull
+    for i in range(n_pull):
+        if closed == 0 and (i == 0 or i == n_pull - 1):
+            continue
+        # angle of the belt arriving to and leaving the pulley
+        ang_in = tan_ang[i - 1]
+        ang_out = tan_ang[i]
+        if srad_list[i] >= 0:
+            wrap_i = (ang_out - ang_in) % TWO_PI
+        else:
+            wrap_i = (ang_in - ang_out) % TWO_PI
+        wrap[i] = wrap_i
+        arc_len[i] = abs(srad_list[i]) * wrap_i
+
+    length = sum(tan_len) + sum(arc_len)
+    return {'length'  : length,
+            'teeth'   : length / pitch,
+            'tan_len' : tan_len,
+            'tan_pts' : tan_pts,
+            'tan_ang' : tan_ang,
+            'wrap'    : wrap,
+            'arc_len' : arc_len}
+
+
+def belt_path_batch (pulley_list_list, pitch = 2., closed = 1):
+    """ Calculates the paths of many belts, to compare different positions
+    of the pulleys. Only the length is calculated, see belt_path.
+    The belts with the same number of pulleys are calculated together,
+    with NumPy arrays: the tangent lines and the wrap angles of all of them
+    are calculated at once. NumPy is only needed for this function
+
+    Parameters:
+    -----------
+    pulley_list_list : list of lists of tuples (pos_dw, rad, side)
+        each element is a pulley_list of belt_path
+    pitch : float
+    closed : int
+
+    Returns:
+    --------
+    list of tuples (length, teeth), one for each pulley_list.
+    0 for the pulley_lists that cannot make a path
+    """
+    import numpy as np
+
+    result_list = [0] * len(pulley_list_list)
+    # index of the belts by number of pulleys
+    n_pull_dict = {}
+    for belt_i, pulley_list in enumerate(pulley_list_list):
+        n_pull_dict.setdefault(len(pulley_list), []).append(belt_i)
+
+    for n_pull, belt_i_list in n_pull_dict.items():
+        if n_pull < 2:
+            logger.error('At least 2 pulleys are needed for a belt path')
+            continue
+        # (n_belt, n_pull, 2) centers, (n_belt, n_pull) radii with sign
+        cen = np.array([[pos_dw for (pos_dw, rad, side)
+                         in pulley_list_list[belt_i]]
+                        for belt_i in belt_i_list], dtype = float)
+        srad = np.array([[side * rad for (pos_dw, rad, side)
+                          in pulley_list_list[belt_i]]
+                         for belt_i in belt_i_list], dtype = float)
+        if closed == 1:
+            n_tan = n_pull
+        else:
+            n_tan = n_pull - 1
+        # tangent line i goes from pulley i to pulley j = i + 1
+        i_arr = np.arange(n_tan)
+        j_arr = (i_arr + 1) % n_pull
+        dif = cen[:, j_arr] - cen[:, i_arr]
+        dist = np.hypot(dif[..., 0], dif[..., 1])
+        srad_dif = srad[:, j_arr] - srad[:, i_arr]
+        ok_tan = dist > np.abs(srad_dif)
+        # the belts without tangent lines are not taken, but the arrays
+        # are calculated for all of them
+        dist = np.where(ok_tan, dist, 1.)
+        srad_dif = np.where(ok_tan, srad_dif, 0.)
+        tan_ang = (np.arctan2(dif[..., 1], dif[..., 0])
+                   - np.arcsin(srad_dif / dist))
+        tan_len = np.sqrt(dist * dist - srad_dif * srad_dif)
+
+        # angle of the belt arriving to (line i-1) and leaving (line i)
+        # each pulley. In an open belt, the ends have no arc
+        if closed == 1:
+            p_arr = np.arange(n_pull)
+        else:
+            p_arr = np.arange(1, n_pull - 1)
+        ang_in = tan_ang[:, p_arr - 1]
+        ang_out = tan_ang[:, p_arr]
+        srad_p = srad[:, p_arr]
+        wrap = np.where(srad_p >= 0,
+                        np.mod(ang_out - ang_in, TWO_PI),
+                        np.mod(ang_in - ang_out, TWO_PI))
+        length = tan_len.sum(axis = 1) + (np.abs(srad_p) * wrap).sum(axis = 1)
+
+        ok_belt = ok_tan.all(axis = 1)
+        for k, belt_i in enumerate(belt_i_list):
+            if ok_belt[k]:
+                result_list[belt_i] = (float(length[k]),
+                                       float(length[k]) / pitch)
+            else:
+                logger.error('No tangent line in the belt path %d', belt_i)
+    return result_list
+
+
+def belt_path_wire (pulley_list, closed = 1, offset = 0,
+                    axis_d = VX, axis_w = VY, pos = V0):
+    """ Makes the wire of the path of a belt around a list of pulleys
+
+    Parameters:
+    -----------
+    pulley_list : list of tuples (pos_dw, rad, side)
+        see belt_path
+    closed : int
+        see belt_path
+    offset : float
+        see belt_path
+    axis_d : FreeCAD.Vector
+        direction of the first coordinate of the plane of the belt
+    axis_w : FreeCAD.Vector
+        direction of the second coordinate of the plane of the belt,
+        perpendicular to axis_d
+    pos : FreeCAD.Vector
+        position of the origin of the 2D coordinates
+
+    Returns:
+    --------
+    Part.Wire
+    0 if the path cannot be made
+    """
+    path = belt_path(pulley_list, closed = closed, offset = offset)
+    if path == 0:
+        return 0
+    axis_d = DraftVecUtils.scaleTo(axis_d, 1)
+    axis_w = DraftVecUtils.scaleTo(axis_w, 1)
+
+    def fcvec (pt_dw):
+        return (  pos + DraftVecUtils.scale(axis_d, pt_dw[0])
+                + DraftVecUtils.scale(axis_w, pt_dw[1]))
+
+    n_pull = len(pulley_list)
+    n_tan = len(path['tan_pts'])
+    edge_list = []
+    for i in range(n_tan):
+        t1_dw, t2_dw = path['tan_pts'][i]
+        if path['tan_len'][i] > fcfun.EQUAL_TOL:
+            edge_list.append(Part.LineSegment(fcvec(t1_dw),
+                                              fcvec(t2_dw)).toShape())
+        # arc on the next pulley
+        j = (i + 1) % n_pull
+        wrap_j = path['wrap'][j]
+        if path['arc_len'][j] > fcfun.EQUAL_TOL:
+            pos_dw, rad, side = pulley_list[j]
+            srad = side * rad + offset
+            if srad >= 0:
+                ang_mid = path['tan_ang'][i] + wrap_j / 2.
+            else:
+                ang_mid = path['tan_ang'][i] - wrap_j / 2.
+            mid_dw = (pos_dw[0] + srad * math.sin(ang_mid),
+                      pos_dw[1] - srad * math.cos(ang_mid))
+            arc_end_dw = path['tan_pts'][j % n_tan][0]
+            edge_list.append(Part.Arc(fcvec(t2_dw), fcvec(mid_dw),
+                                      fcvec(arc_end_dw)).toShape())
+    return Part.Wire(edge_list)
+
+
+def shp_belt_path (pulley_list, belt_thick, belt_w,
+                   axis_d = VX, axis_w = VY,
+                   ref_h = 1,
+                   pos = V0):
+    """ Makes the shape of a closed belt around a list of pulleys.
+    It is a band of thickness belt_thick centered on the pitch line,
+    the teeth are not made
+
+    Parameters:
+    -----------
+    pulley_list : list of tuples (pos_dw, rad, side)
+        see belt_path
+    belt_thick : float
+        thickness of the belt
+    belt_w : float
+        width of the belt, along the normal of the plane of the belt
+        axis_d x axis_w
+    axis_d : FreeCAD.Vector
+    axis_w : FreeCAD.Vector
+        see belt_path_wire
+    ref_h : int
+        1: pos is at the center of the width of the belt
+        2: pos is at the bottom of the belt
+    pos : FreeCAD.Vector
+
+    Returns:
+    --------
+    TopoShape
+    0 if the shape cannot be made
+    """
+    axis_h = DraftVecUtils.scaleTo(axis_d.cross(axis_w), 1)
+    if ref_h == 1:
+        basepos = pos + DraftVecUtils.scale(axis_h, -belt_w / 2.)
+    else:
+        basepos = pos
+    wire_out = belt_path_wire(pulley_list, closed = 1,
+                              offset = belt_thick / 2.,
+                              axis_d = axis_d, axis_w = axis_w,
+                              pos = basepos)
+    wire_in = belt_path_wire(pulley_list, closed = 1,
+                             offset = - belt_thick / 2.,
+                             axis_d = axis_d, axis_w = axis_w,
+                             pos = basepos)
+    if wire_out == 0 or wire_in == 0:
+        return 0
+    dir_extrud = DraftVecUtils.scale(axis_h, belt_w)
+    # one of the wires is inside the other, depending on the direction
+    # of the path
+    shp_face_out = Part.Face(wire_out)
+    shp_face_in = Part.Face(wire_in)
+    if shp_face_out.Area > shp_face_in.Area:
+        shp_face = shp_face_out.cut(shp_face_in)
+    else:
+        shp_face = shp_face_in.cut(shp_face_out)
+    return shp_face.extrude(dir_extrud)
+
@@ -0,0 +1,111 @@
+# ----------------------------------------------------------------------------
+# -- Build manifest
+# -- comps library
+# -- Artifacts of stl/ and step/ and how they are made, see fcbuild.py
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Each artifact is a dictionary:
+#  'name'    : name of the artifact, and of its files
+#  'module'  : module of the class
+#  'cls'     : class that makes it
+#  'params'  : parameters of the class. The constants of kcomp, kcomp_optic
+#              and kparts have to be given with fcbuild.KRef, to be tracked
+#  'export'  : export options: 'stl' : 1, 'step' : 1
+#  'parts'   : optional. Suffixes of the fco attributes of the object, for
+#              the classes that make several pieces: ['_top', '_bot'] for
+#              fco_top and fco_bot. Each one has its own file.
+#              For a fc_clss.PartsSet, one suffix for each part of
+#              parts_lst that is exported, in order
+#  'outputs' : optional. Output files, relative to the library directory,
+#              when they don't follow the names stl/name[suffix].stl
+
+import os
+import sys
+import FreeCAD
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+from fcbuild import KRef
+
+V0 = FreeCAD.Vector(0,0,0)
+VX = FreeCAD.Vector(1,0,0)
+VZ = FreeCAD.Vector(0,0,1)
+VZN = FreeCAD.Vector(0,0,-1)
+
+BUILD_LIST = [
+    {'name'   : 'sk8_tol03',
+     'module' : 'comps',
+     'cls'    : 'Sk_dir',
+     'params' : {'size' : 8,
+                 'fc_axis_h' : VX,
+                 'fc_axis_d' : VZ,
+                 'fc_axis_w' : V0,
+                 'ref_hr' : 0,
+                 'ref_wc' : 0,
+                 'ref_dc' : 0,
+                 'pillow' : 0,
+                 'pos' : V0,
+                 'tol' : 0.3,
+                 'wfco' : 1,
+                 'name' : 'sk8_tol03'},
+     'export' : {'stl' : 1}},
+
+    {'name'   : 'beltclamp_m3',
+     'module' : 'beltcl',
+     'cls'    : 'BeltClamp',
+     'params' : {'fc_fro_ax' : VX,
+                 'fc_top_ax' : VZ,
+                 'base_h' : 0,
+                 'bolt_d' : 3,
+                 'bolt_csunk' : 2,
+                 'wfco' : 1,
+                 'name' : 'beltclamp_m3'},
+     'export' : {'stl' : 1, 'step' : 1}},
+
+    {'name'   : 'linbearhouse_sc8uu',
+     'module' : 'parts',
+     'cls'    : 'LinBearHouse',
+     'params' : {'d_lbearhousing' : KRef('kcomp', 'SCUU', 8),
+                 'name' : 'linbearhouse_sc8uu'},
+     'parts'  : ['_top', '_bot'],
+     'export' : {'stl' : 1}},
+
+    {'name'   : 'linbearhouse_sc10uu',
+     'module' : 'parts',
+     'cls'    : 'LinBearHouse',
+     'params' : {'d_lbearhousing' : KRef('kcomp', 'SCUU', 10),
+                 'name' : 'linbearhouse_sc10uu'},
+     'parts'  : ['_top', '_bot'],
+     'export' : {'stl' : 1}},
+
+    {'name'   : 'linbearhouse_sc12uu',
+     'module' : 'parts',
+     'cls'    : 'LinBearHouse',
+     'params' : {'d_lbearhousing' : KRef('kcomp', 'SCUU', 12),
+                 'name' : 'linbearhouse_sc12uu'},
+     'parts'  : ['_top', '_bot'],
+     'export' : {'stl' : 1}},
+
+    # motor_min_h and motor_max_h in the name
+    {'name'   : 'nema17holder_25_55',
+     'module' : 'parts',
+     'cls'    : 'NemaMotorHolder',
+     'params' : {'nema_size' : 17,
+                 'motor_min_h' : 25.,
+                 'motor_max_h' : 55.,
+                 'fc_axis_h' : VZN,
+                 'fc_axis_n' : VX,
+                 'wfco' : 1,
+                 'name' : 'nema17holder_25_55'},
+     'export' : {'stl' : 1, 'step' : 1}},
+]
+
+# name -> artifact
+ARTIFACT_DICT = dict((artifact['name'], artifact) for artifact in BUILD_LIST)
@@ -20,7 +20,6 @@ import os
 import sys
 import inspect
 import FreeCAD
-import FreeCADGui
 import Part
 import Draft
 import logging
@@ -58,8 +57,10 @@ logging.basicConfig(level=logging.DEBUG,
 
 #doc = FreeCAD.newDocument()
 
-Gui.ActiveDocument = Gui.getDocument(doc.Label)
-guidoc = Gui.getDocument(doc.Label)
+if FreeCAD.GuiUp:
+    import FreeCADGui as Gui
+    Gui.ActiveDocument = Gui.getDocument(doc.Label)
+    guidoc = Gui.getDocument(doc.Label)
 
 
 class ShpSingleTurnConmut (shp_clss.Obj3D):
@@ -307,20 +308,20 @@ shp_brush_r = shp_brush_r.cut(shp_cyl_conmut)
 doc = FreeCAD.newDocument()
 
 fco_cable = fcfun.add_fcobj(turn.shp_cable, "espira", doc)
-fco_cable.ViewObject.ShapeColor = fcfun.YELLOW_05
-fco_cable.ViewObject.LineWidth = 1
+fcfun.set_fco_view(fco_cable, ShapeColor = fcfun.YELLOW_05,
+                              LineWidth = 1)
 fco_conmut_l = fcfun.add_fcobj(turn.shp_conmut_l, "conmut1", doc)
-fco_conmut_l.ViewObject.ShapeColor = fcfun.CIAN
-fco_conmut_l.ViewObject.LineWidth = 1
+fcfun.set_fco_view(fco_conmut_l, ShapeColor = fcfun.CIAN,
+                                 LineWidth = 1)
 fco_conmut_r = fcfun.add_fcobj(turn.shp_conmut_r, "conmut2", doc)
-fco_conmut_r.ViewObject.ShapeColor = fcfun.RED
-fco_conmut_r.ViewObject.LineWidth = 1
+fcfun.set_fco_view(fco_conmut_r, ShapeColor = fcfun.RED,
+                                 LineWidth = 1)
 fco_brush_l = fcfun.add_fcobj(shp_brush_l, "escobilla1", doc)
-fco_brush_l.ViewObject.ShapeColor = fcfun.ORANGE
-fco_brush_l.ViewObject.LineWidth = 1
+fcfun.set_fco_view(fco_brush_l, ShapeColor = fcfun.ORANGE,
+                                LineWidth = 1)
 fco_brush_r = fcfun.add_fcobj(shp_brush_r, "escobilla2", doc)
-fco_brush_r.ViewObject.ShapeColor = fcfun.GREEN
-fco_brush_r.ViewObject.LineWidth = 1
+fcfun.set_fco_view(fco_brush_r, ShapeColor = fcfun.GREEN,
+                                LineWidth = 1)
 
 #fcfun.RotateView(1,0,0,20)
 
@@ -330,15 +331,16 @@ axisY = 0
 axisZ = 0
 angle = 20
 
-Gui.ActiveDocument.ActiveView.viewFront()
-
-import math
-from pivy import coin
-cam = Gui.ActiveDocument.ActiveView.getCameraNode()
-rot = coin.SbRotation()
-rot.setValue(coin.SbVec3f(axisX,axisY,axisZ),math.radians(angle))
-nrot = cam.orientation.getValue() * rot
-cam.orientation = nrot
-print axisX," ",axisY," ",axisZ," ",angle
+if FreeCAD.GuiUp:
+    Gui.ActiveDocument.ActiveView.viewFront()
+
+    import math
+    from pivy import coin
+    cam = Gui.ActiveDocument.ActiveView.getCameraNode()
+    rot = coin.SbRotation()
+    rot.setValue(coin.SbVec3f(axisX,axisY,axisZ),math.radians(angle))
+    nrot = cam.orientation.getValue() * rot
+    cam.orientation = nrot
+    print(axisX," ",axisY," ",axisZ," ",angle)
 
 
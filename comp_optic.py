@@ -36,6 +36,8 @@ import kcomp
 import kcomp_optic
 import fcfun
 import kparts 
+import shp_fastener
+import fc_clss
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, addCyl_pos, fillet_len
 from fcfun import VXN, VYN, VZN
@@ -47,6 +49,281 @@ logging.basicConfig(level=logging.DEBUG,
 
 logger = logging.getLogger(__name__)
 
+# ---------------------- Symmetric construction of the cage cubes -----------
+#
+# The holes of a cage cube are the same on the faces that are related by
+# a rotation of the cube. So the holes of one face are made once, at the
+# canonical orientation (axis_thru_rods = 'x', axis_thru_hole = 'y'), and
+# they are placed on the other faces with the rotations of the cube.
+# The placed copies are put in a compound and cut in one operation.
+# The finished shape of the canonical cube is rotated to get the other
+# orientations. The shapes are kept in CAGECUBE_CACHE, so many identical
+# cubes share the same shape
+#
+#  canonical cage cube:
+#
+#           Z: rod screws
+#           :
+#        ___:___
+#       | o : o |
+#       |  ( )..|..... Y: thru hole (axis of the big hole)
+#       |_o___o_|
+#
+#       X: thru rods
+#
+
+# shapes of the finished cage cubes. The key has the dimensions and the
+# orientation of the cube
+CAGECUBE_CACHE = {}
+
+# rotations of the cube around axis X: 0, 90, 180 and 270 degrees,
+# as (axis_x, axis_z, pos), see shp_fastener.shp_tool_compound
+# The faces perpendicular to the thru rods (X) are the ones that stay
+CAGECUBE_ROT4_X = [(VX, VZ, V0), (VX, VYN, V0), (VX, VZN, V0), (VX, VY, V0)]
+# rotations that take face +Y to face +Y and -Y: 0 and 180 degrees around X
+CAGECUBE_ROT2_X = [(VX, VZ, V0), (VX, VZN, V0)]
+# rotations that take face +X to face +X and +Y: 0 and 180 degrees around
+# the diagonal X+Y, used for the half cage cube
+CAGECUBEHALF_ROT2_XY = [(VX, VZ, V0), (VY, VZN, V0)]
+
+
+def cagecube_cache_clear ():
+    """ Empties the cache of the cage cubes shapes
+    """
+    CAGECUBE_CACHE.clear()
+
+
+def shp_cagecube (side_l,
+                  thru_hole_d,
+                  thru_thread_d,
+                  thru_rod_d,
+                  thru_rod_sep,
+                  rod_thread_d,
+                  rod_thread_l,
+                  tap_d,
+                  tap_l,
+                  tap_sep_l,
+                  tap_sep_s,
+                  axis_thru_rods = 'x',
+                  axis_thru_hole = 'y'):
+    """ Gets the shape of a cage cube, made using the symmetry of the cube
+    The arguments are the same as in CageCube.
+    It is meant to be the shape of CageCube made hole by hole, the cases of
+    fcregress check it against the baseline. It is kept in CAGECUBE_CACHE,
+    so do not modify it, make a copy if you need to change it
+
+    Returns:
+    --------
+    TopoShape: the shape of the cage cube
+    """
+
+    key = ('cagecube', side_l, thru_hole_d, thru_thread_d,
+           thru_rod_d, thru_rod_sep, rod_thread_d, rod_thread_l,
+           tap_d, tap_l, tap_sep_l, tap_sep_s,
+           axis_thru_rods, axis_thru_hole)
+    try:
+        return CAGECUBE_CACHE[key]
+    except KeyError:
+        pass
+
+    if (axis_thru_rods, axis_thru_hole) != ('x', 'y'):
+        # rotate the canonical cube: X to the rods, Y to the thru hole
+        shp_canon = shp_cagecube(side_l, thru_hole_d, thru_thread_d,
+                                 thru_rod_d, thru_rod_sep,
+                                 rod_thread_d, rod_thread_l,
+                                 tap_d, tap_l, tap_sep_l, tap_sep_s,
+                                 axis_thru_rods = 'x',
+                                 axis_thru_hole = 'y')
+        v_thru_rods = fcfun.getfcvecofname(axis_thru_rods)
+        v_thru_hole = fcfun.getfcvecofname(axis_thru_hole)
+        if fcfun.fc_isparal(v_thru_rods, v_thru_hole):
+            logger.error('axis_thru_rods and axis_thru_hole are parallel')
+        shp_cage = shp_canon.copy()
+        shp_cage.transformShape(
+                   shp_fastener.fc_matrix_axes(v_thru_rods,
+                                               v_thru_rods.cross(v_thru_hole)),
+                   True)
+        CAGECUBE_CACHE[key] = shp_cage
+        return shp_cage
+
+    shp_cage_box = fcfun.shp_boxcen(x=side_l, y=side_l, z=side_l,
+                                    cx=1, cy=1, cz=1, pos=V0)
+
+    # centered holes: the thru hole on Y, the threaded on X and Z
+    shp_thru_hole_cen0 = fcfun.shp_cylcenxtr (r= thru_hole_d/2.,
+                                              h = side_l, normal = VY,
+                                              ch=1, xtr_top=1., xtr_bot=1.,
+                                              pos = V0)
+    holes = []
+    for vnormal in [VX, VZ]:
+        holes.append(fcfun.shp_cylcenxtr (r= thru_thread_d/2.,
+                                          h = side_l, normal = vnormal,
+                                          ch=1, xtr_top=1., xtr_bot=1.,
+                                          pos = V0))
+
+    # holes of face +Y that are repeated on the 4 faces around X:
+    # the 4 taps for the rods and one of the 4 thru holes of the rods
+    face_holes = []
+    face_holes.append(fcfun.shp_cylcenxtr (
+                               r= thru_rod_d/2., h = side_l, normal = VX,
+                               ch=1, xtr_top=1., xtr_bot=1.,
+                               pos = FreeCAD.Vector(0, thru_rod_sep/2.,
+                                                       thru_rod_sep/2.)))
+    for x_sign in [1, -1]:
+        for z_sign in [1, -1]:
+            pos_rodtap = FreeCAD.Vector(x_sign * thru_rod_sep/2.,
+                                        side_l/2. - rod_thread_l,
+                                        z_sign * thru_rod_sep/2.)
+            face_holes.append(fcfun.shp_cylcenxtr (
+                                         r= rod_thread_d/2, h = rod_thread_l,
+                                         normal = VY, ch=0,
+                                         xtr_top =1., xtr_bot=0,
+                                         pos = pos_rodtap))
+    shp_face_holes = Part.makeCompound(face_holes)
+    holes.append(shp_fastener.shp_tool_compound(shp_face_holes,
+                                                CAGECUBE_ROT4_X))
+
+    # taps for mounting a cover on face +Y, repeated on face -Y
+    cover_taps = []
+    for x_sign in [1, -1]:
+        for z_sign in [1, -1]:
+            pos_tap = FreeCAD.Vector(x_sign * tap_sep_l/2.,
+                                     side_l/2. - tap_l,
+                                     z_sign * tap_sep_s/2.)
+            cover_taps.append(fcfun.shp_cylcenxtr (
+                                         r= tap_d/2, h = tap_l,
+                                         normal = VY, ch=0,
+                                         xtr_top =1., xtr_bot=0,
+                                         pos = pos_tap))
+    shp_cover_taps = Part.makeCompound(cover_taps)
+    holes.append(shp_fastener.shp_tool_compound(shp_cover_taps,
+                                                CAGECUBE_ROT2_X))
+
+    shp_cage = shp_cage_box.cut(Part.makeCompound([shp_thru_hole_cen0]
+                                                  + holes))
+    CAGECUBE_CACHE[key] = shp_cage
+    return shp_cage
+
+
+def shp_cagecubehalf (side_l,
+                      thread_d,
+                      thru_hole_d,
+                      thru_hole_depth,
+                      lenshole_45_d,
+                      rod_d,
+                      rod_sep,
+                      rod_depth,
+                      tap12_d,
+                      tap12_l,
+                      tap21_d,
+                      tap21_l,
+                      tap_dist,
+                      axis_1 = 'x',
+                      axis_2 = 'y'):
+    """ Gets the shape of a half cage cube, made using its symmetry:
+    the holes of the right angle sides are the same, rotated 180 degrees
+    around the diagonal of axis_1 and axis_2.
+    The arguments are the same as in CageCubeHalf.
+    It is meant to be the shape of CageCubeHalf made hole by hole, the cases of
+    fcregress check it against the baseline. It is kept in CAGECUBE_CACHE,
+    so do not modify it, make a copy if you need to change it
+
+    Returns:
+    --------
+    TopoShape: the shape of the half cage cube
+    """
+
+    key = ('cagecubehalf', side_l, thread_d, thru_hole_d, thru_hole_depth,
+           lenshole_45_d, rod_d, rod_sep, rod_depth,
+           tap12_d, tap12_l, tap21_d, tap21_l, tap_dist,
+           axis_1, axis_2)
+    try:
+        return CAGECUBE_CACHE[key]
+    except KeyError:
+        pass
+
+    if (axis_1, axis_2) != ('x', 'y'):
+        # rotate the canonical half cube: X to axis_1, Y to axis_2
+        shp_canon = shp_cagecubehalf(side_l, thread_d, thru_hole_d,
+                                     thru_hole_depth, lenshole_45_d,
+                                     rod_d, rod_sep, rod_depth,
+                                     tap12_d, tap12_l, tap21_d, tap21_l,
+                                     tap_dist,
+                                     axis_1 = 'x', axis_2 = 'y')
+        v_1 = fcfun.getfcvecofname(axis_1)
+        v_2 = fcfun.getfcvecofname(axis_2)
+        if not fcfun.fc_isperp(v_1, v_2):
+            logger.error('axis_1 and axis_2 are not perpendicular')
+        shp_cage = shp_canon.copy()
+        shp_cage.transformShape(shp_fastener.fc_matrix_axes(v_1,
+                                                            v_1.cross(v_2)),
+                                True)
+        CAGECUBE_CACHE[key] = shp_cage
+        return shp_cage
+
+    shp_cage_box = fcfun.shp_boxcen(x=side_l, y=side_l, z=side_l,
+                                    cx=1, cy=1, cz=1, pos=V0)
+    # taking the half away, and the hole for the lense, as in CageCubeHalf
+    v_halfout = FreeCAD.Vector(-1, -1, 0)
+    v_halfout.normalize()
+    pos_halfout = DraftVecUtils.scaleTo(v_halfout, thru_hole_depth)
+    shp_halfout = fcfun.shp_cyl(r= side_l, h=side_l,
+                                normal = v_halfout,
+                                pos = pos_halfout)
+    shp_lensehole = fcfun.shp_cyl(r= lenshole_45_d/2.,
+                                  h=2*thru_hole_depth,
+                                  normal = v_halfout,
+                                  pos = V0)
+    shp_45cut = shp_halfout.fuse(shp_lensehole)
+    shp_cage_half = shp_cage_box.cut(shp_45cut)
+    shp_cage_half = shp_cage_half.removeSplitter()
+
+    # holes of side +X, repeated on side +Y: the thread, the thru hole
+    # and the 4 holes for the rods
+    side_holes = []
+    side_holes.append(fcfun.shp_cylcenxtr (
+                               r= thread_d/2., h = thru_hole_depth,
+                               normal = VX, ch=0, xtr_top=1., xtr_bot=0.,
+                               pos = FreeCAD.Vector(side_l/2.-thru_hole_depth,
+                                                    0, 0)))
+    side_holes.append(fcfun.shp_cylcenxtr (
+                               r= thru_hole_d/2., h = side_l,
+                               normal = VX, ch=1, xtr_top=1., xtr_bot=1.,
+                               pos = V0))
+    for y_sign in [1, -1]:
+        for z_sign in [1, -1]:
+            pos_rodhole = FreeCAD.Vector(side_l/2. - rod_depth,
+                                         y_sign * rod_sep/2.,
+                                         z_sign * rod_sep/2.)
+            side_holes.append(fcfun.shp_cylcenxtr (
+                                         r= rod_d/2, h = rod_depth,
+                                         normal = VX, ch=0,
+                                         xtr_top =1., xtr_bot=0,
+                                         pos = pos_rodhole))
+    shp_side_holes = Part.makeCompound(side_holes)
+    holes = [shp_fastener.shp_tool_compound(shp_side_holes,
+                                            CAGECUBEHALF_ROT2_XY)]
+
+    # taps to mount to posts, they are not symmetric: Z and -Z
+    pos_tap = FreeCAD.Vector(tap_dist, tap_dist, 0)
+    holes.append(fcfun.shp_cylcenxtr (r = tap12_d/2, h = tap12_l,
+                                      normal = VZ, ch=0,
+                                      xtr_top =1., xtr_bot=0,
+                                      pos = pos_tap
+                                        + FreeCAD.Vector(0, 0,
+                                                         side_l/2. - tap12_l)))
+    holes.append(fcfun.shp_cylcenxtr (r = tap21_d/2, h = tap21_l,
+                                      normal = VZN, ch=0,
+                                      xtr_top =1., xtr_bot=0,
+                                      pos = pos_tap
+                                        + FreeCAD.Vector(0, 0,
+                                                    -(side_l/2. - tap21_l))))
+
+    shp_cage = shp_cage_half.cut(Part.makeCompound(holes))
+    CAGECUBE_CACHE[key] = shp_cage
+    return shp_cage
+
+
 # ---------------------- CageCube -------------------------------
 
 class CageCube (object):
@@ -73,6 +350,11 @@ class CageCube (object):
            There are 6 posible orientations:
            Thru-rods can be on X, Y or Z axis
            thru-hole can be on X, Y, or Z axis, but not in the same as thru-rods
+        name: name of the freecad object
+        sym_build: 1: the shape is made by shp_cagecube, using the symmetry
+                   of the cube, and shared with the other cubes with the
+                   same dimensions and orientation
+                   0: the holes are made one by one
     """
     ROD_SCREWS = kcomp_optic.ROD_SCREWS
     THRU_RODS = kcomp_optic.THRU_RODS
@@ -91,9 +373,10 @@ class CageCube (object):
                         tap_sep_s,
                         axis_thru_rods = 'x',
                         axis_thru_hole = 'y',
-                        name = 'cagecube'):
+                        name = 'cagecube',
+                        sym_build = 0):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         self.base_place = (0,0,0)
         self.side_l  = side_l
@@ -108,6 +391,18 @@ class CageCube (object):
         # get the 3rd perpendicular vector
         self.v_rod_screws =  self.v_thru_rods.cross (self.v_thru_hole)
 
+        if sym_build == 1:
+            shp_cage = shp_cagecube(side_l, thru_hole_d, thru_thread_d,
+                                    thru_rod_d, thru_rod_sep,
+                                    rod_thread_d, rod_thread_l,
+                                    tap_d, tap_l, tap_sep_l, tap_sep_s,
+                                    axis_thru_rods = axis_thru_rods,
+                                    axis_thru_hole = axis_thru_hole)
+            fco_cage = doc.addObject("Part::Feature", name )
+            fco_cage.Shape = shp_cage
+            self.fco = fco_cage
+            return
+
         # cage
         shp_cage_box = fcfun.shp_boxcen(x=side_l,
                                         y=side_l,
@@ -229,7 +524,7 @@ class CageCube (object):
         self.fco.Placement.Base = FreeCAD.Vector(position)
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
     def vec_face (self, fcv):
         """Return which face of the cube corresponds to the direction fcv
@@ -291,6 +586,7 @@ def f_cagecube (d_cagecube,
                 axis_thru_hole = 'y',
                 name = 'cagecube',
                 toprint_tol = 0,
+                sym_build = 0
                ):
 
     """ creates a cage cube, it creates from a dictionary
@@ -307,6 +603,7 @@ def f_cagecube (d_cagecube,
         toprint_tol: 0, dimensions as they are.
                      >0 value of tolerances of the holes.
                      multiplies the normal tolerance in kcomp.TOL
+        sym_build: 1: made using the symmetry of the cube, see shp_cagecube
 
     Returns a class of a CageCube. The freeCAD object can be accessed by the
         attribute .fco
@@ -335,7 +632,8 @@ def f_cagecube (d_cagecube,
                 tap_sep_s = d_cagecube['tap_sep_s'],
                 axis_thru_rods = axis_thru_rods,
                 axis_thru_hole = axis_thru_hole,
-                name = name)
+                name = name,
+                sym_build = sym_build)
 
     return cage
 
@@ -386,6 +684,10 @@ class CageCubeHalf (object):
            There are 24 posible orientations:
            6 posible axis_1 and 4 axis_2 for each axis_1
         name: name of the freecad object
+        sym_build: 1: the shape is made by shp_cagecubehalf, using the
+                   symmetry of the right angle sides, and shared with the
+                   other half cubes with the same dimensions and orientation
+                   0: the holes are made one by one
     """
 
     def __init__ (self, side_l,
@@ -403,9 +705,10 @@ class CageCubeHalf (object):
                         tap_dist,
                         axis_1 = 'x',
                         axis_2 = 'y',
-                        name = 'cagecube'):
+                        name = 'cagecube',
+                        sym_build = 0):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         self.base_place = (0,0,0)
         self.side_l  = side_l
@@ -422,6 +725,18 @@ class CageCubeHalf (object):
         self.v_1 = fcfun.getfcvecofname(axis_1)
         self.v_2 = fcfun.getfcvecofname(axis_2)
 
+        if sym_build == 1:
+            shp_cage = shp_cagecubehalf(side_l, thread_d, thru_hole_d,
+                                        thru_hole_depth, lenshole_45_d,
+                                        rod_d, rod_sep, rod_depth,
+                                        tap12_d, tap12_l, tap21_d, tap21_l,
+                                        tap_dist,
+                                        axis_1 = axis_1, axis_2 = axis_2)
+            fco_cage = doc.addObject("Part::Feature", name )
+            fco_cage.Shape = shp_cage
+            self.fco = fco_cage
+            return
+
         # cage
         shp_cage_box = fcfun.shp_boxcen(x=side_l,
                                         y=side_l,
@@ -568,7 +883,7 @@ class CageCubeHalf (object):
         self.fco.Placement.Base = FreeCAD.Vector(position)
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
 
 
@@ -576,7 +891,8 @@ class CageCubeHalf (object):
 def f_cagecubehalf (d_cagecubehalf,
                     axis_1 = 'x',
                     axis_2 = 'y',
-                    name = 'cagecubehalf'
+                    name = 'cagecubehalf',
+                    sym_build = 0
                    ):
 
     """ creates a half cage cube: 2 perpendicular sides, and a 45 degree angle
@@ -594,6 +910,7 @@ def f_cagecubehalf (d_cagecubehalf,
            There are 24 posible orientations:
            6 posible axis_1 and 4 axis_2 for each axis_1
         name: name of the freecad object
+        sym_build: 1: made using its symmetry, see shp_cagecubehalf
 
     """
 
@@ -613,7 +930,8 @@ def f_cagecubehalf (d_cagecubehalf,
                 tap_dist  = d_cagecubehalf['tap_dist'],
                 axis_1 = axis_1,
                 axis_2 = axis_2,
-                name   = name)
+                name   = name,
+                sym_build = sym_build)
 
     return cage
 
@@ -693,7 +1011,7 @@ class Lb1cPlate (object):
                         pos = V0,
                         name = 'lb1c_plate'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         # dictionary with the dimensions
         self.d_plate = d_plate
@@ -795,7 +1113,7 @@ class Lb1cPlate (object):
         self.fco = fco_plate
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
 #doc = FreeCAD.newDocument()
 #doc = FreeCAD.ActiveDocument
@@ -873,7 +1191,7 @@ def plate_thruhole_hole8 (side_l,
 
     """
 
-    doc = FreeCAD.ActiveDocument
+    doc = fcfun.get_doc()
 
     # normalize de axis
     axis_h = DraftVecUtils.scaleTo(fc_axis_h,1)
@@ -1010,7 +1328,7 @@ class Lb2cPlate (object):
            pos = V0,
            name = 'lb2c_plate'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         self.base_place = (0,0,0)
         shp_plate = plate_thruhole_hole8 (
@@ -1058,7 +1376,7 @@ class Lb2cPlate (object):
         self.fco.Placement.Base = FreeCAD.Vector(position)
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
 #doc = FreeCAD.newDocument()
 #doc = FreeCAD.ActiveDocument
@@ -1068,7 +1386,7 @@ class Lb2cPlate (object):
 
 
 
-class PlateThruholeMhole (object):
+class PlateThruholeMhole (fc_clss.LeanShp):
 
     """
     draws a square plate, with a thru-hole in the center.
@@ -1192,7 +1510,7 @@ class PlateThruholeMhole (object):
                  wfco=1,
                  name = 'plate'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.sym_hole_d = sym_hole_d
         self.sym_hole_sep = sym_hole_sep
 
@@ -1359,10 +1677,12 @@ class PlateThruholeMhole (object):
             fco_plate = doc.addObject("Part::Feature", name )
             fco_plate.Shape = shp_plate
             self.fco = fco_plate
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Plate object with no fco")
         
@@ -1522,7 +1842,7 @@ class Lcpb1mBase (object):
         self.wfco = wfco
         self.name = name
         self.h_tot = h_tot,
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         # normalize the axis
         axis_h = DraftVecUtils.scaleTo(fc_axis_h,1)
         axis_d = DraftVecUtils.scaleTo(fc_axis_d,1)
@@ -1684,7 +2004,7 @@ class Lcpb1mBase (object):
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Plate object with no fco")
         
@@ -1827,7 +2147,7 @@ class SM1TubelensSm2 (object):
                         ring = 1,
                         name = 'tubelens_sm1_sm2'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         # dictionary with the dimensions
         d_sm1l_sm2 = kcomp_optic.SM1L_2_SM2
@@ -1887,7 +2207,7 @@ class SM1TubelensSm2 (object):
         self.fco.Placement.Base = FreeCAD.Vector(position)
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
 # ---------------------- ThLed30 --------------------------
 
@@ -1933,7 +2253,7 @@ class ThLed30 (object):
         self.fc_axis = fc_axis
         self.fc_axis_cable = fc_axis_cable
         self.pos = pos
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         # normalize the axis and negate to build the cylinders
         n_axis = DraftVecUtils.scaleTo(fc_axis,-1)
@@ -2000,7 +2320,7 @@ class ThLed30 (object):
         self.fco = fco_led
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
 
 #doc = FreeCAD.newDocument()
@@ -2067,7 +2387,7 @@ class PrizLed (object):
         self.fc_axis_clear = fc_axis_clear
         self.pos = pos
         self.d_led = kcomp_optic.PRIZ_UHP_LED # the dictionary
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         doc.recompute() 
 
 
@@ -2210,7 +2530,7 @@ class PrizLed (object):
         self.fco = fco_prizled
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
         
     
@@ -2252,7 +2572,7 @@ class BreadBoard (object):
                         pos = V0,
                         name = 'breadboard'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         shp_box = fcfun.shp_box_dir(box_w = length,
                                     box_d = width,
@@ -2400,7 +2720,7 @@ class BreadBoard (object):
         self.fco = fco_breadboard
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
 
 
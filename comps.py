@@ -16,7 +16,6 @@ import Part
 import logging
 import os
 import inspect
-import Draft
 import DraftGeomUtils
 import DraftVecUtils
 import math
@@ -36,6 +35,7 @@ import kcomp # before, it was called mat_cte
 import fcfun
 import shp_clss
 import fc_clss
+import fcvariant
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, addCyl_pos, fillet_len
 from fcfun import VXN, VYN, VZN
@@ -98,7 +98,7 @@ class Sk (object):
         if skdict == None:
             logger.warning("Sk size %d not supported", size)
         else:
-            doc = FreeCAD.ActiveDocument
+            doc = fcfun.get_doc()
             # Total height:
             sk_z = skdict['H'];
             self.TotH = sk_z
@@ -377,7 +377,7 @@ class Sk_dir (object):
         self.ref_wc = ref_wc
         self.ref_dc = ref_dc
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         if pillow == 0:
             skdict = kcomp.SK.get(size)
         else:
@@ -451,31 +451,102 @@ class Sk_dir (object):
             ref2end_d = V0
 
         basecen_pos = pos + ref2base_h + ref2cen_w + ref2cen_d
-        # Making the tall box:
-        shp_tall = fcfun.shp_box_dir (box_w = sk_center_w, 
-                                  box_d = sk_d,
-                                  box_h = sk_h,
-                                  fc_axis_w = axis_w,
-                                  fc_axis_h = axis_h,
-                                  fc_axis_d = axis_d,
-                                  cw = 1, cd= 1, ch=0, pos = basecen_pos)
-        # Making the wide box:
-        shp_wide = fcfun.shp_box_dir (box_w = sk_w, 
-                                  box_d = sk_d,
-                                  box_h = sk_base_h,
-                                  fc_axis_w = axis_w,
-                                  fc_axis_h = axis_h,
-                                  fc_axis_d = axis_d,
-                                  cw = 1, cd= 1, ch=0, pos = basecen_pos)
-        shp_sk = shp_tall.fuse(shp_wide)
-        doc.recompute()
-        shp_sk = shp_sk.removeSplitter()
+        rodcen_pos = pos + ref2rod_h + ref2cen_w + ref2cen_d
 
-        
-        holes = []
+        # the body, with the holes that don't depend on the tolerance, is
+        # shared by the tolerance variants, see fcvariant
+        body_key = fcvariant.body_key('Sk_dir', size, pillow, self.holtol,
+                                      self.up_sep_dist, axis_h, axis_d,
+                                      axis_w, basecen_pos, rodcen_pos)
+        shp_sk = fcvariant.get_body(body_key)
+        if shp_sk is None:
+            # Making the tall box:
+            shp_tall = fcfun.shp_box_dir (box_w = sk_center_w, 
+                                      box_d = sk_d,
+                                      box_h = sk_h,
+                                      fc_axis_w = axis_w,
+                                      fc_axis_h = axis_h,
+                                      fc_axis_d = axis_d,
+                                      cw = 1, cd= 1, ch=0, pos = basecen_pos)
+            # Making the wide box:
+            shp_wide = fcfun.shp_box_dir (box_w = sk_w, 
+                                      box_d = sk_d,
+                                      box_h = sk_base_h,
+                                      fc_axis_w = axis_w,
+                                      fc_axis_h = axis_h,
+                                      fc_axis_d = axis_d,
+                                      cw = 1, cd= 1, ch=0, pos = basecen_pos)
+            shp_sk = shp_tall.fuse(shp_wide)
+            doc.recompute()
+            shp_sk = shp_sk.removeSplitter()
+
+
+            holes = []
+            # the upper sepparation
+            shp_topopen = fcfun.shp_box_dir_xtr (
+                                      box_w = self.up_sep_dist, 
+                                      box_d = sk_d,
+                                      box_h = sk_h-sk_axis_h,
+                                      fc_axis_w = axis_w,
+                                      fc_axis_h = axis_h,
+                                      fc_axis_d = axis_d,
+                                      cw = 1, cd= 1, ch=0,
+                                      xtr_h = 1, xtr_d = 1, xtr_nd = 1,
+                                      pos = rodcen_pos)
+            holes.append(shp_topopen)
+
+            # Tightening bolt hole
+            # tbolt_d is the diameter of the bolt: (M..) M4, ...
+            # tbolt_head_r: is the radius of the tightening bolt's head
+            # (including tolerance), which its bottom either
+            #- is at the middle point between
+            #  - A: the total height :sk_h
+            #  - B: the top of the shaft hole: axis_h + size/2.
+            #  - so the result will be (A + B)/2
+            # tot_h - (axis_h + size/2.)
+            #       _______..A........................
+            #      |  ___  |.B.......+ rodtop2top_dist = sk_h - (axis_h + size/2.) 
+            #      | /   \ |.......+ size/2.
+            #      | \___/ |       :
+            #    __|       |__     + axis_h
+            #   |_____________|....:
+
+            rodtop2top_dist = sk_h - (sk_axis_h + size/2.)
+            tbolt_pos = (   rodcen_pos
+                          + DraftVecUtils.scale(axis_w, sk_center_w/2.)
+                          + DraftVecUtils.scale(axis_h, size/2.)
+                          + DraftVecUtils.scale(axis_h, rodtop2top_dist/2.))
+            shp_tbolt = fcfun.shp_bolt_dir(r_shank= tbolt_d/2.,
+                                            l_bolt = sk_center_w,
+                                            r_head = tbolt_head_r,
+                                            l_head = tbolt_head_l,
+                                            hex_head = 0,
+                                            xtr_head = 1,
+                                            xtr_shank = 1,
+                                            support = 0,
+                                            fc_normal = axis_w_n,
+                                            fc_verx1 = axis_h,
+                                            pos = tbolt_pos)
+            holes.append(shp_tbolt)
 
-        # Shaft hole, 
-        rodcen_pos = pos + ref2rod_h + ref2cen_w + ref2cen_d
+            #Mounting bolts
+            cen2mbolt_w = DraftVecUtils.scale(axis_w, sk_mbolt_sep/2.)
+            for w_pos in [cen2mbolt_w.negative(), cen2mbolt_w]:
+                mbolt_pos = basecen_pos + w_pos
+                mbolt_hole = fcfun.shp_cylcenxtr(r= mbolt_r,
+                                               h = sk_d,
+                                               normal = axis_h,
+                                               ch = 0,
+                                               xtr_top = 1,
+                                               xtr_bot = 1,
+                                               pos = mbolt_pos)
+                holes.append(mbolt_hole)
+
+            shp_holes = fcfun.fuseshplist(holes)
+            shp_sk = shp_sk.cut(shp_holes)
+            fcvariant.set_body(body_key, shp_sk)
+
+        # Shaft hole, it depends on the tolerance
         rod_hole = fcfun.shp_cylcenxtr(r= size/2. +self.tol,
                                          h = sk_d,
                                          normal = axis_d,
@@ -483,71 +554,7 @@ class Sk_dir (object):
                                          xtr_top = 1,
                                          xtr_bot = 1,
                                          pos = rodcen_pos)
-        holes.append(rod_hole)
-
-        # the upper sepparation
-        shp_topopen = fcfun.shp_box_dir_xtr (
-                                  box_w = self.up_sep_dist, 
-                                  box_d = sk_d,
-                                  box_h = sk_h-sk_axis_h,
-                                  fc_axis_w = axis_w,
-                                  fc_axis_h = axis_h,
-                                  fc_axis_d = axis_d,
-                                  cw = 1, cd= 1, ch=0,
-                                  xtr_h = 1, xtr_d = 1, xtr_nd = 1,
-                                  pos = rodcen_pos)
-        holes.append(shp_topopen)
-
-        # Tightening bolt hole
-        # tbolt_d is the diameter of the bolt: (M..) M4, ...
-        # tbolt_head_r: is the radius of the tightening bolt's head
-        # (including tolerance), which its bottom either
-        #- is at the middle point between
-        #  - A: the total height :sk_h
-        #  - B: the top of the shaft hole: axis_h + size/2.
-        #  - so the result will be (A + B)/2
-        # tot_h - (axis_h + size/2.)
-        #       _______..A........................
-        #      |  ___  |.B.......+ rodtop2top_dist = sk_h - (axis_h + size/2.) 
-        #      | /   \ |.......+ size/2.
-        #      | \___/ |       :
-        #    __|       |__     + axis_h
-        #   |_____________|....:
-
-        rodtop2top_dist = sk_h - (sk_axis_h + size/2.)
-        tbolt_pos = (   rodcen_pos
-                      + DraftVecUtils.scale(axis_w, sk_center_w/2.)
-                      + DraftVecUtils.scale(axis_h, size/2.)
-                      + DraftVecUtils.scale(axis_h, rodtop2top_dist/2.))
-        shp_tbolt = fcfun.shp_bolt_dir(r_shank= tbolt_d/2.,
-                                        l_bolt = sk_center_w,
-                                        r_head = tbolt_head_r,
-                                        l_head = tbolt_head_l,
-                                        hex_head = 0,
-                                        xtr_head = 1,
-                                        xtr_shank = 1,
-                                        support = 0,
-                                        fc_normal = axis_w_n,
-                                        fc_verx1 = axis_h,
-                                        pos = tbolt_pos)
-        holes.append(shp_tbolt)
- 
-        #Mounting bolts
-        cen2mbolt_w = DraftVecUtils.scale(axis_w, sk_mbolt_sep/2.)
-        for w_pos in [cen2mbolt_w.negative(), cen2mbolt_w]:
-            mbolt_pos = basecen_pos + w_pos
-            mbolt_hole = fcfun.shp_cylcenxtr(r= mbolt_r,
-                                           h = sk_d,
-                                           normal = axis_h,
-                                           ch = 0,
-                                           xtr_top = 1,
-                                           xtr_bot = 1,
-                                           pos = mbolt_pos)
-            holes.append(mbolt_hole)
- 
-
-        shp_holes = fcfun.fuseshplist(holes)
-        shp_sk = shp_sk.cut(shp_holes)
+        shp_sk = shp_sk.cut(rod_hole)
         self.shp = shp_sk
 
         if wfco == 1:
@@ -558,7 +565,7 @@ class Sk_dir (object):
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Object with no fco")
 
@@ -601,7 +608,7 @@ class MisumiAlu30s6w8 (object):
 
     def __init__ (self, length, name, axis = 'x',
                   cx=False, cy=False, cz=False):
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.length = length
         self.name = name
         self.axis = axis
@@ -612,6 +619,9 @@ class MisumiAlu30s6w8 (object):
         path = os.getcwd()
         #logging.debug(path)
         self.skpath = path + '/../../freecad/comps/'
+        # opening the document makes it active, the previous active
+        # document is set active again once it is closed
+        doc_active = FreeCAD.ActiveDocument
         doc_sk = FreeCAD.openDocument(self.skpath + self.skfilename)
 
         list_obj_alumprofile = []
@@ -624,16 +634,16 @@ class MisumiAlu30s6w8 (object):
             if len(obj.Shape.Faces) == 0:
                 orig_alumsk = obj
 
-        FreeCAD.ActiveDocument = doc
         self.Sk = doc.addObject("Sketcher::SketchObject", 'sk_' + name)
         self.Sk.Geometry = orig_alumsk.Geometry
         print (orig_alumsk.Geometry)
         print (orig_alumsk.Constraints)
         self.Sk.Constraints = orig_alumsk.Constraints
-        self.Sk.ViewObject.Visibility = False
+        fcfun.set_fco_view(self.Sk, Visibility = False)
 
         FreeCAD.closeDocument(doc_sk.Name)
-        FreeCAD.ActiveDocument = doc #otherwise, clone will not work
+        if doc_active is not None:
+            FreeCAD.setActiveDocument(doc_active.Name)
 
         doc.recompute()
 
@@ -738,7 +748,7 @@ class RectRndBar (object):
                   inrad_same = False, axis = 'x',
                   baseaxis = 'y', name = "rectrndbar",
                   cx=False, cy=False, cz=False):
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.Base = Base
         self.Height = Height
         self.Length = Length
@@ -921,7 +931,7 @@ class AluProf (object):
                   indiam, axis = 'x',
                   name = "genaluprof",
                   cx=False, cy=False, cz=False):
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.width  = width
         self.length = length
         self.thick  = thick
@@ -1012,7 +1022,7 @@ class AluProf (object):
         self.defaluline()
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
         linecol = []
         for col_i in color:
             if col_i < 0.2:
@@ -1020,19 +1030,19 @@ class AluProf (object):
             else:
                 linecol.append(col_i - 0.2)
         print (str(linecol))       
-        self.fco.ViewObject.LineColor = tuple(linecol)
-        print(str(color) + ' -  '  + str(self.fco.ViewObject.LineColor))
+        fcfun.set_fco_view(self.fco, LineColor = tuple(linecol))
+        print(str(color) + ' -  '  + str(tuple(linecol)))
 
 
     def linecolor (self, color = (1,1,1)):
-        self.fco.ViewObject.LineColor = color
+        fcfun.set_fco_view(self.fco, LineColor = color)
 
     def linewidth (self, width = 1.):
-        self.fco.ViewObject.LineWidth = width
+        fcfun.set_fco_view(self.fco, LineWidth = width)
 
     def defaluline (self):
-        self.fco.ViewObject.LineColor = (0.5,0.5,0.5)
-        self.fco.ViewObject.LineWidth = 1.
+        fcfun.set_fco_view(self.fco, LineColor = (0.5,0.5,0.5),
+                                     LineWidth = 1.)
 
 
 
@@ -1148,7 +1158,7 @@ class AluProf_dir (object):
                   ref_l = 0, ref_w = 1, ref_p = 1,
                   xtr_l=0, xtr_nl=0,  pos = V0,
                   wfco = 1, name = "aluprof"):
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.width  = width
         self.length = length
         self.thick  = thick
@@ -1224,7 +1234,7 @@ class AluProf_dir (object):
             self.defaluline()
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
         linecol = []
         for col_i in color:
             #print (str(col_i))
@@ -1233,19 +1243,19 @@ class AluProf_dir (object):
             else:
                 linecol.append(col_i - 0.2)
         #print (str(linecol))       
-        self.fco.ViewObject.LineColor = tuple(linecol)
+        fcfun.set_fco_view(self.fco, LineColor = tuple(linecol))
         #print(str(color) + ' -  '  + str(self.fco.ViewObject.LineColor))
         #print(str(linecol))
 
     def linecolor (self, color = (1,1,1)):
-        self.fco.ViewObject.LineColor = color
+        fcfun.set_fco_view(self.fco, LineColor = color)
 
     def linewidth (self, width = 1.):
-        self.fco.ViewObject.LineWidth = width
+        fcfun.set_fco_view(self.fco, LineWidth = width)
 
     def defaluline (self):
-        self.fco.ViewObject.LineColor = (0.5,0.5,0.5)
-        self.fco.ViewObject.LineWidth = 1.
+        fcfun.set_fco_view(self.fco, LineColor = (0.5,0.5,0.5),
+                                     LineWidth = 1.)
 
 
 
@@ -1712,7 +1722,7 @@ class NemaMotor (object):
                   rshaft_l=0, bolt_depth = 3, bolt_out = 2, container=1,
                   normal = VZ, pos = V0):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.base_place = (0,0,0)
         self.size     = size
         self.width    = kcomp.NEMA_W[size]
@@ -1835,24 +1845,24 @@ class NemaMotor (object):
             l_head = kcomp.D912_HEAD_L[nemabolt_d] + mtol,
             hex_head = 0, extra =1, support=1, headdown = 0, name ="b2hole00")
 
-        b2hole01 = Draft.clone(b2hole00)
-        b2hole01.Label = "b2hole01"
-        b2hole10 = Draft.clone(b2hole00)
-        b2hole10.Label = "b2hole10"
-        b2hole11 = Draft.clone(b2hole00)
-        b2hole11.Label = "b2hole11"
+        # copies of the shape in doc (Draft.clone would create them in the
+        # active document), so it has to be computed first
+        doc.recompute()
+        b2hole01 = fcfun.add_fcobj(b2hole00.Shape.copy(), "b2hole01", doc)
+        b2hole10 = fcfun.add_fcobj(b2hole00.Shape.copy(), "b2hole10", doc)
+        b2hole11 = fcfun.add_fcobj(b2hole00.Shape.copy(), "b2hole11", doc)
 
-        b2hole00.ViewObject.Visibility=False
-        b2hole01.ViewObject.Visibility=False
-        b2hole10.ViewObject.Visibility=False
-        b2hole11.ViewObject.Visibility=False
+        fcfun.set_fco_view(b2hole00, Visibility = False)
+        fcfun.set_fco_view(b2hole01, Visibility = False)
+        fcfun.set_fco_view(b2hole10, Visibility = False)
+        fcfun.set_fco_view(b2hole11, Visibility = False)
 
         b2hole00.Placement.Base = b2hole00_pos
         b2hole01.Placement.Base = b2hole01_pos
         b2hole10.Placement.Base = b2hole10_pos
         b2hole11.Placement.Base = b2hole11_pos
 
-        # it doesnt work if dont recompute here! probably the clones
+        # it doesnt work if dont recompute here!
         doc.recompute()
 
         b2holes_list = [b2hole00, b2hole01, b2hole10, b2hole11]
@@ -1864,7 +1874,7 @@ class NemaMotor (object):
 
         b2holes = doc.addObject("Part::MultiFuse", "b2holes")
         b2holes.Shapes = b2holes_list
-        b2holes.ViewObject.Visibility=False
+        fcfun.set_fco_view(b2holes, Visibility = False)
 
         shp_b2holes.Placement.Base = pos
         shp_b2holes.Placement.Rotation = rot
@@ -2161,6 +2171,10 @@ class ShpNemaMotor (shp_clss.Obj3D):
         # calculates the position of the origin, and keeps it in attribute pos_o
         self.set_pos_o()
 
+        # the shape may have been built in another process, see fcsched
+        if self.take_prebuilt('ShpNemaMotor', args, values):
+            return
+
         # ---------- building of the piece ------------------
 
         # -------- base of the motor
@@ -2386,8 +2400,7 @@ class LinBearing (object):
                                          h_disp = h_disp - h_tol/2.0)
         # Hide the container
         self.bearing_cont = bearing_cont
-        if bearing_cont.ViewObject != None:
-            bearing_cont.ViewObject.Visibility=False
+        fcfun.set_fco_view(bearing_cont, Visibility = False)
 
 
     # Move the bearing and its container
@@ -2398,8 +2411,8 @@ class LinBearing (object):
 
 
 # ---------- class LinBearingClone ----------------------------------------
-# Creates an object that is like LinBearing, but it has clones of it
-# instead of original Cylinders
+# Creates an object that is like LinBearing, but it has copies of its
+# shapes instead of original Cylinders
 # h_bearing: is a LinBearing object. It has the h to indicate that it is
 #            a handler, not a FreeCAD object. To get to the FreeCad object
 #            take the attributes: bearing and bearing_cont (container)
@@ -2424,15 +2437,20 @@ class LinBearingClone (LinBearing):
         self.r_tol      = h_bearing.r_tol
         self.h_tol      = h_bearing.h_tol
 
-        bearing_clone = Draft.clone(h_bearing.bearing)
-        bearing_clone.Label = self.name
+        # copies of the shapes in the build document, Draft.clone would
+        # create them in the active document. The shapes of the bearing
+        # are empty until its document is recomputed
+        doc = fcfun.get_doc()
+        h_bearing.bearing.Document.recompute()
+        bearing_clone = fcfun.add_fcobj(h_bearing.bearing.Shape.copy(),
+                                        self.name, doc)
         self.bearing = bearing_clone
 
-        bearing_cont_clone = Draft.clone(h_bearing.bearing_cont)
-        bearing_cont_clone.Label = self.name + "_cont"
+        bearing_cont_clone = fcfun.add_fcobj(
+                                   h_bearing.bearing_cont.Shape.copy(),
+                                   self.name + "_cont", doc)
         self.bearing_cont = bearing_cont_clone
-        if bearing_cont_clone.ViewObject != None:
-            bearing_cont_clone.ViewObject.Visibility=False
+        fcfun.set_fco_view(bearing_cont_clone, Visibility = False)
 
 
 # ---------- class T8Nut ----------------------
@@ -2474,7 +2492,7 @@ class T8Nut (object):
     FlangeBoltPosD = kcomp.T8N_D_BOLT_POS
 
     def __init__ (self, name, nutaxis = 'x'):
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.name = name
         self.nutaxis = nutaxis
 
@@ -2559,7 +2577,7 @@ class T8Nut (object):
         t8nut.Tool = nut_holes
         # recompute before color
         doc.recompute()
-        t8nut.ViewObject.ShapeColor = fcfun.YELLOW
+        fcfun.set_fco_view(t8nut, ShapeColor = fcfun.YELLOW)
 
         self.fco = t8nut  # the FreeCad Object
    
@@ -2615,7 +2633,7 @@ class T8NutHousing (object):
         self.cy = cy
         self.cz = cz
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         # centered so it can be rotated without displacement, and everything
         # will be in place
         housing_box = fcfun.addBox_cen (self.Length, self.Width, self.Height,
@@ -2868,7 +2886,7 @@ class MisMinLScrNut (object):
 
         self.ax_pos_sign = ax_pos_sign
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         basepos = FreeCAD.Vector(ax_pos_sign, 0,0)
 
         # Flange Cylinder
@@ -3005,7 +3023,7 @@ class FlexCoupling (object):
     def __init__ (self, ds, dl, ctype='rb', name='flexcoupling',
                   axis='z', center = 1, larg_neg = 1):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.ds = ds 
         self.dl = ds 
         self.ctype = ctype 
@@ -3102,7 +3120,7 @@ class LinGuideRail (object):
         self.axis_l = axis_l
         self.axis_b = axis_b
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         shp_face_rail = fcfun.shp_face_lgrail(rail_w, rail_h, axis_l, axis_b)
         #self.shp_face_rail = shp_face_rail
         # vector on the direction of the rail length. Extrusion
@@ -3191,8 +3209,12 @@ class LinGuideRail (object):
             shp_bolt_i.Placement.Base = boltpos
             shp_bolt_list.append(shp_bolt_i)
             if bolthole_d != 0:
-                fco_bolthole_clone = Draft.clone(fco_bolthole)
-                fco_bolthole_clone.Label = fco_bolthole.Label + str(ibolt)
+                # copy of the shape in doc, not a Draft.clone, that would
+                # be in the active document
+                fco_bolthole_clone = fcfun.add_fcobj(
+                                         fco_bolthole.Shape.copy(),
+                                         fco_bolthole.Label + str(ibolt),
+                                         doc)
                 fco_bolthole_clone.Placement.Base = boltpos + bolthole_posz
                 bolthole_list.append(fco_bolthole_clone)
             
@@ -3203,7 +3225,7 @@ class LinGuideRail (object):
         if bolthole_d != 0:
             fco_bolthole = doc.addObject("Part::MultiFuse", name + "_bolt_hole")
             fco_bolthole.Shapes = bolthole_list
-            fco_bolthole.ViewObject.Visibility = False
+            fcfun.set_fco_view(fco_bolthole, Visibility = False)
             self.fco_bolthole = fco_bolthole
 
         doc.recompute()
@@ -3689,7 +3711,7 @@ class LinGuideBlock (object):
                         block_pos_l,
                         name):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         self.base_place = (0,0,0)
         self.block_l  = block_l
@@ -4625,6 +4647,13 @@ class ShpGtPulley (shp_clss.Obj3D):
         # calculates the position of the origin, and keeps it in attribute pos_o
         self.set_pos_o()
 
+        # normal axes to print without support
+        self.prnt_ax = self.axis_h
+
+        # the shape may have been built in another process, see fcsched
+        if self.take_prebuilt('ShpGtPulley', args, values):
+            return
+
         shp_fuse_list = []
         # Cilynder with a hole, with an extra for the fusion
         # calculation of the extra at the bottom to make the fusion
@@ -4692,9 +4721,6 @@ class ShpGtPulley (shp_clss.Obj3D):
 
         self.shp = shp_pulley
 
-        # normal axes to print without support
-        self.prnt_ax = self.axis_h
-
 
 #shpObjPulley = ShpGtPulley()
 
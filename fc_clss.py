@@ -15,7 +15,6 @@ import inspect
 import logging
 import math
 import FreeCAD
-import FreeCADGui
 import Part
 import DraftVecUtils
 import Mesh
@@ -35,6 +34,7 @@ import kcomp   # import material constants and other constants
 import fcfun   # import my functions for freecad. FreeCad Functions
 import shp_clss
 import kparts
+import fcexport
 
 from fcfun import V0, VX, VY, VZ, V0ROT
 from fcfun import VXN, VYN, VZN
@@ -43,6 +43,55 @@ from fcfun import VXN, VYN, VZN
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# 1: memory-lean build. Once the FreeCAD object of a SinglePart is created,
+# its shapes (self.shp and the intermediate shapes kept as attributes) are
+# released, the shape is kept only in the FreeCAD object.
+# If they are used later, they are made again: self.shp from the FreeCAD
+# object, and the others building again the shape class with the same
+# arguments. See SinglePart.release_shp
+# The classes that are not SinglePart release only self.shp. See LeanShp
+LEAN_SHP = 0
+
+
+def fco_shape (fco):
+    """ Returns a copy of the shape of a FreeCAD object, without its
+    placement. It is the shape that has been released (LEAN_SHP)
+
+    Parameters:
+    -----------
+    fco : FreeCAD object
+
+    Returns:
+    --------
+    TopoShape
+    """
+    shp = fco.Shape.copy()
+    shp.Placement = FreeCAD.Placement()
+    return shp
+
+
+class LeanShp (object):
+    """ Parent class of the objects that are not SinglePart, but keep their
+    shape in self.shp and in the FreeCAD object self.fco.
+    When LEAN_SHP == 1, once self.fco is created self.shp can be released
+    (release_shp), and if it is used later it is taken from self.fco
+
+    """
+    def release_shp (self):
+        """ Releases self.shp, the shape is kept in the FreeCAD object
+        """
+        if self.__dict__.get('fco') is not None and 'shp' in self.__dict__:
+            del self.shp
+            self.__dict__.setdefault('released_shp', []).append('shp')
+
+    def __getattr__ (self, name):
+        """ Only called for the attributes that are not found: the
+        shape that has been released
+        """
+        if name == 'shp' and name in self.__dict__.get('released_shp', []):
+            return fco_shape(self.__dict__['fco'])
+        raise AttributeError(name)
+
 
 # Possible names: Single Part, Element, Piece
 # Either:
@@ -104,10 +153,15 @@ class SinglePart (object):
         0.: no color on that channel
         1.: full intesity on that channel
 
+    released_shp : list of str
+        names of the attributes of the shapes that have been released,
+        when LEAN_SHP == 1. See release_shp
+
     """
-    def __init__(self):
-        # bring the active document
-        self.doc = FreeCAD.ActiveDocument
+    def __init__(self, doc = None):
+        # the document of the build context, or the active document
+        # (see fcfun.get_doc)
+        self.doc = fcfun.get_doc(doc)
 
         # placement of the piece at V0, altough pos can set it anywhere
         self.place = V0   #check this and rel_place
@@ -136,7 +190,7 @@ class SinglePart (object):
         """
         # just in case the value is 0 or 1, and it is an int
         self.color = (float(color[0]),float(color[1]), float(color[2]))
-        self.fco.ViewObject.ShapeColor = self.color
+        fcfun.set_fco_view(self.fco, ShapeColor = self.color)
 
     def set_line_color (self, color = (1.,1.,1.)):
         """ Sets a new color for the vertex lines of the piece
@@ -149,7 +203,7 @@ class SinglePart (object):
         """
         # just in case the value is 0 or 1, and it is an int
         self.line_color = (float(color[0]),float(color[1]), float(color[2]))
-        self.fco.ViewObject.LineColor = self.line_color
+        fcfun.set_fco_view(self.fco, LineColor = self.line_color)
 
 
     def set_line_width (self, width = 1.):
@@ -162,7 +216,7 @@ class SinglePart (object):
         """
         # just in case the value is 0 or 1, and it is an int
         self.line_width = float(width)
-        self.fco.ViewObject.LineWidth = self.line_width
+        fcfun.set_fco_view(self.fco, LineWidth = self.line_width)
 
 
     def set_point_size (self, size = 1.):
@@ -175,7 +229,7 @@ class SinglePart (object):
 
         """
         self.point_size = size
-        self.fco.ViewObject.PointSize = self.point_size
+        fcfun.set_fco_view(self.fco, PointSize = self.point_size)
 
 
     def set_name (self, name = '', default_name = '', change = 0):
@@ -218,6 +272,50 @@ class SinglePart (object):
             name = self.name
         fco = fcfun.add_fcobj(self.shp, name, self.doc)
         self.fco = fco
+        if LEAN_SHP == 1:
+            self.release_shp()
+
+    def release_shp (self):
+        """ Releases the shapes that are attributes of the object, the
+        shape is kept in the FreeCAD object. If they are used later, they
+        are made again (see __getattr__), but they are not kept
+        """
+        released_shp = self.__dict__.setdefault('released_shp', [])
+        for attr, value in list(vars(self).items()):
+            if isinstance(value, Part.Shape):
+                delattr(self, attr)
+                released_shp.append(attr)
+
+    def __getattr__ (self, name):
+        """ Only called for the attributes that are not found: the
+        shapes that have been released
+        """
+        if name not in self.__dict__.get('released_shp', []):
+            raise AttributeError(name)
+        fco = self.__dict__.get('fco')
+        if name == 'shp' and fco is not None:
+            return fco_shape(fco)
+        return getattr(self.rebuild_shp_obj(), name)
+
+    def rebuild_shp_obj (self):
+        """ Builds again the shape class of the object (the outer class
+        that has built the object and is not a SinglePart), with the
+        arguments it was called with (see shp_clss.init_args).
+        No FreeCAD object is created
+
+        Returns:
+        --------
+        object of the shape class
+        """
+        for shp_cls, shp_args in reversed(self.__dict__.get('shp_init', [])):
+            if not issubclass(shp_cls, SinglePart):
+                break
+        else:
+            raise AttributeError('%s has no shape class'
+                                 % type(self).__name__)
+        shp_obj = shp_cls.__new__(shp_cls)
+        shp_cls.__init__(shp_obj, **shp_args)
+        return shp_obj
 
 
     # ----- 
@@ -248,7 +346,8 @@ class SinglePart (object):
             self.place = place
 
     # ----- Export to STL method
-    def export_stl(self, prefix = "", name = "", stl_path = ""):
+    def export_stl(self, prefix = "", name = "", stl_path = "",
+                   stream = 0, adapt_defl = 0):
         """ exports to stl the piece to print 
 
         Parameters:
@@ -260,9 +359,22 @@ class SinglePart (object):
         name : str
             Name of the piece, if not given, it will take self.name
         stl_path : the path to save the stl files
+        stream : int
+            1: the faces are tessellated and written one by one
+               (fcexport.stl_write), without making a Mesh
+            0: a Mesh is made with MeshPart.meshFromShape
+        adapt_defl : int
+            1: the deflection of the tessellation is taken from the size
+               of the piece, its curved faces and the layer height
+               (fcexport.deflection_adaptive). Each face has its own
+               deflection, so it is written with fcexport.stl_write, as
+               with stream = 1
+            0: kparts.LIN_DEFL and kparts.ANG_DEFL
         """
         if not name:
             filename = self.name
+        else:
+            filename = name
         if prefix:
             filename = prefix + '_' + filename
 
@@ -299,16 +411,58 @@ class SinglePart (object):
 
         # exportStl is not working well with FreeCAD 0.17
         #self.fco.Shape.exportStl(self.stl_path + filename + '.stl')
-        mesh_shp = MeshPart.meshFromShape(self.fco.Shape,
-                                          LinearDeflection=kparts.LIN_DEFL, 
+        if adapt_defl == 1:
+            defl = fcexport.deflection_adaptive(self.fco.Shape)
+            lin_defl = defl['lin']
+            face_tol_list = defl['face_lin']
+        else:
+            lin_defl = kparts.LIN_DEFL
+            face_tol_list = None
+        # meshFromShape has only one deflection for the whole piece
+        if stream == 1 or adapt_defl == 1:
+            fcexport.stl_write(self.fco.Shape, stl_filename,
+                               tolerance = lin_defl,
+                               face_tol_list = face_tol_list)
+        else:
+            mesh_shp = MeshPart.meshFromShape(self.fco.Shape,
+                                          LinearDeflection=lin_defl, 
                                           AngularDeflection=kparts.ANG_DEFL)
-        mesh_shp.write(stl_filename)
-        del mesh_shp
+            mesh_shp.write(stl_filename)
+            del mesh_shp
 
         self.fco.Placement.Base = self.place
         self.fco.Placement.Rotation = V0ROT
         self.doc.recompute()
 
+    def mesh_arrays (self, tolerance = kparts.LIN_DEFL, merge = 1):
+        """ Mesh of the piece as NumPy arrays, in its position, without
+        writing a STL file. See fcmesh
+
+        Parameters:
+        -----------
+        tolerance : float
+            linear deflection of the tessellation
+        merge : int
+            1: the repeated vertices are merged
+
+        Returns:
+        --------
+        tuple (vertices, triangles, normals)
+        """
+        import fcmesh
+        return fcmesh.shp_mesh_arrays(self.fco.Shape, tolerance, merge)
+
+    def publish_mesh (self, tolerance = kparts.LIN_DEFL, merge = 1):
+        """ Mesh of the piece (see mesh_arrays) in shared memory blocks,
+        for other processes. See fcmesh.publish_mesh and fcmesh.attach_mesh
+
+        Returns:
+        --------
+        dict: descriptor of the blocks
+        """
+        import fcmesh
+        return fcmesh.publish_mesh(self.mesh_arrays(tolerance, merge))
+
     def save_fcad(self, prefix = "", name = ""):
         """ Save the FreeCAD document, actually, it may not be a class method
         only for the name
@@ -355,10 +509,11 @@ class PartsSet (shp_clss.Obj3D):
 
     """
 
-    def __init__(self, axis_d, axis_w, axis_h):
+    def __init__(self, axis_d, axis_w, axis_h, doc = None):
         
-        # bring the active document
-        self.doc = FreeCAD.ActiveDocument
+        # the document of the build context, or the active document
+        # (see fcfun.get_doc)
+        self.doc = fcfun.get_doc(doc)
 
         shp_clss.Obj3D.__init__(self, axis_d, axis_w, axis_h)
 
@@ -517,6 +672,25 @@ class PartsSet (shp_clss.Obj3D):
             self.parts_lst[part_i-1].export_stl(prefix = prefix)
 
 
+    def mesh_arrays (self, tolerance = kparts.LIN_DEFL, merge = 1):
+        """ Mesh of all the parts as NumPy arrays, in their positions.
+        See SinglePart.mesh_arrays
+
+        Returns:
+        --------
+        tuple (vertices, triangles, normals)
+        """
+        import fcmesh
+        return fcmesh.concat_mesh([part.mesh_arrays(tolerance, merge)
+                                   for part in self.parts_lst])
+
+    def publish_mesh (self, tolerance = kparts.LIN_DEFL, merge = 1):
+        """ Mesh of all the parts in shared memory blocks.
+        See SinglePart.publish_mesh
+        """
+        import fcmesh
+        return fcmesh.publish_mesh(self.mesh_arrays(tolerance, merge))
+
     def save_fcad(self, prefix = "", name = ""):
         """ Save the FreeCAD document, actually, it may not be a class method
         only for the name
@@ -0,0 +1,231 @@
+# ----------------------------------------------------------------------------
+# -- Axis names
+# -- comps library
+# -- Tables to go from the axis names 'x', '-x', 'y', ... to vectors
+# -- and to operate with them
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# All the tables are computed when the module is imported, so the functions
+# are just a dictionary lookup. The values of the tables are tuples and
+# strings, so they cannot be modified. The functions that return
+# FreeCAD.Vector return a new vector every time, because FreeCAD.Vector can
+# be modified
+
+import logging
+import FreeCAD
+
+
+logger = logging.getLogger(__name__)
+
+# names of the base vectors, in the order of the axis
+AXIS_NAMES = ('x', 'y', 'z', '-x', '-y', '-z')
+
+# name -> tuple of the vector
+NAME_TUP = {
+    'x'  : (1,0,0),
+    'y'  : (0,1,0),
+    'z'  : (0,0,1),
+    '-x' : (-1,0,0),
+    '-y' : (0,-1,0),
+    '-z' : (0,0,-1),
+}
+
+# tuple of the vector -> name. Tuples of floats also work: (1.,0.,0.)
+TUP_NAME = dict((tup, name) for name, tup in NAME_TUP.items())
+
+# name -> negated name
+NEG_NAME = {
+    'x' : '-x', 'y' : '-y', 'z' : '-z',
+    '-x': 'x',  '-y': 'y',  '-z': 'z',
+}
+
+# name -> positive name: 'x' and '-x' -> 'x'
+POSITIVE_NAME = {
+    'x' : 'x', 'y' : 'y', 'z' : 'z',
+    '-x': 'x', '-y': 'y', '-z': 'z',
+}
+
+# name -> a perpendicular name, see fcfun.get_vecname_perpend1
+PERP1_NAME = {
+    'x' : 'y', 'y' : 'z', 'z' : 'x',
+    '-x': '-y', '-y': '-z', '-z': '-x',
+}
+
+# name -> the other perpendicular name, see fcfun.get_vecname_perpend2
+PERP2_NAME = {
+    'x' : 'z', 'y' : 'x', 'z' : 'y',
+    '-x': '-z', '-y': '-x', '-z': '-y',
+}
+
+
+def _tup_add (a, b):
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+def _tup_cross (a, b):
+    return (a[1]*b[2] - a[2]*b[1],
+            a[2]*b[0] - a[0]*b[2],
+            a[0]*b[1] - a[1]*b[0])
+
+
+# name -> 4 perpendicular vectors: perp1, perp2, -perp1, -perp2
+# from 'x' -> (0,1,0), (0,0,1), (0,-1,0), (0,0,-1)
+PERP4_TUP = dict(
+    (name, (NAME_TUP[PERP1_NAME[name]],
+            NAME_TUP[PERP2_NAME[name]],
+            NAME_TUP[NEG_NAME[PERP1_NAME[name]]],
+            NAME_TUP[NEG_NAME[PERP2_NAME[name]]]))
+    for name in AXIS_NAMES)
+
+# name -> 4 perpendicular diagonal vectors:
+# perp1 + perp2, perp1 - perp2, -perp1 - perp2, -perp1 + perp2
+# from 'x' -> (0,1,1), (0,1,-1), (0,-1,-1), (0,-1,1)
+PERP4_2_TUP = dict(
+    (name, (_tup_add(PERP4_TUP[name][0], PERP4_TUP[name][1]),
+            _tup_add(PERP4_TUP[name][0], PERP4_TUP[name][3]),
+            _tup_add(PERP4_TUP[name][2], PERP4_TUP[name][3]),
+            _tup_add(PERP4_TUP[name][2], PERP4_TUP[name][1])))
+    for name in AXIS_NAMES)
+
+# (name1, name2) -> 1 if parallel, 0 if not
+PARAL = dict(((name1, name2),
+              int(POSITIVE_NAME[name1] == POSITIVE_NAME[name2]))
+              for name1 in AXIS_NAMES for name2 in AXIS_NAMES)
+
+# (name1, name2) -> name of the cross product name1 x name2
+# None if they are parallel
+CROSS_NAME = dict(((name1, name2),
+                   TUP_NAME.get(_tup_cross(NAME_TUP[name1], NAME_TUP[name2])))
+                   for name1 in AXIS_NAMES for name2 in AXIS_NAMES)
+
+
+def tup_of_name (name):
+    """ Gets the tuple of the vector of an axis name
+
+    Parameters:
+    -----------
+    name : str
+        'x', '-x', 'y', '-y', 'z', '-z'
+
+    Returns:
+    --------
+    tuple of 3 ints: (1,0,0), ...
+    """
+    return NAME_TUP[name]
+
+
+def fcvec_of_name (name):
+    """ Gets a new FreeCAD.Vector of an axis name
+
+    Parameters:
+    -----------
+    name : str
+        'x', '-x', 'y', '-y', 'z', '-z'
+
+    Returns:
+    --------
+    FreeCAD.Vector
+    """
+    return FreeCAD.Vector(NAME_TUP[name])
+
+
+def name_of_vec (vec):
+    """ Gets the name of a base vector
+
+    Parameters:
+    -----------
+    vec : FreeCAD.Vector or tuple
+        (1,0,0), (0,1,0), (0,0,1), (-1,0,0), (0,-1,0), (0,0,-1)
+
+    Returns:
+    --------
+    str: 'x', '-x', 'y', '-y', 'z', '-z'
+    None if it is not a base vector
+    """
+    if isinstance(vec, FreeCAD.Vector):
+        vec = (vec.x, vec.y, vec.z)
+    return TUP_NAME.get(tuple(vec))
+
+
+def paral (name1, name2):
+    """ Indicates if two axis names are parallel
+
+    Returns:
+    --------
+    1: parallel
+    0: not parallel
+    -1: name1 is not a valid name
+    """
+    if name1 not in POSITIVE_NAME:
+        return -1
+    return PARAL.get((name1, name2), 0)
+
+
+def cross_name (name1, name2):
+    """ Name of the cross product of two axis names, for example:
+    cross_name('x','y') -> 'z'.
+    None if they are parallel
+    """
+    return CROSS_NAME[(name1, name2)]
+
+
+def fclist_4perp (name):
+    """ List of 4 new FreeCAD.Vector perpendicular to an axis name
+    from 'x' -> (0,1,0), (0,0,1), (0,-1,0), (0,0,-1)
+    """
+    return [FreeCAD.Vector(tup) for tup in PERP4_TUP[name]]
+
+
+def fclist_4perp2 (name):
+    """ List of 4 new FreeCAD.Vector perpendicular to an axis name
+    on the diagonals,
+    from 'x' -> (0,1,1), (0,1,-1), (0,-1,-1), (0,-1,1)
+    """
+    return [FreeCAD.Vector(tup) for tup in PERP4_2_TUP[name]]
+
+
+# ---------- Functions for lists of names
+
+def tups_of_names (names):
+    """ List of tuples of the vectors of a list of axis names
+    """
+    return [NAME_TUP[name] for name in names]
+
+
+def fcvecs_of_names (names):
+    """ List of new FreeCAD.Vector of a list of axis names
+    """
+    return [FreeCAD.Vector(NAME_TUP[name]) for name in names]
+
+
+def names_of_vecs (vecs):
+    """ List of names of a list of base vectors (FreeCAD.Vector or tuples)
+    None for the vectors that are not base vectors
+    """
+    return [name_of_vec(vec) for vec in vecs]
+
+
+def positive_names (names):
+    """ List of positive names of a list of axis names:
+    ['-x', 'y'] -> ['x', 'y']
+    """
+    return [POSITIVE_NAME[name] for name in names]
+
+
+def neg_names (names):
+    """ List of negated names of a list of axis names:
+    ['-x', 'y'] -> ['x', '-y']
+    """
+    return [NEG_NAME[name] for name in names]
+
+
+def cross_names (names1, names2):
+    """ List of the names of the cross products of two lists of axis names
+    """
+    return [CROSS_NAME[(name1, name2)]
+            for name1, name2 in zip(names1, names2)]
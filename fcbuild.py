@@ -0,0 +1,432 @@
+# ----------------------------------------------------------------------------
+# -- Build of the artifacts
+# -- comps library
+# -- Builds the artifacts of stl/ and step/ declared in build_manifest.py
+# -- Only the artifacts whose inputs have changed are built again
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Each artifact of build_manifest.BUILD_LIST has a fingerprint of its inputs:
+#  - module and class, parameters and export options
+#  - source of the module of the class and of the modules of this library
+#    that it imports (recursively)
+#  - value of the constants of kcomp, kcomp_optic and kparts that have been
+#    read to build it. Not the source of these modules, because all the
+#    modules import kcomp, and any change in kcomp would build everything
+# The fingerprint of the inputs and the sha256 of the output files are kept
+# in the lock file (build_lock.json). An artifact is built again if its
+# fingerprint changes, or if an output file is missing or has been changed
+#
+# The artifacts are built in parallel, each one in a new process, so the
+# constants read at import time are recorded for each artifact
+#
+# Usage, from the directory of the library:
+#   python fcbuild.py                  -> builds the stale artifacts
+#   python fcbuild.py sk8_tol03 -f     -> builds sk8_tol03 anyway
+#   python fcbuild.py -n               -> only prints the stale artifacts
+
+import os
+import re
+import sys
+import json
+import types
+import hashlib
+import logging
+import importlib
+import traceback
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+# directory of the library, the artifacts are relative to it
+PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+LOCK_FILE = 'build_lock.json'
+
+# directory of each export format
+EXPORT_DIR = {'stl' : 'stl', 'step' : 'step'}
+
+# modules of constants: their values are tracked, not their source
+KCONST_MODULES = ('kcomp', 'kcomp_optic', 'kparts')
+
+# names of the constants read: 'kcomp.TOL', ...
+KCONST_READ = set()
+
+# module name -> sha256 of its source
+SRC_HASH = {}
+
+IMPORT_RE = re.compile(r'^\s*(?:import\s+([\w\s,]+)|from\s+(\w+)\s+import)')
+
+
+class KRef (object):
+    """ Reference to a constant of kcomp, kcomp_optic or kparts, to be used
+    in the parameters of the manifest. So the value is read when the
+    artifact is built, and it is recorded in its fingerprint
+
+    KRef('kcomp', 'SCUU', 8) -> kcomp.SCUU[8]
+    """
+    def __init__ (self, mod_name, attr, *keys):
+        self.mod_name = mod_name
+        self.attr = attr
+        self.keys = keys
+
+    def __repr__ (self):
+        return 'KRef(%s)' % ', '.join(
+                   [repr(arg) for arg in (self.mod_name, self.attr)
+                                         + self.keys])
+
+    def value (self):
+        value = getattr(importlib.import_module(self.mod_name), self.attr)
+        for key in self.keys:
+            value = value[key]
+        return value
+
+
+class _ReadLogModule (types.ModuleType):
+    """ Module class that records the constants that are read
+    """
+    def __getattribute__ (self, attr):
+        value = types.ModuleType.__getattribute__(self, attr)
+        if (not attr.startswith('_') and not callable(value)
+            and not isinstance(value, types.ModuleType)):
+            KCONST_READ.add(types.ModuleType.__getattribute__(self, '__name__')
+                            + '.' + attr)
+        return value
+
+
+def track_kconst ():
+    """ Records the constants of KCONST_MODULES that are read from now
+    """
+    # first all imported, the constants that they read among them are not
+    # recorded: their own values are recorded
+    mod_list = [importlib.import_module(mod_name)
+                for mod_name in KCONST_MODULES]
+    for mod in mod_list:
+        mod.__class__ = _ReadLogModule
+
+
+def kconst_values (kconst_names):
+    """ Current values of a list of constants
+
+    Parameters:
+    -----------
+    kconst_names : list of str
+        names of the constants: 'kcomp.TOL', ...
+
+    Returns:
+    --------
+    dict: name of the constant -> repr of its value
+    """
+    values = {}
+    for kconst_name in kconst_names:
+        mod_name, attr = kconst_name.split('.', 1)
+        mod = importlib.import_module(mod_name)
+        values[kconst_name] = repr(getattr(mod, attr, None))
+    return values
+
+
+def module_deps (mod_name):
+    """ Modules of the library that a module imports, recursively
+
+    Returns:
+    --------
+    set of str: names of the modules, including mod_name
+    """
+    dep_set = set()
+    pend_list = [mod_name]
+    while pend_list:
+        dep_name = pend_list.pop()
+        if dep_name in dep_set:
+            continue
+        dep_path = os.path.join(PKG_DIR, dep_name + '.py')
+        if not os.path.isfile(dep_path):
+            continue
+        dep_set.add(dep_name)
+        with open(dep_path) as src_file:
+            for line in src_file:
+                match = IMPORT_RE.match(line)
+                if match:
+                    if match.group(1):
+                        pend_list.extend([name.strip() for name in
+                                          match.group(1).split(',')])
+                    else:
+                        pend_list.append(match.group(2))
+    return dep_set
+
+
+def src_hash (mod_name):
+    """ sha256 of the source of a module of the library
+    """
+    if mod_name not in SRC_HASH:
+        with open(os.path.join(PKG_DIR, mod_name + '.py'), 'rb') as src_file:
+            SRC_HASH[mod_name] = hashlib.sha256(src_file.read()).hexdigest()
+    return SRC_HASH[mod_name]
+
+
+def file_hash (file_path):
+    """ sha256 of a file, None if it doesn't exist
+    """
+    if not os.path.isfile(file_path):
+        return None
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as out_file:
+        for chunk in iter(lambda: out_file.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def artifact_outputs (artifact):
+    """ Output files of an artifact, relative to PKG_DIR
+
+    If the artifact doesn't have the key 'outputs', they are:
+    stl/name[suffix].stl and step/name[suffix].step, for each suffix of
+    the key 'parts' (default: [''])
+    """
+    if 'outputs' in artifact:
+        return list(artifact['outputs'])
+    out_list = []
+    for fmt in ('stl', 'step'):
+        if artifact['export'].get(fmt, 0):
+            for suffix in artifact.get('parts', ['']):
+                out_list.append(EXPORT_DIR[fmt] + '/' + artifact['name']
+                                + suffix + '.' + fmt)
+    return out_list
+
+
+def input_fingerprint (artifact, kconst_names):
+    """ Fingerprint of the inputs of an artifact
+
+    Parameters:
+    -----------
+    artifact : dict
+        artifact of the manifest
+    kconst_names : list of str
+        names of the constants read to build it
+
+    Returns:
+    --------
+    str: sha256
+    """
+    src_list = [(mod_name, src_hash(mod_name))
+                for mod_name in sorted(module_deps(artifact['module']))
+                if mod_name not in KCONST_MODULES]
+    inputs = (artifact['module'],
+              artifact['cls'],
+              sorted(artifact['params'].items()),
+              sorted(artifact['export'].items()),
+              artifact_outputs(artifact),
+              src_list,
+              sorted(kconst_values(kconst_names).items()))
+    return hashlib.sha256(repr(inputs).encode('utf-8')).hexdigest()
+
+
+def read_lock (lock_path = None):
+    if lock_path is None:
+        lock_path = os.path.join(PKG_DIR, LOCK_FILE)
+    if not os.path.isfile(lock_path):
+        return {}
+    with open(lock_path) as lock_file:
+        return json.load(lock_file)
+
+
+def write_lock (lock_dict, lock_path = None):
+    if lock_path is None:
+        lock_path = os.path.join(PKG_DIR, LOCK_FILE)
+    with open(lock_path, 'w') as lock_file:
+        json.dump(lock_dict, lock_file, indent = 1, sort_keys = True)
+        lock_file.write('\n')
+
+
+def is_stale (artifact, lock_dict):
+    """ Indicates if an artifact has to be built
+
+    Returns:
+    --------
+    1: it has to be built: not built before, its inputs have changed,
+       or some output file is missing or has been changed
+    0: it is up to date
+    """
+    entry = lock_dict.get(artifact['name'])
+    if entry is None:
+        return 1
+    if entry['inputs'] != input_fingerprint(artifact, entry['kconst']):
+        return 1
+    for out_path in artifact_outputs(artifact):
+        if (file_hash(os.path.join(PKG_DIR, out_path))
+            != entry['outputs'].get(out_path)):
+            return 1
+    return 0
+
+
+def _export_artifact (obj, artifact):
+    """ Exports the object of an artifact.
+    The STL is exported by the export_stl method of the class, so it is
+    oriented to be printed. If the class doesn't have it, the shape is
+    exported as it is.
+    The export_stl of the old classes takes the name of the file, the one
+    of fc_clss.SinglePart takes the name and the directory. A
+    fc_clss.PartsSet exports each of its parts with its SinglePart method,
+    the suffixes of 'parts' are for the parts of parts_lst, in order
+    """
+    import FreeCAD
+    import fcexport
+    import fc_clss
+    import kparts
+
+    name = artifact['name']
+    export = artifact['export']
+    suffix_list = artifact.get('parts', [''])
+    stl_path = os.path.join(PKG_DIR, EXPORT_DIR['stl']) + os.sep
+    # objects that export each file: (suffix, object, shape)
+    exp_list = []
+    if isinstance(obj, fc_clss.PartsSet):
+        for suffix, part in zip(suffix_list, obj.parts_lst):
+            exp_list.append((suffix, part, part.fco.Shape))
+    else:
+        for suffix in suffix_list:
+            if hasattr(obj, 'fco' + suffix):
+                exp_list.append((suffix, obj,
+                                 getattr(obj, 'fco' + suffix).Shape))
+            else:
+                exp_list.append((suffix, obj, obj.shp))
+    if export.get('stl', 0):
+        if isinstance(obj, (fc_clss.SinglePart, fc_clss.PartsSet)):
+            for suffix, part, shp in exp_list:
+                part.export_stl(name = name + suffix, stl_path = stl_path)
+        elif hasattr(obj, 'export_stl'):
+            obj.export_stl(name)
+        else:
+            for suffix, part, shp in exp_list:
+                fcexport.stl_write(shp, stl_path + name + suffix + '.stl',
+                                   tolerance = kparts.LIN_DEFL)
+    if export.get('step', 0):
+        for suffix, part, shp in exp_list:
+            shp.exportStep(os.path.join(PKG_DIR, EXPORT_DIR['step'],
+                                        name + suffix + '.step'))
+
+
+def _build_worker (name):
+    """ Builds an artifact, in a new process
+
+    Returns:
+    --------
+    tuple (name, lock entry, error message)
+    lock entry is None if there has been an error
+    """
+    os.chdir(PKG_DIR)
+    if PKG_DIR not in sys.path:
+        sys.path.append(PKG_DIR)
+    try:
+        track_kconst()
+        import FreeCAD
+        import fcfun
+        import build_manifest
+        artifact = build_manifest.ARTIFACT_DICT[name]
+        params = {}
+        for key, value in artifact['params'].items():
+            if isinstance(value, KRef):
+                value = value.value()
+            params[key] = value
+        mod = importlib.import_module(artifact['module'])
+        doc = FreeCAD.newDocument(name)
+        with fcfun.bulk_build(doc):
+            obj = getattr(mod, artifact['cls'])(**params)
+        _export_artifact(obj, artifact)
+        fcfun.clear_fco_view(doc)
+        FreeCAD.closeDocument(doc.Name)
+        kconst_names = sorted(KCONST_READ)
+        entry = {
+            'inputs' : input_fingerprint(artifact, kconst_names),
+            'kconst' : kconst_names,
+            'outputs' : dict((out_path,
+                              file_hash(os.path.join(PKG_DIR, out_path)))
+                             for out_path in artifact_outputs(artifact))}
+        missing = [out_path for out_path, out_hash in entry['outputs'].items()
+                   if out_hash is None]
+        if missing:
+            return (name, None, 'output not created: ' + ', '.join(missing))
+        return (name, entry, '')
+    except Exception:
+        return (name, None, traceback.format_exc())
+
+
+def build (name_list = None, force = 0, n_proc = None, dry = 0):
+    """ Builds the stale artifacts of the manifest, in parallel, and
+    updates the lock file
+
+    Parameters:
+    -----------
+    name_list : list of str
+        names of the artifacts to check. None: all of them
+    force : int
+        1: builds them even if they are up to date
+    n_proc : int
+        number of processes. None: number of cpus
+    dry : int
+        1: doesn't build, only returns the stale artifacts
+
+    Returns:
+    --------
+    list of str: names of the artifacts built (or to build, if dry)
+    """
+    import build_manifest
+
+    lock_dict = read_lock()
+    if name_list is None:
+        name_list = [artifact['name']
+                     for artifact in build_manifest.BUILD_LIST]
+    build_list = []
+    for name in name_list:
+        if name not in build_manifest.ARTIFACT_DICT:
+            logger.error('artifact not in the manifest: ' + name)
+        elif force or is_stale(build_manifest.ARTIFACT_DICT[name], lock_dict):
+            build_list.append(name)
+    if dry or not build_list:
+        return build_list
+
+    built_list = []
+    # spawn: each artifact starts from a clean FreeCAD and clean modules
+    ctx = multiprocessing.get_context('spawn')
+    pool = ctx.Pool(processes = n_proc, maxtasksperchild = 1)
+    try:
+        for name, entry, error in pool.imap_unordered(_build_worker,
+                                                      build_list):
+            if entry is None:
+                logger.error('%s not built: %s', name, error)
+            else:
+                logger.info('%s built', name)
+                lock_dict[name] = entry
+                built_list.append(name)
+    finally:
+        pool.close()
+        pool.join()
+    write_lock(lock_dict)
+    return built_list
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(
+                        description = 'Builds the artifacts of stl/ and step/')
+    parser.add_argument('names', nargs = '*',
+                        help = 'artifacts to build, all if none')
+    parser.add_argument('-f', '--force', action = 'store_true',
+                        help = 'build even if they are up to date')
+    parser.add_argument('-j', '--jobs', type = int, default = None,
+                        help = 'number of processes')
+    parser.add_argument('-n', '--dry-run', action = 'store_true',
+                        help = 'only print the stale artifacts')
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.INFO)
+    sys.path.append(PKG_DIR)
+    # from the module, not from __main__, to have the same KRef class in
+    # the processes
+    import fcbuild
+    for name in fcbuild.build(args.names or None, int(args.force), args.jobs,
+                              int(args.dry_run)):
+        print(name)
@@ -0,0 +1,656 @@
+# ----------------------------------------------------------------------------
+# -- Export
+# -- comps library
+# -- Writes binary STL and 3MF files directly from the tessellation of the
+# -- faces of the shapes, without making a Mesh object
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# MeshPart.meshFromShape makes the whole Mesh before it is written.
+# Here, each face is tessellated (Shape.tessellate) and its triangles are
+# written to the file, so only the triangles of one face are in memory
+#
+# STL: the number of triangles is at the beginning of the file, but it is
+#      not known until the end, so it is written when the file is finished.
+#
+# 3MF: it is a zip file with an XML model. Each object (mesh) is written
+#      once, and the build items reference it with different transforms.
+#      So a piece that is repeated many times in a plate is only
+#      tessellated and stored once.
+#      The vertices of an object are merged, because 3MF needs closed
+#      meshes, and they have to be written before the triangles. So the
+#      triangles of an object are kept in a compact array until its vertices
+#      are written
+#
+# The tessellation only has linear deflection (tolerance). The angular
+# deflection is the default of FreeCAD (about 0.5 radians, close to
+# kparts.ANG_DEFL)
+#
+# Adaptive deflection (deflection_adaptive): kparts.LIN_DEFL is the same
+# for a nut and for a breadboard. The adaptive linear deflection is taken
+# from the size of the bounding box of the piece, and it is limited by the
+# layer height of the printer (kcomp.LAYER3D_H): smaller than a fraction of
+# the layer cannot be printed, and larger than the layer would be seen.
+# The curved faces of small radius have a smaller deflection, to have
+# segments of kparts.ADAPT_ARC_ANG
+# When each face has its own tolerance, the faces are tessellated from the
+# smallest tolerance to the largest, so the edges that are shared take
+# the finer division, and the neighbour faces take it, without holes
+#
+# All the meshes are taken from shp_tessellate_faces: the STL files, the
+# 3MF files and the NumPy arrays of fcmesh. The vertices are merged in
+# merged_faces, for the 3MF files and for mesh_flat.
+#
+# This module doesn't need NumPy. NumPy is an optional dependency of the
+# library, only needed by fcmesh and beltpath.belt_path_batch
+
+import io
+import os
+import sys
+import math
+import struct
+import zipfile
+import logging
+from array import array
+
+import FreeCAD
+import Part
+
+# directory this file is
+filepath = os.getcwd()
+# to get the components
+# In FreeCAD can be added: Preferences->General->Macro->Macro path
+sys.path.append(filepath)
+
+import kcomp
+import kparts
+
+
+logger = logging.getLogger(__name__)
+
+# STL header, 80 bytes
+STL_HEADER = b'fcad-comps binary STL'.ljust(80, b' ')
+
+# number of decimals to merge the vertices of the 3MF meshes
+VERTEX_DECIMALS = 6
+
+CONTENT_TYPES_3MF = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns='
+    '"http://schemas.openxmlformats.org/package/2006/content-types">\n'
+    ' <Default Extension="rels" ContentType='
+    '"application/vnd.openxmlformats-package.relationships+xml"/>\n'
+    ' <Default Extension="model" ContentType='
+    '"application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>\n'
+    '</Types>\n')
+
+RELS_3MF = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns='
+    '"http://schemas.openxmlformats.org/package/2006/relationships">\n'
+    ' <Relationship Target="/3D/3dmodel.model" Id="rel0" Type='
+    '"http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>\n'
+    '</Relationships>\n')
+
+
+def shp_tessellate_faces (shp, tolerance = kparts.LIN_DEFL,
+                          face_tol_list = None):
+    """ Tessellates the faces of a shape, one by one
+
+    Parameters:
+    -----------
+    shp : TopoShape
+    tolerance : float
+        linear deflection of the tessellation
+    face_tol_list : list of float
+        if given, linear deflection of each face of shp.Faces, instead of
+        tolerance. The faces are tessellated from the smallest tolerance
+
+    Returns:
+    --------
+    generator of tuples (points, triangles) for each face:
+        points: list of FreeCAD.Vector
+        triangles: list of tuples of 3 indexes of points
+    """
+    face_list = shp.Faces
+    if face_tol_list is None:
+        for face in face_list:
+            yield face.tessellate(tolerance)
+    else:
+        for face_tol, face_i in sorted(zip(face_tol_list,
+                                           range(len(face_list)))):
+            yield face_list[face_i].tessellate(face_tol)
+
+
+def face_min_radius (face):
+    """ Minimum radius of curvature of a face
+
+    Parameters:
+    -----------
+    face : TopoShape face
+
+    Returns:
+    --------
+    float: radius. 0 if the face is flat
+    """
+    surf = face.Surface
+    if isinstance(surf, Part.Plane):
+        return 0
+    if hasattr(surf, 'MinorRadius'): # toroid
+        return surf.MinorRadius
+    if hasattr(surf, 'Radius'): # cylinder, sphere, cone
+        return surf.Radius
+    # other surfaces: curvature in the middle of the face
+    try:
+        u0, u1, v0, v1 = face.ParameterRange
+        curv = max([abs(curv_i) for curv_i in
+                    face.curvatureAt((u0 + u1) / 2., (v0 + v1) / 2.)])
+    except Exception:
+        logger.debug('curvature of the face not found')
+        return 0
+    if curv > 0:
+        return 1. / curv
+    return 0
+
+
+def deflection_adaptive (shp, layer_h = kcomp.LAYER3D_H):
+    """ Gets the deflection to export a piece to STL, from the size of the
+    piece, the curvature of its faces and the layer height of the printer
+
+    Parameters:
+    -----------
+    shp : TopoShape
+    layer_h : float
+        height of the layer of the printer
+
+    Returns:
+    --------
+    dict with:
+        'lin' : linear deflection of the piece
+        'ang' : angular deflection of the piece
+        'face_lin' : list of the linear deflection of each face of
+                     shp.Faces
+    """
+    min_defl = layer_h * kparts.ADAPT_MIN_DEFL_LAYER
+    max_defl = layer_h * kparts.ADAPT_MAX_DEFL_LAYER
+    lin_defl = shp.BoundBox.DiagonalLength * kparts.ADAPT_REL_DEFL
+    lin_defl = min(max(lin_defl, min_defl), max_defl)
+    # deviation of a segment of ADAPT_ARC_ANG on a radius of 1
+    arc_sag = 1 - math.cos(kparts.ADAPT_ARC_ANG / 2.)
+    face_lin = []
+    for face in shp.Faces:
+        radius = face_min_radius(face)
+        if radius > 0:
+            face_lin.append(max(min(lin_defl, radius * arc_sag), min_defl))
+        else:
+            face_lin.append(lin_defl)
+    return {'lin' : lin_defl,
+            'ang' : kparts.ANG_DEFL,
+            'face_lin' : face_lin}
+
+
+def count_triangles (shp, tolerance = kparts.LIN_DEFL,
+                     face_tol_list = None):
+    """ Number of triangles of the tessellation of a shape.
+    A copy of the shape is tessellated, because the faces keep their
+    tessellation, and it would be taken for the next tessellations
+
+    Parameters:
+    -----------
+    See shp_tessellate_faces
+
+    Returns:
+    --------
+    int: number of triangles
+    """
+    n_tri = 0
+    for points, triangles in shp_tessellate_faces(shp.copy(), tolerance,
+                                                  face_tol_list):
+        n_tri += len(triangles)
+    return n_tri
+
+
+def deflection_report (shp, layer_h = kcomp.LAYER3D_H, name = ''):
+    """ Compares the number of triangles of the tessellation with the
+    fixed deflection (kparts.LIN_DEFL) and with the adaptive deflection
+
+    Parameters:
+    -----------
+    shp : TopoShape
+    layer_h : float
+        height of the layer of the printer
+    name : str
+        name of the piece, for the log
+
+    Returns:
+    --------
+    dict with:
+        'fixed' : number of triangles with kparts.LIN_DEFL
+        'adaptive' : number of triangles with the adaptive deflection
+        'lin' : adaptive linear deflection of the piece
+    """
+    defl = deflection_adaptive(shp, layer_h)
+    n_fixed = count_triangles(shp, kparts.LIN_DEFL)
+    n_adapt = count_triangles(shp, face_tol_list = defl['face_lin'])
+    logger.info('%s triangles: fixed (%s): %d - adaptive (%.3f): %d',
+                name, str(kparts.LIN_DEFL), n_fixed, defl['lin'], n_adapt)
+    return {'fixed' : n_fixed,
+            'adaptive' : n_adapt,
+            'lin' : defl['lin']}
+
+
+def _tri_normal (p1, p2, p3):
+    """ normal of a triangle, as a tuple (x, y, z)
+    """
+    normal = (p2 - p1).cross(p3 - p1)
+    length = normal.Length
+    if length > 0:
+        return (normal.x / length, normal.y / length, normal.z / length)
+    return (0., 0., 0.)
+
+
+def stl_write (shp, file_path, tolerance = kparts.LIN_DEFL,
+               face_tol_list = None):
+    """ Writes a binary STL file of a shape, tessellating face by face
+
+    Parameters:
+    -----------
+    shp : TopoShape
+        shape to export, with its placement
+    file_path : str
+        name of the STL file
+    tolerance : float
+        linear deflection of the tessellation
+    face_tol_list : list of float
+        if given, linear deflection of each face, see deflection_adaptive
+
+    Returns:
+    --------
+    int: number of triangles written
+    """
+    with open(file_path, 'wb') as stl_file:
+        return _stl_write_file(stl_file, shp, tolerance, face_tol_list)
+
+
+def _stl_write_file (stl_file, shp, tolerance, face_tol_list):
+    """ Writes a binary STL of a shape to a file object that can seek
+    """
+    tri_struct = struct.Struct('<12fH')
+    n_tri = 0
+    stl_file.write(STL_HEADER)
+    # number of triangles, written at the end
+    stl_file.write(struct.pack('<I', 0))
+    for points, triangles in shp_tessellate_faces(shp, tolerance,
+                                                  face_tol_list):
+        for i1, i2, i3 in triangles:
+            p1 = points[i1]
+            p2 = points[i2]
+            p3 = points[i3]
+            nx, ny, nz = _tri_normal(p1, p2, p3)
+            stl_file.write(tri_struct.pack(nx, ny, nz,
+                                           p1.x, p1.y, p1.z,
+                                           p2.x, p2.y, p2.z,
+                                           p3.x, p3.y, p3.z, 0))
+        n_tri += len(triangles)
+    stl_file.seek(len(STL_HEADER))
+    stl_file.write(struct.pack('<I', n_tri))
+    return n_tri
+
+
+def stl_bytes (shp, tolerance = kparts.LIN_DEFL, face_tol_list = None):
+    """ Binary STL of a shape, as bytes, to send it without a file.
+    Same parameters as stl_write
+
+    Returns:
+    --------
+    bytes
+    """
+    stl_file = io.BytesIO()
+    _stl_write_file(stl_file, shp, tolerance, face_tol_list)
+    return stl_file.getvalue()
+
+
+def _tup_normal (tri):
+    """ normal of a triangle given as a tuple of 9 floats
+    """
+    ax = tri[3] - tri[0]
+    ay = tri[4] - tri[1]
+    az = tri[5] - tri[2]
+    bx = tri[6] - tri[0]
+    by = tri[7] - tri[1]
+    bz = tri[8] - tri[2]
+    nx = ay * bz - az * by
+    ny = az * bx - ax * bz
+    nz = ax * by - ay * bx
+    length = math.sqrt(nx * nx + ny * ny + nz * nz)
+    if length > 0:
+        return (nx / length, ny / length, nz / length)
+    return (0., 0., 0.)
+
+
+def stl_write_tri (file_path, tri_iter):
+    """ Writes a binary STL file from triangles
+
+    Parameters:
+    -----------
+    file_path : str
+        name of the STL file
+    tri_iter : iterable of tuples of 9 floats
+        coordinates of the 3 vertexes of each triangle: x1,y1,z1,...,z3
+
+    Returns:
+    --------
+    int: number of triangles written
+    """
+    tri_struct = struct.Struct('<12fH')
+    n_tri = 0
+    with open(file_path, 'wb') as stl_file:
+        stl_file.write(STL_HEADER)
+        stl_file.write(struct.pack('<I', 0))
+        for tri in tri_iter:
+            stl_file.write(tri_struct.pack(*(_tup_normal(tri) + tuple(tri)
+                                             + (0,))))
+            n_tri += 1
+        stl_file.seek(len(STL_HEADER))
+        stl_file.write(struct.pack('<I', n_tri))
+    return n_tri
+
+
+def stl_read (file_path):
+    """ Reads the triangles of a STL file, binary or ASCII
+
+    Parameters:
+    -----------
+    file_path : str
+        name of the STL file
+
+    Returns:
+    --------
+    generator of tuples of 9 floats: x1,y1,z1,...,z3 of each triangle
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as stl_file:
+        header = stl_file.read(len(STL_HEADER) + 4)
+        n_tri = -1
+        if len(header) == len(STL_HEADER) + 4:
+            n_tri = struct.unpack('<I', header[len(STL_HEADER):])[0]
+        if file_size == len(STL_HEADER) + 4 + 50 * n_tri:
+            tri_struct = struct.Struct('<12fH')
+            for values in tri_struct.iter_unpack(stl_file.read()):
+                yield values[3:12]
+        else:
+            stl_file.seek(0)
+            coords = []
+            for line in stl_file:
+                words = line.split()
+                if words and words[0] == b'vertex':
+                    coords.extend([float(word) for word in words[1:4]])
+                    if len(coords) == 9:
+                        yield tuple(coords)
+                        coords = []
+
+
+def mesh_faces (mesh_src, tolerance = kparts.LIN_DEFL, face_tol_list = None):
+    """ Faces of a shape or of a STL file, to make a mesh
+
+    Parameters:
+    -----------
+    mesh_src : TopoShape or str
+        shape to tessellate, or name of a STL file
+    tolerance : float
+        linear deflection of the tessellation of the shape
+    face_tol_list : list of float
+        linear deflection of each face of the shape, see
+        shp_tessellate_faces
+
+    Returns:
+    --------
+    generator of tuples (points, triangles) for each face:
+        points: list of tuples (x, y, z)
+        triangles: list of tuples of 3 indexes of points
+    Each triangle of the STL file is a face
+    """
+    if isinstance(mesh_src, str):
+        for tri in stl_read(mesh_src):
+            yield ((tri[0:3], tri[3:6], tri[6:9]), ((0, 1, 2),))
+    else:
+        for points, triangles in shp_tessellate_faces(mesh_src, tolerance,
+                                                      face_tol_list):
+            yield ([(point.x, point.y, point.z) for point in points],
+                   triangles)
+
+
+def merged_faces (mesh_src, tolerance = kparts.LIN_DEFL,
+                  face_tol_list = None):
+    """ Faces of a shape or of a STL file (see mesh_faces) with the
+    vertices merged: the vertices that are repeated on the edges of the
+    faces are the same vertex, rounded to VERTEX_DECIMALS.
+    The triangles that are degenerated after the merge are left out
+
+    Returns:
+    --------
+    generator of tuples (new_points, triangles) for each face:
+        new_points: list of tuples (x, y, z), the vertices that are not in
+                    the previous faces. Their indexes follow the indexes of
+                    the vertices of the previous faces
+        triangles: list of tuples of 3 indexes of the vertices of the mesh
+    """
+    vertex_dict = {}
+    for points, triangles in mesh_faces(mesh_src, tolerance, face_tol_list):
+        new_points = []
+        # index of each point of the face in the mesh
+        point_index = []
+        for point in points:
+            key = (round(point[0], VERTEX_DECIMALS),
+                   round(point[1], VERTEX_DECIMALS),
+                   round(point[2], VERTEX_DECIMALS))
+            index = vertex_dict.get(key)
+            if index is None:
+                index = len(vertex_dict)
+                vertex_dict[key] = index
+                new_points.append(key)
+            point_index.append(index)
+        tri_list = []
+        for i1, i2, i3 in triangles:
+            v1 = point_index[i1]
+            v2 = point_index[i2]
+            v3 = point_index[i3]
+            if v1 != v2 and v2 != v3 and v3 != v1:
+                tri_list.append((v1, v2, v3))
+        yield (new_points, tri_list)
+
+
+def mesh_flat (mesh_src, tolerance = kparts.LIN_DEFL, face_tol_list = None,
+               merge = 1):
+    """ Mesh of a shape or of a STL file, in two compact arrays
+
+    Parameters:
+    -----------
+    mesh_src : TopoShape or str
+        see mesh_faces
+    tolerance : float
+    face_tol_list : list of float
+        see mesh_faces
+    merge : int
+        1: the vertices are merged, see merged_faces
+        0: each face has its own vertices
+
+    Returns:
+    --------
+    tuple (coords, indexes)
+        coords: array('d') with x, y, z of each vertex
+        indexes: array('i') with the 3 indexes of the vertices of each
+                 triangle
+    """
+    coords = array('d')
+    indexes = array('i')
+    if merge == 1:
+        for new_points, triangles in merged_faces(mesh_src, tolerance,
+                                                  face_tol_list):
+            for point in new_points:
+                coords.extend(point)
+            for tri in triangles:
+                indexes.extend(tri)
+    else:
+        n_points = 0
+        for points, triangles in mesh_faces(mesh_src, tolerance,
+                                            face_tol_list):
+            for point in points:
+                coords.extend(point)
+            for i1, i2, i3 in triangles:
+                indexes.extend((i1 + n_points, i2 + n_points, i3 + n_points))
+            n_points += len(points)
+    return (coords, indexes)
+
+
+def matrix_3mf (fc_matrix):
+    """ Text of the transform of a 3MF build item from a FreeCAD.Matrix
+    3MF multiplies the point as a row vector, so the rotation is transposed
+
+    Parameters:
+    -----------
+    fc_matrix : FreeCAD.Matrix
+
+    Returns:
+    --------
+    str with the 12 values of the transform
+    """
+    m = fc_matrix
+    values = (m.A11, m.A21, m.A31,
+              m.A12, m.A22, m.A32,
+              m.A13, m.A23, m.A33,
+              m.A14, m.A24, m.A34)
+    return ' '.join(['%.6f' % val for val in values])
+
+
+def _write_3mf_mesh (model_file, mesh_src, tolerance):
+    """ Writes the mesh of an object in the 3MF model, from a shape or from
+    a STL file (see merged_faces).
+    The vertices are written while the faces are tessellated,
+    the triangles are kept and written afterwards
+
+    Returns:
+    --------
+    int: number of triangles written
+    """
+    tri_array = array('L')
+    model_file.write(b'   <mesh>\n    <vertices>\n')
+    for new_points, triangles in merged_faces(mesh_src, tolerance):
+        for point in new_points:
+            model_file.write(('     <vertex x="%.6f" y="%.6f" z="%.6f"/>\n'
+                              % point).encode())
+        for tri in triangles:
+            tri_array.extend(tri)
+    model_file.write(b'    </vertices>\n    <triangles>\n')
+    for i in range(0, len(tri_array), 3):
+        model_file.write(('     <triangle v1="%d" v2="%d" v3="%d"/>\n'
+                          % (tri_array[i], tri_array[i+1], tri_array[i+2])
+                         ).encode())
+    model_file.write(b'    </triangles>\n   </mesh>\n')
+    return len(tri_array) // 3
+
+
+def write_3mf (file_path, obj_list, tolerance = kparts.LIN_DEFL):
+    """ Writes a 3MF file. Each shape is stored once, and placed as many
+    times as transforms it has
+
+    Parameters:
+    -----------
+    file_path : str
+        name of the 3MF file
+    obj_list : list of tuples (shp, matrix_list)
+        shp: TopoShape, it is exported with its placement. It can also be
+             the name of a STL file
+        matrix_list: list of FreeCAD.Matrix, one for each time the shape is
+                     placed in the build. If it is empty, it is placed once,
+                     without transform
+    tolerance : float
+        linear deflection of the tessellation
+
+    Returns:
+    --------
+    int: number of triangles stored (each shape is counted once)
+    """
+    n_tri = 0
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as zip_3mf:
+        zip_3mf.writestr('[Content_Types].xml', CONTENT_TYPES_3MF)
+        zip_3mf.writestr('_rels/.rels', RELS_3MF)
+        with zip_3mf.open('3D/3dmodel.model', 'w') as model_file:
+            model_file.write(
+                b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                b'<model unit="millimeter" xml:lang="en-US" xmlns='
+                b'"http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+                b' <resources>\n')
+            for obj_id, (shp, matrix_list) in enumerate(obj_list, 1):
+                model_file.write(('  <object id="%d" type="model">\n'
+                                  % obj_id).encode())
+                n_tri += _write_3mf_mesh(model_file, shp, tolerance)
+                model_file.write(b'  </object>\n')
+            model_file.write(b' </resources>\n <build>\n')
+            for obj_id, (shp, matrix_list) in enumerate(obj_list, 1):
+                if not matrix_list:
+                    model_file.write(('  <item objectid="%d"/>\n'
+                                      % obj_id).encode())
+                for fc_matrix in matrix_list:
+                    model_file.write(
+                           ('  <item objectid="%d" transform="%s"/>\n'
+                            % (obj_id, matrix_3mf(fc_matrix))).encode())
+            model_file.write(b' </build>\n</model>\n')
+    return n_tri
+
+
+def shp_3mf_list (shp_list):
+    """ Groups a list of shapes for write_3mf. The shapes that have the same
+    geometry and only differ in their placement (TopoShape.isPartner) are
+    stored once, with one transform for each placement
+
+    Parameters:
+    -----------
+    shp_list : list of TopoShape
+
+    Returns:
+    --------
+    list of tuples (shp, matrix_list), see write_3mf
+    """
+    obj_list = []
+    # the first shape of each group, to compare
+    partner_list = []
+    for shp in shp_list:
+        for shp_partner, (shp_base, matrix_list) in zip(partner_list,
+                                                       obj_list):
+            if shp.isPartner(shp_partner):
+                matrix_list.append(shp.Placement.toMatrix())
+                break
+        else:
+            shp_base = shp.copy()
+            shp_base.Placement = FreeCAD.Placement()
+            partner_list.append(shp)
+            obj_list.append((shp_base, [shp.Placement.toMatrix()]))
+    return obj_list
+
+
+def fco_write_3mf (fco_list, file_path, tolerance = kparts.LIN_DEFL):
+    """ Writes the shapes of a list of FreeCAD objects to a 3MF file.
+    The objects that have the same shape are stored once
+
+    Parameters:
+    -----------
+    fco_list : list of FreeCAD objects with a Shape
+    file_path : str
+        name of the 3MF file
+    tolerance : float
+        linear deflection of the tessellation
+
+    Returns:
+    --------
+    int: number of triangles stored
+    """
+    return write_3mf(file_path,
+                     shp_3mf_list([fco.Shape for fco in fco_list]),
+                     tolerance)
+
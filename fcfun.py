@@ -14,6 +14,8 @@ import FreeCAD
 import Part
 import math
 import logging
+import threading
+import contextlib
 import DraftVecUtils
 
 #from FreeCAD import Base
@@ -31,6 +33,8 @@ sys.path.append(filepath)
 
 
 import kcomp
+import fcrot
+import fcaxis
 
 from kcomp import LAYER3D_H
 
@@ -95,6 +99,15 @@ V0ROT = FreeCAD.Rotation(VZ,0)
 
 EQUAL_TOL = 0.001 # less than a micron is the same
 
+# properties of the views of the objects, kept as data when there is no
+# GUI, to set them if it comes up: (document name, object name) ->
+# {property: value}. See set_fco_view. The entries of a document are
+# removed with clear_fco_view when the document is closed
+VIEW_DATA = {}
+
+# document of the build context of each thread, see doc_context
+_DOC_CTX = threading.local()
+
 
 COS30 = 0.86603   
 COS45 = 0.707   
@@ -105,6 +118,7 @@ def RotateView(axisX=1.0,axisY=0.0,axisZ=0.0,angle=45.0):
     import math
     from pivy import coin
     try:
+        import FreeCADGui as Gui
         cam = Gui.ActiveDocument.ActiveView.getCameraNode()
         rot = coin.SbRotation()
         rot.setValue(coin.SbVec3f(axisX,axisY,axisZ),math.radians(angle))
@@ -613,21 +627,217 @@ def fuseshplist (shp_list):
     return (shpfuse)
         
 
+def shp_mirror_halves (shp_half, fc_normal, pos = V0, shp_tool_list = None):
+    """ Makes the two halves of a piece that are mirror images, apart from
+    some features that are not symmetrical, such as the bolt heads and the
+    nuts. The half is made once, and the other half is its mirror image.
+    Then, both halves are cut by the tools of the features that are not
+    symmetrical.
+    The result should be the same as making the whole piece, cutting the
+    tools, and dividing it by the plane of symmetry
+
+    Parameters:
+    -----------
+    shp_half : TopoShape
+        One of the halves, without the asymmetrical features
+    fc_normal : FreeCAD.Vector
+        Normal of the plane of symmetry
+    pos : FreeCAD.Vector
+        A point on the plane of symmetry
+    shp_tool_list : list of TopoShape
+        Tools (or compounds of tools) of the asymmetrical features, to be
+        cut from both halves. They are not mirrored. None: no tools
+
+    Returns:
+    --------
+    list of 2 TopoShape: [shp_half, its mirror image], both cut by the tools
+    """
+    shp_mirr = shp_half.mirror(pos, fc_normal)
+    shp_halves = [shp_half, shp_mirr]
+    if shp_tool_list:
+        shp_tools = Part.makeCompound(shp_tool_list)
+        shp_halves = [shp_i.cut(shp_tools) for shp_i in shp_halves]
+    return [shp_i.removeSplitter() for shp_i in shp_halves]
+
 
 
 
 def add_fcobj(shp, name, doc = None):
     """ just creates a freeCAD object of the shape, just to save one line"""
     if doc is None:
-        doc = FreeCAD.ActiveDocument
+        doc = get_doc()
     fcobj = doc.addObject("Part::Feature", name)
     fcobj.Shape = shp
     return fcobj
+
+
+def get_doc(doc = None):
+    """ Document where the objects are built: doc if it is given, if not
+    the document of the build context of this thread (see doc_context),
+    and if there is no context, the active document
+
+    Parameters:
+    -----------
+    doc : FreeCAD document
+    """
+    if doc is not None:
+        return doc
+    doc_list = getattr(_DOC_CTX, 'doc_list', None)
+    if doc_list:
+        return doc_list[-1]
+    return FreeCAD.ActiveDocument
+
+
+@contextlib.contextmanager
+def doc_context(doc):
+    """ Context manager to build in a document, without changing the active
+    document. Each thread has its own context, so several threads can build
+    in different documents. The contexts can be nested
+
+    Example:
+    --------
+    doc_a = FreeCAD.newDocument('a')
+    with fcfun.doc_context(doc_a):
+        parts.NemaMotorHolder(...)
+    """
+    doc_list = getattr(_DOC_CTX, 'doc_list', None)
+    if doc_list is None:
+        doc_list = _DOC_CTX.doc_list = []
+    doc_list.append(doc)
+    try:
+        yield doc
+    finally:
+        doc_list.pop()
+
+
+def set_fco_view(fco, **view_props):
+    """ Sets properties of the view of a FreeCAD object: ShapeColor,
+    LineColor, LineWidth, PointSize, Visibility, ...
+    They are set on the ViewObject if there is GUI. Without GUI
+    (freecadcmd) there is no ViewObject, and they are kept in VIEW_DATA
+    to be set later with apply_fco_view
+
+    Parameters:
+    -----------
+    fco : FreeCAD object
+    view_props :
+        properties of the ViewObject and their values,
+        e.g.: ShapeColor = (1.,0.,0.), Visibility = False
+    """
+    if not FreeCAD.GuiUp:
+        VIEW_DATA.setdefault((fco.Document.Name, fco.Name),
+                             {}).update(view_props)
+    elif fco.ViewObject is not None:
+        for prop, value in view_props.items():
+            setattr(fco.ViewObject, prop, value)
+
+
+def apply_fco_view(doc = None):
+    """ Sets the properties of the views kept in VIEW_DATA (see
+    set_fco_view) on the objects of a document, if there is GUI
+
+    Parameters:
+    -----------
+    doc : FreeCAD document
+        None: the active document
+    """
+    if not FreeCAD.GuiUp:
+        return
+    if doc is None:
+        doc = get_doc()
+    for (doc_name, fco_name), view_props in VIEW_DATA.items():
+        if doc_name != doc.Name:
+            continue
+        fco = doc.getObject(fco_name)
+        if fco is None or fco.ViewObject is None:
+            continue
+        for prop, value in view_props.items():
+            setattr(fco.ViewObject, prop, value)
+
+
+def clear_fco_view(doc):
+    """ Removes from VIEW_DATA the properties of the views of the objects
+    of a document. To be called when the document is closed, the names
+    of the closed documents are taken again by new documents
+
+    Parameters:
+    -----------
+    doc : FreeCAD document
+    """
+    for key in [key for key in VIEW_DATA if key[0] == doc.Name]:
+        del VIEW_DATA[key]
+
+
+@contextlib.contextmanager
+def bulk_build(doc = None, undo = 0, freeze = 0):
+    """ Context manager to build many objects in a document. While it is
+    active:
+    - the changes are not kept in the undo history (undo = 0), or they are
+      kept as one transaction (undo = 1). If the block raises an
+      exception, the transaction is aborted
+    - the 3D view is not updated, if the GUI is up
+    - if freeze = 1, doc.recompute() does nothing, the document is
+      recomputed once at the end (it needs the property RecomputesFrozen,
+      FreeCAD >= 0.19). Only for builds that don't take the shapes of
+      their parametric objects before the end: many components
+      recompute to copy a shape (comps.NemaMotor, comps.LinGuideRail...)
+      and they would take empty shapes
+
+    Parameters:
+    -----------
+    doc : FreeCAD document
+        None: the active document
+    undo : int
+        0: no undo history. 1: one transaction for all the changes
+    freeze : int
+        1: the recomputes are frozen until the end. 0: they are not
+
+    Example:
+    --------
+    with fcfun.bulk_build():
+        for size in (8, 10, 12):
+            comps.Sk_dir(size = size, ...)
+    """
+    if doc is None:
+        doc = get_doc()
+    undo_mode = doc.UndoMode
+    if undo == 1:
+        doc.openTransaction('bulk build')
+    else:
+        doc.UndoMode = 0
+    has_frozen = freeze == 1 and hasattr(doc, 'RecomputesFrozen')
+    if has_frozen:
+        frozen = doc.RecomputesFrozen
+        doc.RecomputesFrozen = True
+    gui_locker = None
+    if FreeCAD.GuiUp:
+        import FreeCADGui
+        if hasattr(FreeCADGui, 'updateLocker'):
+            gui_locker = FreeCADGui.updateLocker()
+            gui_locker.__enter__()
+    done = 0
+    try:
+        yield doc
+        done = 1
+    finally:
+        if has_frozen:
+            doc.RecomputesFrozen = frozen
+        if undo == 1:
+            if done == 1:
+                doc.recompute()
+                doc.commitTransaction()
+            else:
+                doc.abortTransaction()
+        else:
+            doc.recompute()
+            doc.UndoMode = undo_mode
+        if gui_locker is not None:
+            gui_locker.__exit__(None, None, None)
   
 
 def addBox(x, y, z, name, cx= False, cy=False):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     box =  doc.addObject("Part::Box",name)
     box.Length = x
     box.Width  = y
@@ -649,7 +859,7 @@ def addBox(x, y, z, name, cx= False, cy=False):
 
 def addBox_cen(x, y, z, name, cx= False, cy=False, cz=False):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
 
     if cx == True:
         x0 = -x/2.0
@@ -676,7 +886,7 @@ def addBox_cen(x, y, z, name, cx= False, cy=False, cz=False):
     square =  doc.addObject("Part::Polygon",name + "_sq")
     square.Nodes =sq_list
     square.Close = True
-    square.ViewObject.Visibility = False
+    set_fco_view(square, Visibility = False)
     box = doc.addObject ("Part::Extrusion", name)
     box.Base = square
     box.Dir = (0,0, z)
@@ -693,7 +903,7 @@ def addBox_cen(x, y, z, name, cx= False, cy=False, cz=False):
 
 def shp_boxcen(x, y, z, cx= False, cy=False, cz=False, pos=V0):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
 
     if cx == True:
         x0 = -x/2.0
@@ -756,7 +966,7 @@ def shp_boxcenxtr(x, y, z, cx= False, cy=False, cz=False,
                   xtr_nz = 0, xtr_z = 0,
                   pos=V0):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
 
     if cx == True:
         x0 = -x/2.0 - xtr_nx
@@ -1262,7 +1472,7 @@ def shp_boxdir_fillchmfplane (
 
     """
 
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     # normalize axes:
     # axis_l.normalize() could be used, but would change the vector
     # used as parameter
@@ -1612,7 +1822,7 @@ def shp_face_rail (rail_w, rail_ws, rail_h,
 # Add cylinder r: radius, h: height 
 def addCyl (r, h, name):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     cyl =  doc.addObject("Part::Cylinder",name)
     cyl.Radius = r
     cyl.Height = h
@@ -1633,7 +1843,7 @@ def addCyl (r, h, name):
 #             if -h/2: the plane will be cutting h/2
 def addCyl_pos (r, h, name, axis = 'z', h_disp = 0):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     cir =  doc.addObject("Part::Circle", name + "_circ")
     cir.Radius = r
 
@@ -1653,8 +1863,7 @@ def addCyl_pos (r, h, name, axis = 'z', h_disp = 0):
     cir.Placement.Rotation = rot
 
     # to hide the circle
-    if cir.ViewObject != None:
-      cir.ViewObject.Visibility=False
+    set_fco_view(cir, Visibility = False)
 
     cyl = doc.addObject ("Part::Extrusion", name)
     cyl.Base = cir 
@@ -1676,7 +1885,7 @@ def addCyl_pos (r, h, name, axis = 'z', h_disp = 0):
 
 def addCylPos (r, h, name, normal = VZ, pos = V0):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
 
     cir =  Part.makeCircle (r,   # Radius
                             pos,     # Position
@@ -1965,7 +2174,7 @@ def shp_cyl_gen (r, h, axis_h = VZ,
 
 def addCylHole (r_ext, r_int, h, name, axis = 'z', h_disp = 0):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     cyl_ext =  addCyl (r_ext, h, name + "_ext")
     cyl_int =  addCyl (r_int, h + 2, name + "_int")
 
@@ -2030,7 +2239,7 @@ def shp_cylhole (r_ext, r_int, h, axis = 'z', h_disp = 0.):
 
 def addCylHolePos (r_out, r_in, h, name, normal = VZ, pos = V0):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
 
     cir_out =  Part.makeCircle (r_out,   # Radius
                                 pos,     # Position
@@ -4657,6 +4866,47 @@ def wire_beltclamp (d, w, corner_r,
 
 
 
+# cache of the vertexes of the unit regular polygons, by number of sides
+# See regpolygon_unit
+REGPOLYGON_UNIT = {}
+
+# cache of the regular prisms at the origin, see shp_regprism_cached
+REGPRISM_CACHE = {}
+
+
+def regpolygon_unit (n_sides):
+    """
+    gets the vertexes of a regular polygon of radius 1, on plane XY, with
+    the first vertex on axis X, and going clockwise (as seen from Z).
+    The first vertex is repeated at the end, exactly the same.
+    Each vertex is calculated in closed form (cos, sin), so there is no
+    error accumulated from one vertex to the next.
+    The polygons are kept in REGPOLYGON_UNIT, so they are only calculated
+    once for each number of sides
+
+    Args:
+        n_sides: number of sides of the polygon
+
+    Returns:
+        a tuple of n_sides + 1 tuples (x, y)
+
+    """
+
+    try:
+        return REGPOLYGON_UNIT[n_sides]
+    except KeyError:
+        # divide the 360 degrees by the number of sides
+        polygon_angle = 2*math.pi / n_sides
+        unit_vertex_list = [(math.cos(i * polygon_angle),
+                            -math.sin(i * polygon_angle))
+                            for i in range(n_sides)]
+        # the first vertex will be also the last one
+        unit_vertex_list.append(unit_vertex_list[0])
+        unit_vertexes = tuple(unit_vertex_list)
+        REGPOLYGON_UNIT[n_sides] = unit_vertexes
+        return unit_vertexes
+
+
 def regpolygon_vecl (n_sides, radius, x_angle=0):
 
     """
@@ -4676,20 +4926,18 @@ def regpolygon_vecl (n_sides, radius, x_angle=0):
 
     """
 
-    v = FreeCAD.Vector(radius, 0, 0)
+    unit_vertexes = regpolygon_unit(n_sides)
     if x_angle != 0:
-        # rotate the polygon
+        # rotate the polygon x_angle degrees around Z axis
         x_angle_rad = math.radians(x_angle)
-        # uses radians, rotates around Z axis
-        # It seems that the angle of the function is wrong, changing the sign
-        v = DraftVecUtils.rotate2D(v,-x_angle_rad)
-    vec_vertex_list = [v]
-    # divide the 360 degrees by the number of sides
-    polygon_angle = 2*math.pi / n_sides
-    for i in xrange(n_sides):
-        v = DraftVecUtils.rotate2D(v,polygon_angle)
-        # the first vertex will be also the last one
-        vec_vertex_list.append(v)
+        cos_x = radius * math.cos(x_angle_rad)
+        sin_x = radius * math.sin(x_angle_rad)
+        vec_vertex_list = [FreeCAD.Vector(cos_x * ux - sin_x * uy,
+                                          sin_x * ux + cos_x * uy, 0)
+                           for ux, uy in unit_vertexes]
+    else:
+        vec_vertex_list = [FreeCAD.Vector(radius * ux, radius * uy, 0)
+                           for ux, uy in unit_vertexes]
     return (vec_vertex_list)
 
 
@@ -4723,15 +4971,13 @@ def regpolygon_dir_vecl (n_sides, radius, fc_normal, fc_verx1, pos):
         logger.error('Vectors are Not perpendicular')
     #direction of the first vertex scaled to the radius
     n1dir_rad = DraftVecUtils.scaleTo(fc_verx1,radius)
+    # direction of the vertex rotated 90 degrees around the normal
+    n2dir_rad = nnormal.cross(n1dir_rad)
 
-    vertex_list = []
-    # divide the 360 degrees by the number of sides
-    polygon_angle = 2*math.pi / n_sides
-    for i in range(n_sides):
-        rot_angle = i*polygon_angle
-        # Rotate n1dir, and then add to pos
-        vertex = pos + DraftVecUtils.rotate(n1dir_rad,rot_angle,nnormal)
-        vertex_list.append(vertex)
+    # the unit polygon goes clockwise, this goes counterclockwise, so
+    # the sign of y is changed
+    vertex_list = [pos + n1dir_rad * ux - n2dir_rad * uy
+                   for ux, uy in regpolygon_unit(n_sides)[:-1]]
     # the first vertex will be also the last one
     vertex_list.append(vertex_list[0])
         
@@ -4798,6 +5044,70 @@ def shp_regpolygon_dir_face (n_sides, radius,
     return shp_rpolygon_face
 
 
+def shp_regprism_cached (n_sides, radius, length, centered = 0,
+                         edge_rot = 0, clockwise = 1,
+                         fc_rot_matrix = None, pos = V0):
+    """
+    makes a shape of a regular prism, the prism is made at the origin, along
+    axis Z, with the first vertex on axis X (rotated edge_rot).
+    The prism at the origin is kept in REGPRISM_CACHE, and for the next
+    prisms with the same dimensions, a copy is rotated and translated.
+    So nuts, hexagonal heads and sockets of the same size are only made once.
+    The transformation changes the geometry of the copy, so the shape has
+    no placement, as if it were made in its place.
+
+    Args:
+        n_sides: number of sides of the polygon
+        radius: Circumradius of the polygon
+        length: length of the prism
+        centered: 1 if the extrusion is centered on pos (symmetrical)
+        edge_rot: angle in degrees that the first vertex is rotated from
+                  axis X
+        clockwise: 1: the vertexes of the polygon go clockwise, as in
+                      regpolygon_vecl
+                   0: counterclockwise, as in regpolygon_dir_vecl
+        fc_rot_matrix: FreeCAD.Matrix with the rotation, axis Z will go to
+                       the normal of the prism, and axis X to the first
+                       vertex. None: no rotation
+        pos:  FreeCAD.Vector of the position of the center of the base
+              (or the center of the prism if centered)
+
+    Returns:
+        a shape (TopoShape) of the regular prism
+
+    """
+
+    key = (n_sides, radius, length, centered, edge_rot, clockwise)
+    try:
+        shp_cached = REGPRISM_CACHE[key]
+    except KeyError:
+        rpolygon_vlist = regpolygon_vecl (n_sides, radius, x_angle=edge_rot)
+        if clockwise == 0:
+            # same as regpolygon_vecl, but with the vertexes counterclockwise
+            rpolygon_vlist = [FreeCAD.Vector(vec.x, -vec.y, 0)
+                              for vec in rpolygon_vlist]
+        shp_rpolygon_face = Part.Face(Part.makePolygon(rpolygon_vlist))
+        shp_cached = shp_extrud_face(shp_rpolygon_face, length, VZ, centered)
+        REGPRISM_CACHE[key] = shp_cached
+
+    if fc_rot_matrix is None:
+        fc_matrix = FreeCAD.Matrix()
+    else:
+        fc_matrix = FreeCAD.Matrix(fc_rot_matrix)
+    fc_matrix.move(pos)
+    shp_rprism = shp_cached.copy()
+    # copy = True: the geometry is transformed, not just its placement
+    shp_rprism.transformShape(fc_matrix, True)
+    return shp_rprism
+
+
+def regprism_cache_clear ():
+    """
+    empties the cache of regular prisms, REGPRISM_CACHE
+    """
+    REGPRISM_CACHE.clear()
+
+
 def shp_regprism (n_sides, radius, length,
                     n_axis='z', v_axis='x',
                     centered = 0,
@@ -4823,14 +5133,15 @@ def shp_regprism (n_sides, radius, length,
 
     """
 
-    shp_rpolygon_face = shp_regpolygon_face (n_sides,
-                                             radius,
-                                             n_axis = n_axis,
-                                             v_axis = v_axis,
-                                             edge_rot=edge_rot,
-                                             pos = pos)
-    vec_n_axis = getfcvecofname(n_axis)
-    shp_rprism = shp_extrud_face(shp_rpolygon_face, length, vec_n_axis,centered)
+    # the same rotation as shp_regpolygon_face
+    fc_rot_matrix = calc_rot_z(getvecofname(n_axis),
+                               getvecofname(v_axis)).toMatrix()
+    shp_rprism = shp_regprism_cached(n_sides, radius, length,
+                                     centered = centered,
+                                     edge_rot = edge_rot,
+                                     clockwise = 1,
+                                     fc_rot_matrix = fc_rot_matrix,
+                                     pos = pos)
     return shp_rprism
 
 
@@ -4874,17 +5185,16 @@ def shp_regprism_xtr (n_sides, radius, length,
     else:
         #centered, find the new center, related to how much is increased
         # on top and bottom
-        pos = pos + (xtr_top - xtr_bot)/2.
-
-    shp_rpolygon_face = shp_regpolygon_face (n_sides,
-                                             radius,
-                                             n_axis = n_axis,
-                                             v_axis = v_axis,
-                                             edge_rot=edge_rot,
-                                             pos = pos)
+        movcenter = (xtr_top - xtr_bot)/2.
+        pos = pos + DraftVecUtils.scaleTo(vec_n_axis,movcenter)
+
     totlen = length + xtr_bot + xtr_top
-    shp_rprism = shp_extrud_face(shp_rpolygon_face,
-                                 totlen, vec_n_axis,centered)
+    shp_rprism = shp_regprism (n_sides, radius, totlen,
+                               n_axis = n_axis,
+                               v_axis = v_axis,
+                               centered = centered,
+                               edge_rot=edge_rot,
+                               pos = pos)
     return shp_rprism
 
 def shp_regprism_dirxtr (n_sides, radius, length,
@@ -4927,11 +5237,28 @@ def shp_regprism_dirxtr (n_sides, radius, length,
         movcenter = (xtr_top - xtr_bot)/2.
         pos = pos + DraftVecUtils.scaleTo(nnorm,movcenter) 
 
-    shp_rpolygon_face = shp_regpolygon_dir_face (n_sides, radius,
-                                                  nnorm, fc_verx1,
-                                                  pos)
-    shp_rprism = shp_extrud_face(shp_rpolygon_face,
-                                 totlen, nnorm,centered)
+    if not fc_isperp(nnorm, fc_verx1):
+        logger.error('Vectors are Not perpendicular')
+        shp_rpolygon_face = shp_regpolygon_dir_face (n_sides, radius,
+                                                      nnorm, fc_verx1,
+                                                      pos)
+        shp_rprism = shp_extrud_face(shp_rpolygon_face,
+                                     totlen, nnorm,centered)
+        return shp_rprism
+
+    # columns of the rotation matrix: X goes to the first vertex, and Z
+    # to the normal
+    nverx1 = DraftVecUtils.scaleTo(fc_verx1, 1)
+    nverx2 = nnorm.cross(nverx1)
+    fc_rot_matrix = FreeCAD.Matrix(nverx1.x, nverx2.x, nnorm.x, 0,
+                                   nverx1.y, nverx2.y, nnorm.y, 0,
+                                   nverx1.z, nverx2.z, nnorm.z, 0,
+                                   0, 0, 0, 1)
+    shp_rprism = shp_regprism_cached(n_sides, radius, totlen,
+                                     centered = centered,
+                                     clockwise = 0,
+                                     fc_rot_matrix = fc_rot_matrix,
+                                     pos = pos)
     return shp_rprism
 
 
@@ -5292,7 +5619,7 @@ def addBolt (r_shank, l_bolt, r_head, l_head,
     """
 
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     elements = []
     # shank
     shank =  doc.addObject("Part::Cylinder", name + "_shank")
@@ -5768,7 +6095,7 @@ def addBoltNut_hole (r_shank,        l_bolt,
                  using kcomp.LAYER3D_H
     """
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     elements = []
     bolt = addBolt  (r_shank  = r_shank,
                      l_bolt   = l_bolt,
@@ -5886,7 +6213,7 @@ def shp_boltnut_dir_hole (r_shank,        l_bolt,
         pos: position of the head (if headstart) or of the nut 
     """
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
 
     # normalize
     nnormal = DraftVecUtils.scaleTo(fc_normal,1)
@@ -6260,7 +6587,7 @@ class NutHole (object):
         self.cy      = cy
         self.holedown = holedown
   
-        doc = FreeCAD.ActiveDocument
+        doc = get_doc()
         self.doc     = doc
 
         # the nut
@@ -6398,7 +6725,7 @@ def shp_nuthole (nut_r, nut_h, hole_h,
                     xtr_nut....|___|
 
     """
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     # normalize axis:
     axis_nut = DraftVecUtils.scaleTo(fc_axis_nut,1)
     axis_hole = DraftVecUtils.scaleTo(fc_axis_hole,1)
@@ -6502,7 +6829,7 @@ def shp_nuthole (nut_r, nut_h, hole_h,
 
 def fillet_len (box, e_len, radius, name):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     fllts_v = []
     edge_ind = 1
     #logger.debug('fillet_len: box %s - %s' %
@@ -6520,8 +6847,7 @@ def fillet_len (box, e_len, radius, name):
     box_fllt.Base = box
     box_fllt.Edges = fllts_v
     # to hide the objects in freecad gui
-    if box.ViewObject != None:
-      box.ViewObject.Visibility=False
+    set_fco_view(box, Visibility = False)
     return box_fllt
 
 # Calculate Bolt separation
@@ -6720,7 +7046,7 @@ def shp_filletchamfer_dir (shp, fc_axis = VZ,  fillet = 1, radius=1):
     """
 
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     # normalize the axis:
@@ -6771,7 +7097,7 @@ def shp_filletchamfer_dirs (shp, fc_axis_l, fillet = 1, radius=1):
     """
 
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     n_axis_list = []
@@ -6831,7 +7157,7 @@ def shp_filletchamfer_dirpt (shp, fc_axis = VZ, fc_pt = V0,  fillet = 1,
     """
 
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     # normalize the axis:
@@ -6895,7 +7221,7 @@ def shp_filletchamfer_dirpts (shp, fc_axis, fc_pts,  fillet = 1,
     """
 
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     # normalize the axis:
@@ -6959,7 +7285,7 @@ def shp_cir_fillchmf (shp, circen_pos = V0,  fillet = 1, radius=1):
     """
 
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     for edge in shp.Edges:
@@ -6998,7 +7324,7 @@ def shp_cylfilletchamfer (shp, fillet = 1, radius=1):
     """
 
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     for edge in shp.Edges:
@@ -7041,7 +7367,7 @@ def shp_filletchamfer (shp, e_len, fillet = 1, radius=1, axis='x',
                    xpos = 0, ypos = 0, zpos = 0
                     ):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     #logger.debug('filletchamfer: elen: %s',  e_len)
@@ -7125,7 +7451,7 @@ def filletchamfer (fco, e_len, name, fillet = 1, radius=1, axis='x',
                    xpos = 0, ypos = 0, zpos = 0,
                     ):
     # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
+    doc = get_doc()
     doc.recompute()  # you may hav problems if you dont do it
     edgelist = []
     #logger.debug('filletchamfer: elen: %s',  e_len)
@@ -7183,8 +7509,7 @@ def filletchamfer (fco, e_len, name, fillet = 1, radius=1, axis='x',
             fco_fillcham = doc.addObject ("Part::Chamfer", name)
         fco_fillcham.Base = fco
         fco_fillcham.Edges = edgelist
-        if fco.ViewObject != None:
-            fco.ViewObject.Visibility=False
+        set_fco_view(fco, Visibility = False)
         doc.recompute()
         return fco_fillcham
     else:
@@ -7235,113 +7560,11 @@ def filletchamfer (fco, e_len, name, fillet = 1, radius=1, axis='x',
 #
 
 def calc_rot (vec1, vec2):
-           
-    # rotation calculation
-    if vec1 == (1,0,0):
-        yaw = 0
-        pitch = 0
-        if vec2 == (0,1,0):
-            roll  = 90
-        elif vec2 == (0,-1,0):
-            roll  = -90
-        elif vec2 == (0,0,1):
-            roll  = 180
-        elif vec2 == (0,0,-1):
-            roll  = 0
-        else:
-            print("error 1 in yaw-pitch-roll")
-    elif vec1 == (-1,0,0):
-        yaw = 180
-        pitch = 0
-        if vec2 == (0,1,0):
-            roll  = -90 #negative because of the yaw
-        elif vec2 == (0,-1,0):
-            roll  = 90 # positive because of the yaw = 180
-        elif vec2 == (0,0,1):
-            roll = 180
-        elif vec2 == (0,0,-1):
-            roll  = 0
-        else:
-            print("error 2 in yaw-pitch-roll")
-    elif vec1 == (0,1,0):
-        yaw = 90
-        pitch = 0
-        if vec2 == (1,0,0):
-            roll  = -90
-        elif vec2 == (-1,0,0):
-            roll  = 90
-        elif vec2 == (0,0,1):
-            roll  = 180
-        elif vec2 == (0,0,-1):
-            roll  = 0
-        else:
-            print("error 3 in yaw-pitch-roll")
-    elif vec1 == (0,-1,0):
-        yaw = -90
-        pitch = 0
-        if vec2 == (1,0,0):
-            roll  = 90 
-        elif vec2 == (-1,0,0):
-            roll  = -90 
-        elif vec2 == (0,0,1):
-            roll  = 180
-        elif vec2 == (0,0,-1):
-            roll  = 0
-        else:
-            print("error 4 in yaw-pitch-roll")
-    elif vec1 == (0,0,1):
-        pitch = -90
-        yaw = 0
-        if vec2 == (1,0,0):
-            roll  = 0 
-        elif vec2 == (-1,0,0):
-            roll  = 180 
-        elif vec2 == (0,1,0):
-            roll  = 90
-        elif vec2 == (0,-1,0):
-            roll  = -90
-        else:
-            print("error 5 in yaw-pitch-roll")
-    elif vec1 == (0,0,-1):
-        pitch = 90
-        yaw = 0
-        if vec2 == (1,0,0):
-            roll  = 180 
-        elif vec2 == (-1,0,0):
-            roll  = 0 
-        elif vec2 == (0,1,0):
-            roll  = 90
-        elif vec2 == (0,-1,0):
-            roll  = -90
-        else:
-            print("error 6 in yaw-pitch-roll")
-    elif vec1 == (0,0,0): # it doesn't matter the direction of vec1
-        yaw = 0
-        if vec2 == (1,0,0):
-            pitch = -90
-            roll  = 0 
-        elif vec2 == (-1,0,0):
-            pitch = 90
-            roll  = 0 
-        elif vec2 == (0,1,0):
-            pitch = 0
-            roll  = 90
-        elif vec2 == (0,-1,0):
-            pitch = 0
-            roll  = -90
-        elif vec2 == (0,0,1):
-            pitch = 0
-            roll  = 180
-        elif vec2 == (0,0,-1):
-            pitch = 0
-            roll  = 0 # the same position
-        else:
-            print("error 7 in yaw-pitch-roll")
-
-
-
-    vrot = FreeCAD.Rotation(yaw,pitch,roll)
-    return vrot
+    """ rotation calculation, the rotation is taken from the table
+    fcrot.ROT_TABLE if the vectors are on the axis, if not it is calculated
+    with quaternions. See fcrot.calc_rot
+    """
+    return fcrot.calc_rot(vec1, vec2)
 
 
 def get_fcvectup (tup):
@@ -7362,10 +7585,7 @@ def get_fcvectup (tup):
 
 def fc_calc_rot (fc_vec1, fc_vec2):
 
-    ##vec1 = (fc_vec1.X, fc_vec1.Y, fc_vec1.Z)
-    ##vec2 = (fc_vec2.X, fc_vec2.Y, fc_vec2.Z)
-    vrot = calc_rot(DraftVecUtils.tup(fc_vec1),DraftVecUtils.tup(fc_vec2))
-    return vrot
+    return fcrot.calc_rot(fc_vec1, fc_vec2)
 
 def calc_rot_z (v_refz, v_refx):
     """
@@ -7387,15 +7607,11 @@ def calc_rot_z (v_refz, v_refx):
 
     """
 
-    if type(v_refz) is tuple:
-        v_refz = get_fcvectup(v_refz)
-        v_refx = get_fcvectup(v_refx)
-
     # since arg2 of calc_rot is referenced to VNZ, v_refz is negated
     # so v_refnz becomes referenced to VZ
-    v_refnz = DraftVecUtils.neg(v_refz)
-    vrot = fc_calc_rot(v_refx, v_refnz)
-    return vrot
+    v_refz = fcrot.vec_tup(v_refz)
+    v_refnz = (-v_refz[0], -v_refz[1], -v_refz[2])
+    return fcrot.calc_rot(v_refx, v_refnz)
     
 
 def get_rot (v1, v2):
@@ -7416,16 +7632,7 @@ def get_rot (v1, v2):
     returns a tuple representing a quaternion rotation between v2 and v1
     """
 
-    #normalize vectors
-    nv1 = DraftVecUtils.scaleTo(v1,1.)
-    nv2 = DraftVecUtils.scaleTo(v2,1.)
-
-    if DraftVecUtils.equals(nv1,nv2.negative()):
-        # we have to flip, but DraftVecUtils.getRotation doesnt get it done
-        # for this case
-        return FreeCAD.Rotation(VX,180)
-    else:
-        return DraftVecUtils.getRotation(nv1,nv2)
+    return fcrot.get_rot(v1, v2)
 
 
 #  ---------------- calc_desp_ncen ------------------------
@@ -7474,96 +7681,10 @@ def get_rot (v1, v2):
 
 def calc_desp_ncen (Length, Width, Height, 
                      vec1, vec2, cx=False, cy=False, cz=False, H_extr = False):
-           
-    # rotation calculation
-    x = 0
-    y = 0
-    z = 0
-    if abs(vec1[0]) == 1: # X axis: vec1 == (1,0,0) or vec1 == (-1,0,0):
-        if abs(vec2[1]) == 1:   # Y
-            if cx == False:
-                x = Length / 2.0
-            if cy == False:
-                y = Height / 2.0
-            if cz == False:
-                z = Width / 2.0
-        elif abs(vec2[2]) == 1:    # Z
-            if cx == False:
-                x = Length / 2.0
-            if cy == False:
-                y = Width / 2.0
-            if cz == False:
-                z = Height / 2.0
-        else:
-            print("error 1 in calc_desp_ncen")
-    elif abs(vec1[1]) == 1: # Y axis
-        if abs(vec2[0]) == 1:   # X
-            if cx == False:
-                x = Height / 2.0
-            if cy == False:
-                y = Length / 2.0
-            if cz == False:
-                z = Width / 2.0
-        elif abs(vec2[2]) == 1:    # Z
-            if cx == False:
-                x = Width / 2.0
-            if cy == False:
-                y = Length / 2.0
-            if cz == False:
-                z = Height / 2.0
-        else:
-            print("error 2 in calc_desp_ncen")
-    elif abs(vec1[2]) == 1: # Z axis
-        if abs(vec2[0]) == 1:   # X
-            if cx == False:
-                x = Height / 2.0
-            if cy == False:
-                y = Width / 2.0
-            if cz == False:
-                z = Length / 2.0
-        elif abs(vec2[1]) == 1:    # Y
-            if cx == False:
-                x = Width / 2.0
-            if cy == False:
-                y = Height / 2.0
-            if cz == False:
-                z = Length / 2.0
-        else:
-            print("error 3 in calc_desp_ncen")
-    elif (vec1[0]==0 and vec1[1]==0 and vec1[2]==0): 
-        #It doesnt matter vec1. Probably it is symetrical on plane XY.
-        # So Length and Width are the same
-        if Width != Length:
-            logger.error('Check rotation vec1=(0,0,0), and Length!=Width')
-        if abs(vec2[0]) == 1:   # X. Pitch = -90. in calc_rot
-            if cx == False:
-                x = Height / 2.0
-            if cy == False:
-                y = Width / 2.0
-            if cz == False:
-                z = Length / 2.0
-        elif abs(vec2[1]) == 1:   # Y. Roll = +-90. in calc_rot
-            if cx == False:
-                x = Length / 2.0
-            if cy == False:
-                y = Height / 2.0
-            if cz == False:
-                z = Width / 2.0
-        elif abs(vec2[2]) == 1:    # Z. Nothing. Roll 0 or 180
-            if cx == False:
-                x = Width / 2.0
-            if cy == False:
-                y = Length / 2.0
-            if cz == False:
-                z = Height / 2.0
-        else:
-            print("error 4 in calc_desp_ncen")
-    else:
-        print("error 5 in calc_desp_ncen")
-
-
-    vdesp = FreeCAD.Vector(x,y,z)
-    return vdesp
+    """ the displacement is taken from the table fcrot.DESP_TABLE
+    """
+    return fcrot.calc_desp_ncen(Length, Width, Height,
+                                vec1, vec2, cx, cy, cz)
 
 
 
@@ -7574,59 +7695,26 @@ def fc_calc_desp_ncen (Length, Width, Height,
                        fc_vec1, fc_vec2,
                        cx=False, cy=False, cz=False, H_extr = False ):
 
-    vec1 = DraftVecUtils.tup(fc_vec1)
-    vec2 = DraftVecUtils.tup(fc_vec2)
-    vdesp = calc_desp_ncen(Length, Width, Height,
-                           vec1, vec2, cx, cy, cz, H_extr)
-    return vdesp
+    return fcrot.calc_desp_ncen(Length, Width, Height,
+                                fc_vec1, fc_vec2, cx, cy, cz)
 
 
 
 def getvecofname(axis):
 
-    if axis == 'x':
-        vec = (1,0,0)
-    elif axis == '-x':
-        vec = (-1,0,0)
-    elif axis == 'y':
-        vec = (0,1,0)
-    elif axis == '-y':
-        vec = (0,-1,0)
-    elif axis == 'z':
-        vec = (0,0,1)
-    elif axis == '-z':
-        vec = (0,0,-1)
-
-    return vec
+    return fcaxis.NAME_TUP[axis]
 
 #VX, VY, VZ,...
 def getfcvecofname(axis):
 
-    fc_vec = FreeCAD.Vector(getvecofname(axis))
-    return fc_vec
+    return fcaxis.fcvec_of_name(axis)
 
 def vecname_paral (vec1, vec2):
     """
     given to vectors by name 'x', '-x', ... indicates if they are parallel
     or not
     """
-    paral = -1
-    if vec1 == 'x' or vec1 == '-x':
-        if vec2 == 'x' or vec2 == '-x':
-            paral = 1
-        else:
-            paral = 0
-    elif vec1 == 'y' or vec1 == '-y':
-        if vec2 == 'y' or vec2 == '-y':
-            paral = 1
-        else:
-            paral = 0
-    elif vec1 == 'z' or vec1 == '-z':
-        if vec2 == 'z' or vec2 == '-z':
-            paral = 1
-        else:
-            paral = 0
-    return paral
+    return fcaxis.paral(vec1, vec2)
     
 def get_vecname_perpend1(vecname):
 
@@ -7636,18 +7724,7 @@ def get_vecname_perpend1(vecname):
         vec: 'x', '-x', 'y', '-y', 'z', '-z'
     """
 
-    if vecname == 'x':
-        return 'y'
-    elif vecname == 'y':
-        return 'z'
-    elif vecname == 'z':
-        return 'x'
-    elif vecname == '-x':
-        return '-y'
-    elif vecname == '-y':
-        return '-z'
-    elif vecname == '-z':
-        return '-x'
+    return fcaxis.PERP1_NAME.get(vecname)
 
 
 def get_vecname_perpend2(vecname):
@@ -7658,18 +7735,7 @@ def get_vecname_perpend2(vecname):
         vec: 'x', '-x', 'y', '-y', 'z', '-z'
     """
 
-    if vecname == 'x':
-        return 'z'
-    elif vecname == 'y':
-        return 'x'
-    elif vecname == 'z':
-        return 'y'
-    elif vecname == '-x':
-        return '-z'
-    elif vecname == '-y':
-        return '-x'
-    elif vecname == '-z':
-        return '-y'
+    return fcaxis.PERP2_NAME.get(vecname)
 
 
 def get_nameofbasevec (fcvec):
@@ -7678,20 +7744,10 @@ def get_nameofbasevec (fcvec):
         gets its name: 'x', 'y',....
     """
 
-    if fcvec.x==1 and fcvec.y==0 and fcvec.z==0:
-        return 'x'
-    elif fcvec.x==0 and fcvec.y==1 and fcvec.z==0:
-        return 'y'
-    elif fcvec.x==0 and fcvec.y==0 and fcvec.z==1:
-        return 'z'
-    elif fcvec.x==-1 and fcvec.y==0 and fcvec.z==0:
-        return '-x'
-    elif fcvec.x==0 and fcvec.y==-1 and fcvec.z==0:
-        return '-y'
-    elif fcvec.x==0 and fcvec.y==0 and fcvec.z==-1:
-        return '-z'
-    else:
+    name = fcaxis.name_of_vec(fcvec)
+    if name is None:
         print("Not a base vector")
+    return name
 
 
 def get_fclist_4perp_vecname (vecname):
@@ -7702,10 +7758,7 @@ def get_fclist_4perp_vecname (vecname):
         vecname:  'x', '-x', 'y', '-y', 'z', '-z'
     """
 
-    fc_p1 = getfcvecofname(get_vecname_perpend1(vecname))
-    fc_p2 = getfcvecofname(get_vecname_perpend2(vecname))
-    fc_list = [fc_p1, fc_p2, DraftVecUtils.neg(fc_p1), DraftVecUtils.neg(fc_p2)]
-    return fc_list
+    return fcaxis.fclist_4perp(vecname)
 
 def get_fclist_4perp_fcvec (fcvec):
     """ gets a list of 4 FreCAD.Vector perpendicular to one base vector
@@ -7723,20 +7776,12 @@ def get_fclist_4perp2_vecname (vecname):
 
     """ gets a list of 4 FreCAD.Vector perpendicular to one vecname
          different from get_fclist_4perp_vecname
-         for example, from 'x' -> (0,1,1), (0,-1,1), (0,-1,-1), (0,1,-1)
+         for example, from 'x' -> (0,1,1), (0,1,-1), (0,-1,-1), (0,-1,1)
     Args:
         vecname:  'x', '-x', 'y', '-y', 'z', '-z'
     """
 
-    fc_p1 = getfcvecofname(get_vecname_perpend1(vecname))
-    fc_p1_neg = DraftVecUtils.neg(fc_p1)
-    fc_p2 = getfcvecofname(get_vecname_perpend2(vecname))
-    fc_p2_neg = DraftVecUtils.neg(fc_p2)
-    fc_list = [(fc_p1     + fc_p2),
-               (fc_p1     + fc_p2_neg),
-               (fc_p1_neg + fc_p2_neg),
-               (fc_p1_neg + fc_p2)]
-    return fc_list
+    return fcaxis.fclist_4perp2(vecname)
 
   
 def get_fclist_4perp2_fcvec (fcvec):
@@ -7760,17 +7805,7 @@ def get_positive_vecname (vecname):
         vecname:  'x', '-x', 'y', '-y', 'z', '-z'
     """
 
-    if vecname == 'x' or vecname == '-x':
-        return 'x'
-    elif vecname == 'y' or vecname == '-y':
-        return 'y'
-    elif vecname == 'z' or vecname == '-z':
-        return 'z'
-    else:
+    try:
+        return fcaxis.POSITIVE_NAME[vecname]
+    except KeyError:
         logger.error('Not a valid base vector name')
-
-
-
-     
-
-
@@ -0,0 +1,141 @@
+# ----------------------------------------------------------------------------
+# -- Golden values from other tree
+# -- comps library
+# -- Builds the cases of fcregress with the modules of other tree of the
+# -- library, for example a git worktree of the baseline revision
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The golden values of fcregress have to be taken from a version of the
+# library that is known to be good, not from the one that is being checked.
+# This script is run in a new process, with the directory of the other tree
+# first in sys.path, so the components are built with the modules of that
+# tree. Only fchash is taken from this directory, so the features are the
+# same as in fcregress.
+#
+# The other tree may not have some arguments of the classes (options that
+# have been added later). They are left out if they are in the list 'drop'
+# of the case: options that don't change the shape, or arguments with
+# their default value. If not, the case is not built.
+#
+# It is run by fcregress (see fcregress.run_base_cases):
+#   python fcgolden.py base_dir cases.json results.json
+# cases.json: list of dict {'name', 'module', 'cls', 'params', 'drop'},
+#             the parameters encoded with param_encode
+# results.json: name of the case -> [features, error]
+
+import os
+import sys
+import json
+import inspect
+import importlib
+import importlib.util
+import traceback
+
+import FreeCAD
+import Part
+
+
+def param_encode (value):
+    """ Parameter of a case in JSON: FreeCAD.Vector and fcbuild.KRef are
+    lists with their type, so they are made with the modules of the other
+    tree (see param_decode)
+    """
+    # in the process of fcregress, with the modules of this directory
+    import fcbuild
+    if isinstance(value, FreeCAD.Vector):
+        return ['vec', [value.x, value.y, value.z]]
+    if isinstance(value, fcbuild.KRef):
+        return ['kref', value.mod_name, value.attr, list(value.keys)]
+    return ['val', value]
+
+
+def param_decode (code):
+    if code[0] == 'vec':
+        return FreeCAD.Vector(*code[1])
+    if code[0] == 'kref':
+        value = getattr(importlib.import_module(code[1]), code[2])
+        for key in code[3]:
+            value = value[key]
+        return value
+    return code[1]
+
+
+def obj_shape (obj):
+    """ Shape of a built component, as fcserve.job_shape, that can't be
+    imported with the modules of the other tree
+    """
+    if isinstance(obj, Part.Shape):
+        return obj
+    shp = getattr(obj, 'shp', None)
+    if shp is not None:
+        return shp
+    shp_list = [value.Shape for attr, value in sorted(vars(obj).items())
+                if attr.startswith('fco') and hasattr(value, 'Shape')]
+    if len(shp_list) == 1:
+        return shp_list[0]
+    return Part.makeCompound(shp_list)
+
+
+def build_case (case, fchash):
+    """ Features of the shape of a case, built in a new document that is
+    the active one, as the older trees build in the active document
+
+    Parameters:
+    -----------
+    case : dict
+        see the beginning of this file
+    fchash : module
+        fchash of this directory
+
+    Returns:
+    --------
+    dict, see fchash.shp_features
+    """
+    func = getattr(importlib.import_module(case['module']), case['cls'])
+    params = dict((key, param_decode(code))
+                  for key, code in case['params'].items())
+    arg_dict = inspect.signature(func).parameters
+    if not any([arg.kind == arg.VAR_KEYWORD for arg in arg_dict.values()]):
+        for key in sorted(set(params) - set(arg_dict)):
+            if key not in case['drop']:
+                raise TypeError('%s is not an argument of %s in this tree'
+                                % (key, case['cls']))
+            del params[key]
+    doc = FreeCAD.newDocument('fcgolden')
+    try:
+        FreeCAD.setActiveDocument(doc.Name)
+        obj = func(**params)
+        doc.recompute()
+        return fchash.shp_features(obj_shape(obj))
+    finally:
+        FreeCAD.closeDocument(doc.Name)
+
+
+if __name__ == '__main__':
+    base_dir, cases_path, result_path = sys.argv[1:4]
+    own_dir = os.path.dirname(os.path.abspath(__file__))
+    base_dir = os.path.abspath(base_dir)
+    # the modules of the other tree look for their files from the cwd
+    os.chdir(base_dir)
+    spec = importlib.util.spec_from_file_location(
+                                 'fchash', os.path.join(own_dir, 'fchash.py'))
+    fchash = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fchash)
+    sys.path = [base_dir] + [path for path in sys.path
+                             if os.path.abspath(path or '.') != own_dir]
+    with open(cases_path) as cases_file:
+        case_list = json.load(cases_file)
+    result_dict = {}
+    for case in case_list:
+        try:
+            result_dict[case['name']] = [build_case(case, fchash), '']
+        except Exception:
+            result_dict[case['name']] = [None, traceback.format_exc()]
+    with open(result_path, 'w') as result_file:
+        json.dump(result_dict, result_file)
@@ -0,0 +1,285 @@
+# ----------------------------------------------------------------------------
+# -- Fingerprint of shapes
+# -- comps library
+# -- A hash of the geometric properties of a shape, to know if two shapes
+# -- are the same without booleans
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The fingerprint is the hash of (see shp_features):
+#  - volume, area, bounding box, center of mass
+#  - for each solid: volume and principal radii of gyration
+#  - number of solids, faces, edges and vertexes
+#  - number of faces of each type of surface (Plane, Cylinder, ...) and of
+#    edges of each type of curve (Line, Circle, ...)
+# The numbers are rounded to a multiple of an absolute tolerance:
+# FPRINT_TOL for the lengths (mm), and FPRINT_TOL multiplied by the factor
+# of FPRINT_KEY_TOL for the areas and volumes. So two builds of the same
+# piece have the same fingerprint, although the booleans give slightly
+# different numbers. The bounding box is the optimal one, that doesn't
+# depend on the tolerance of the shape.
+# A value that is just on the limit of the rounding can give different
+# fingerprints for almost the same shapes, so different fingerprints don't
+# always mean different shapes. To compare with a tolerance, use
+# shp_features and features_equal.
+#
+# The fingerprint depends on the position of the shape: the same piece in
+# other position has another fingerprint
+
+import os
+import sys
+import math
+import json
+import hashlib
+import logging
+
+import Part
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+logger = logging.getLogger(__name__)
+
+# absolute tolerance of the lengths of the fingerprint (mm), the numbers
+# are rounded to a multiple of it
+FPRINT_TOL = 1e-3
+# factor of FPRINT_TOL for the features that are not lengths:
+# 0.1 mm2 and 1 mm3
+FPRINT_KEY_TOL = {'area' : 100., 'volume' : 1000.}
+# values smaller than this are zero when the features are compared
+FPRINT_ZERO = 1e-7
+# relative tolerance to compare the features, about FPRINT_TOL in a piece
+# of some centimeters
+FPRINT_REL_TOL = 1e-5
+
+
+def _type_count (geom_list):
+    """ Number of geometries of each type: {'Plane' : 6, ...}
+    """
+    type_dict = {}
+    for geom in geom_list:
+        type_name = type(geom).__name__
+        type_dict[type_name] = type_dict.get(type_name, 0) + 1
+    return type_dict
+
+
+def shp_features (shp):
+    """ Geometric properties of a shape, for the fingerprint
+
+    Parameters:
+    -----------
+    shp : TopoShape
+
+    Returns:
+    --------
+    dict with:
+        'volume', 'area' : float
+        'bbox' : [xmin, ymin, zmin, xmax, ymax, zmax], optimal bounding box
+        'com' : [x, y, z] center of mass, of the solids if there are
+        'solids' : list of dict {'volume' : float, 'gyration' : [r1, r2, r3]}
+                   with the principal radii of gyration, sorted by volume
+        'n_solids', 'n_faces', 'n_edges', 'n_vertexes' : int
+        'face_types' : dict type of surface -> number of faces
+        'edge_types' : dict type of curve -> number of edges
+    """
+    if hasattr(shp, 'optimalBoundingBox'):
+        bbox = shp.optimalBoundingBox()
+    else:
+        # before FreeCAD 0.20
+        bbox = shp.BoundBox
+    solid_list = []
+    com = [0., 0., 0.]
+    tot_volume = 0.
+    for solid in shp.Solids:
+        moments = solid.PrincipalProperties['Moments']
+        # radius of gyration: sqrt(moment / mass), density 1
+        if solid.Volume > 0:
+            gyration = [math.sqrt(abs(moment) / solid.Volume)
+                        for moment in sorted(moments)]
+        else:
+            gyration = [0., 0., 0.]
+        solid_list.append([solid.Volume] + gyration)
+        center = solid.CenterOfMass
+        com[0] += center.x * solid.Volume
+        com[1] += center.y * solid.Volume
+        com[2] += center.z * solid.Volume
+        tot_volume += solid.Volume
+    if tot_volume > 0:
+        com = [coord / tot_volume for coord in com]
+    else:
+        center = bbox.Center
+        com = [center.x, center.y, center.z]
+    return {'volume' : shp.Volume,
+            'area' : shp.Area,
+            'bbox' : [bbox.XMin, bbox.YMin, bbox.ZMin,
+                      bbox.XMax, bbox.YMax, bbox.ZMax],
+            'com' : com,
+            'solids' : [{'volume' : solid[0], 'gyration' : solid[1:]}
+                        for solid in sorted(solid_list)],
+            'n_solids' : len(shp.Solids),
+            'n_faces' : len(shp.Faces),
+            'n_edges' : len(shp.Edges),
+            'n_vertexes' : len(shp.Vertexes),
+            'face_types' : _type_count([face.Surface
+                                        for face in shp.Faces]),
+            'edge_types' : _type_count([edge.Curve
+                                        for edge in shp.Edges])}
+
+
+def _round (value, tol):
+    """ Rounds the floats of a value (float, list or dict) to a multiple of
+    tol. The values of the keys of FPRINT_KEY_TOL to a multiple of tol by
+    its factor
+    """
+    if isinstance(value, float):
+        # + 0. to not have -0.
+        return round(value / tol) * tol + 0.
+    if isinstance(value, list):
+        return [_round(item, tol) for item in value]
+    if isinstance(value, dict):
+        return dict((key, _round(item, tol * FPRINT_KEY_TOL.get(key, 1.)))
+                    for key, item in value.items())
+    return value
+
+
+def features_fingerprint (features, tol = FPRINT_TOL):
+    """ Fingerprint of the features of a shape (see shp_features)
+
+    Parameters:
+    -----------
+    features : dict
+        from shp_features
+    tol : float
+        absolute tolerance of the lengths, see _round
+
+    Returns:
+    --------
+    str: hexadecimal hash
+    """
+    text = json.dumps(_round(features, tol), sort_keys = True)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def fingerprint (shp, tol = FPRINT_TOL):
+    """ Fingerprint of a shape
+
+    Parameters:
+    -----------
+    shp : TopoShape
+    tol : float
+        absolute tolerance of the lengths (mm), the numbers are rounded to
+        a multiple of it, see FPRINT_KEY_TOL
+
+    Returns:
+    --------
+    str: hexadecimal hash
+    """
+    return features_fingerprint(shp_features(shp), tol)
+
+
+def _num_diff (value1, value2, rel_tol):
+    """ List of the paths of the numbers that are different (relative
+    tolerance), and of the other values that are not equal
+    """
+    if isinstance(value1, float) or isinstance(value2, float):
+        try:
+            value1 = float(value1)
+            value2 = float(value2)
+        except (TypeError, ValueError):
+            return ['']
+        scale = max(abs(value1), abs(value2))
+        if abs(value1 - value2) > rel_tol * scale + FPRINT_ZERO:
+            return ['']
+        return []
+    if isinstance(value1, list) and isinstance(value2, list):
+        if len(value1) != len(value2):
+            return ['']
+        diff_list = []
+        for item_i, (item1, item2) in enumerate(zip(value1, value2)):
+            diff_list.extend(['[%d]%s' % (item_i, path)
+                              for path in _num_diff(item1, item2, rel_tol)])
+        return diff_list
+    if isinstance(value1, dict) and isinstance(value2, dict):
+        diff_list = []
+        for key in sorted(set(value1) | set(value2)):
+            if key not in value1 or key not in value2:
+                diff_list.append('.' + key)
+            else:
+                diff_list.extend(['.%s%s' % (key, path)
+                                  for path in _num_diff(value1[key],
+                                                        value2[key],
+                                                        rel_tol)])
+        return diff_list
+    if value1 != value2:
+        return ['']
+    return []
+
+
+def features_diff (features1, features2, rel_tol = FPRINT_REL_TOL):
+    """ Features that are different, with a relative tolerance
+
+    Parameters:
+    -----------
+    features1, features2 : dict
+        from shp_features
+    rel_tol : float
+        relative tolerance of the numbers
+
+    Returns:
+    --------
+    list of str: the features that are different, e.g. ['.volume',
+    '.bbox[3]']. Empty if they are the same
+    """
+    return _num_diff(features1, features2, rel_tol)
+
+
+def features_equal (features1, features2, rel_tol = FPRINT_REL_TOL):
+    """ 1 if the features of two shapes are the same, with a relative
+    tolerance, see features_diff
+    """
+    if features_diff(features1, features2, rel_tol):
+        return 0
+    return 1
+
+
+def _features_worker (brep):
+    shp = Part.Shape()
+    shp.importBrepFromString(brep)
+    return shp_features(shp)
+
+
+def features_list (shp_list, n_proc = 1):
+    """ Features of several shapes, in parallel in the warm pool of fcsched
+
+    Parameters:
+    -----------
+    shp_list : list of TopoShape
+    n_proc : int
+        number of processes. 1: in this process. None: number of cpus
+
+    Returns:
+    --------
+    list of dict, see shp_features
+    """
+    if n_proc == 1 or len(shp_list) < 2:
+        return [shp_features(shp) for shp in shp_list]
+    import fcsched
+    pool = fcsched.get_pool(n_proc)
+    return pool.map(_features_worker,
+                    [shp.exportBrepToString() for shp in shp_list])
+
+
+def fingerprint_list (shp_list, n_proc = 1, tol = FPRINT_TOL):
+    """ Fingerprints of several shapes, see features_list
+
+    Returns:
+    --------
+    list of str
+    """
+    return [features_fingerprint(features, tol)
+            for features in features_list(shp_list, n_proc)]
@@ -0,0 +1,230 @@
+# ----------------------------------------------------------------------------
+# -- Memory of the construction of the components
+# -- comps library
+# -- Measures the memory that each component takes and keeps, and finds
+# -- the components that keep more memory each time they are built
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# For each build of a component it is measured:
+#  - the python memory (tracemalloc): what is kept after the build, and the
+#    peak during the build
+#  - the shapes (TopoShape) that are alive: the shapes that are referenced
+#    by python objects, as the attributes shp_* of the components
+#  - the objects of the document
+#  - the memory of the process (resident set size), that includes the
+#    memory of OpenCascade
+# The memory of the shapes is not seen by tracemalloc, that is why the
+# shapes and the process memory are counted.
+#
+# mem_leaks builds a component several times. If the memory that is kept
+# grows on every build, the component is flagged: in a long session it
+# will grow without bound.
+#
+# Example:
+# fcmem.mem_leaks(parts.NemaMotorHolder, nema_size = 17)
+# fcmem.write_report('mem.json')
+
+import os
+import sys
+import gc
+import json
+import logging
+import tracemalloc
+
+import FreeCAD
+import Part
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import fcfun
+
+logger = logging.getLogger(__name__)
+
+# number of builds of a component to see if it keeps memory
+MEM_N_REP = 4
+# a component is flagged if the memory kept grows more than this on each
+# build (bytes): python memory, and memory of the process, that is less
+# precise
+MEM_GROW_MIN = 64 * 1024
+MEM_RSS_GROW_MIN = 1024 * 1024
+# list of the measures, see mem_build
+MEM_LIST = []
+
+
+def n_live_shp ():
+    """ Number of shapes referenced by the python objects
+
+    Returns:
+    --------
+    int
+    """
+    shp_ids = set()
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, Part.Shape):
+                shp_ids.add(id(ref))
+    return len(shp_ids)
+
+
+def n_doc_obj (doc = None):
+    """ Number of objects of the document, 0 if there is no document
+    """
+    if doc is None:
+        doc = fcfun.get_doc()
+    if doc is None:
+        return 0
+    return len(doc.Objects)
+
+
+def proc_rss ():
+    """ Resident set size of the process (bytes), 0 if it is not known
+    """
+    try:
+        with open('/proc/self/statm') as statm_file:
+            n_pages = int(statm_file.read().split()[1])
+        return n_pages * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        return 0
+
+
+def mem_build (build_func, name = '', clean_doc = 0):
+    """ Builds a component and measures its memory
+
+    Parameters:
+    -----------
+    build_func : function
+        function without arguments that builds the component
+    name : str
+        name of the component in the report
+    clean_doc : int
+        1: the objects that the build adds to the document are removed,
+           and the memory is measured after that. So what is kept by the
+           document is not counted as kept
+
+    Returns:
+    --------
+    dict with:
+        'name' : name
+        'py_kept' : python memory kept after the build (bytes)
+        'py_peak' : peak of python memory during the build (bytes)
+        'shp_kept' : number of shapes kept
+        'doc_obj' : number of objects added to the document
+        'rss_kept' : memory of the process kept (bytes)
+    It is also added to MEM_LIST
+    """
+    doc = fcfun.get_doc()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    gc.collect()
+    if doc is not None:
+        obj_names = set([obj.Name for obj in doc.Objects])
+    n_obj_0 = n_doc_obj(doc)
+    n_shp_0 = n_live_shp()
+    rss_0 = proc_rss()
+    py_0 = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+
+    comp = build_func()
+
+    py_peak = tracemalloc.get_traced_memory()[1] - py_0
+    n_obj = n_doc_obj(doc) - n_obj_0
+    if clean_doc == 1 and doc is not None:
+        for obj in doc.Objects:
+            if obj.Name not in obj_names:
+                doc.removeObject(obj.Name)
+    del comp
+    gc.collect()
+    mem = {'name' : name,
+           'py_kept' : tracemalloc.get_traced_memory()[0] - py_0,
+           'py_peak' : py_peak,
+           'shp_kept' : n_live_shp() - n_shp_0,
+           'doc_obj' : n_obj,
+           'rss_kept' : proc_rss() - rss_0}
+    if not tracing:
+        tracemalloc.stop()
+    MEM_LIST.append(mem)
+    return mem
+
+
+def mem_leaks (cls, n_rep = MEM_N_REP, clean_doc = 1, **kwargs):
+    """ Builds a component several times, to see if it keeps memory.
+    If the memory kept grows on every build, it is logged as a warning.
+    The first build is not taken, because it may import modules or fill
+    caches
+
+    Parameters:
+    -----------
+    cls : class or function
+        class of the component
+    n_rep : int
+        number of builds
+    clean_doc : int
+        see mem_build
+    kwargs :
+        arguments of the class
+
+    Returns:
+    --------
+    dict with:
+        'name' : name of the class
+        'builds' : list of the measures of mem_build
+        'leak' : 1 if the memory kept grows on every build
+    """
+    name = cls.__name__
+    build_list = [mem_build(lambda: cls(**kwargs), name, clean_doc)
+                  for i in range(n_rep)]
+    leak = 0
+    if len(build_list) > 2:
+        leak = 1
+        for mem in build_list[1:]:
+            if (mem['py_kept'] < MEM_GROW_MIN
+                and mem['rss_kept'] < MEM_RSS_GROW_MIN
+                and mem['shp_kept'] <= 0):
+                leak = 0
+    if leak == 1:
+        logger.warning('%s keeps memory on each build: %s', name,
+                       ', '.join(['%d KiB, %d shapes'
+                                  % ((mem['py_kept'] + mem['rss_kept'])
+                                      // 1024, mem['shp_kept'])
+                                  for mem in build_list[1:]]))
+    return {'name' : name,
+            'builds' : build_list,
+            'leak' : leak}
+
+
+def write_report (json_path, mem_list = None):
+    """ Writes the measures to a JSON file, with the totals of each
+    component
+
+    Parameters:
+    -----------
+    json_path : str
+    mem_list : list of dict
+        measures of mem_build. None: MEM_LIST
+    """
+    if mem_list is None:
+        mem_list = MEM_LIST
+    comp_dict = {}
+    for mem in mem_list:
+        comp = comp_dict.setdefault(mem['name'], {'n' : 0,
+                                                  'py_kept' : 0,
+                                                  'py_peak' : 0,
+                                                  'shp_kept' : 0,
+                                                  'doc_obj' : 0,
+                                                  'rss_kept' : 0})
+        comp['n'] += 1
+        for key in ('py_kept', 'shp_kept', 'doc_obj', 'rss_kept'):
+            comp[key] += mem[key]
+        comp['py_peak'] = max(comp['py_peak'], mem['py_peak'])
+    with open(json_path, 'w') as json_file:
+        json.dump({'components' : comp_dict,
+                   'builds' : mem_list},
+                  json_file, indent = 2, sort_keys = True)
@@ -0,0 +1,182 @@
+# ----------------------------------------------------------------------------
+# -- Mesh arrays
+# -- comps library
+# -- Meshes of the shapes as NumPy arrays, taken from the tessellation of
+# -- the faces, and passed to other processes in shared memory
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# A mesh is a tuple of 3 arrays (see shp_mesh_arrays):
+#   vertices : float64 (n, 3)
+#   triangles : int32 (m, 3), indexes of the vertices
+#   normals : float64 (m, 3), unit normal of each triangle
+# The mesh is taken from fcexport.mesh_flat, the same tessellation of the
+# STL and 3MF files. The faces are tessellated one by one, so the vertices
+# on the edges are repeated. With merge = 1 they are merged, rounded to
+# fcexport.VERTEX_DECIMALS, and the degenerate triangles are dropped, as in
+# the 3MF files.
+#
+# NumPy is only needed by this module (it is an optional dependency of
+# the library). fc_clss imports it when the meshes are used, so NumPy is
+# not needed by the rest of the library. FreeCAD is only needed to take
+# the mesh of a shape (shp_mesh_arrays, that imports fcexport): the
+# processes that only attach to the meshes import just NumPy and fcshm.
+#
+# Shared memory: publish_mesh copies each array to a shared memory block,
+# and returns a descriptor (that can be pickled) with the names of the
+# blocks. Other processes attach to them with attach_mesh, the arrays are
+# not copied. The blocks live until they are released (release_mesh with
+# unlink = 1), by the last process that uses them, also when the process
+# that has made them ends (see fcshm.open_shm).
+#
+# Example:
+#   mesh_desc = fcmesh.publish_mesh(part.mesh_arrays())
+#   # in another process:
+#   mesh, shm_list = fcmesh.attach_mesh(mesh_desc)
+#   ...
+#   fcmesh.release_mesh(shm_list, unlink = 1)
+
+import os
+import sys
+import logging
+
+import numpy as np
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import kparts
+import fcshm
+
+logger = logging.getLogger(__name__)
+
+MESH_ARRAYS = ('vertices', 'triangles', 'normals')
+
+
+def shp_mesh_arrays (shp, tolerance = kparts.LIN_DEFL, merge = 1):
+    """ Mesh of a shape as arrays
+
+    Parameters:
+    -----------
+    shp : TopoShape
+        with its placement
+    tolerance : float
+        linear deflection of the tessellation
+    merge : int
+        1: the vertices that are repeated on the edges of the faces are
+           merged, and the degenerate triangles dropped
+
+    Returns:
+    --------
+    tuple (vertices, triangles, normals), see the beginning of this file
+    """
+    # imported here, it needs FreeCAD
+    import fcexport
+    coords, indexes = fcexport.mesh_flat(shp, tolerance, merge = merge)
+    # the arrays of the buffers are read only
+    vertices = np.frombuffer(coords, dtype = np.float64).reshape(-1, 3).copy()
+    triangles = np.frombuffer(indexes, dtype = np.intc).reshape(-1, 3)
+    triangles = triangles.astype(np.int32)
+    return (vertices, triangles, tri_normals(vertices, triangles))
+
+
+def tri_normals (vertices, triangles):
+    """ Unit normals of the triangles, (0,0,0) for degenerate triangles
+
+    Returns:
+    --------
+    float64 array (m, 3)
+    """
+    if len(triangles) == 0:
+        return np.zeros((0, 3))
+    tri_vert = vertices[triangles]
+    normals = np.cross(tri_vert[:, 1] - tri_vert[:, 0],
+                       tri_vert[:, 2] - tri_vert[:, 0])
+    length = np.linalg.norm(normals, axis = 1)
+    length[length == 0] = 1.
+    return normals / length[:, np.newaxis]
+
+
+def concat_mesh (mesh_list):
+    """ Joins meshes in one mesh
+
+    Parameters:
+    -----------
+    mesh_list : list of tuples (vertices, triangles, normals)
+
+    Returns:
+    --------
+    tuple (vertices, triangles, normals)
+    """
+    if not mesh_list:
+        return (np.zeros((0, 3)), np.zeros((0, 3), dtype = np.int32),
+                np.zeros((0, 3)))
+    offset_list = np.cumsum([0] + [len(mesh[0]) for mesh in mesh_list[:-1]])
+    vertices = np.concatenate([mesh[0] for mesh in mesh_list])
+    triangles = np.concatenate([mesh[1] + offset
+                                for mesh, offset in zip(mesh_list,
+                                                        offset_list)])
+    normals = np.concatenate([mesh[2] for mesh in mesh_list])
+    return (vertices, triangles.astype(np.int32), normals)
+
+
+def publish_mesh (mesh):
+    """ Copies the arrays of a mesh to shared memory blocks
+
+    Parameters:
+    -----------
+    mesh : tuple (vertices, triangles, normals)
+
+    Returns:
+    --------
+    dict: name of the array -> (name of the block, shape, dtype)
+    """
+    mesh_desc = {}
+    for arr_name, arr in zip(MESH_ARRAYS, mesh):
+        arr = np.ascontiguousarray(arr)
+        # bytes of the array, also if it is empty
+        shm_name, size = fcshm.to_shm(arr.view(np.uint8).reshape(-1))
+        mesh_desc[arr_name] = (shm_name, arr.shape, arr.dtype.str)
+    return mesh_desc
+
+
+def attach_mesh (mesh_desc):
+    """ Arrays of a mesh in shared memory blocks (see publish_mesh), without
+    copying them
+
+    Returns:
+    --------
+    tuple (mesh, shm_list)
+        mesh : tuple (vertices, triangles, normals), their memory is the
+               shared memory: they can't be used after release_mesh
+        shm_list : list of the shared memory blocks, for release_mesh
+    """
+    arr_list = []
+    shm_list = []
+    for arr_name in MESH_ARRAYS:
+        shm_name, shape, dtype = mesh_desc[arr_name]
+        shm = fcshm.open_shm(name = shm_name)
+        shm_list.append(shm)
+        arr_list.append(np.ndarray(shape, dtype = dtype, buffer = shm.buf))
+    return (tuple(arr_list), shm_list)
+
+
+def release_mesh (shm_list, unlink = 0):
+    """ Closes the shared memory blocks of a mesh
+
+    Parameters:
+    -----------
+    shm_list : list of shared_memory.SharedMemory
+        from attach_mesh
+    unlink : int
+        1: the blocks are released, no process can attach to them anymore
+    """
+    for shm in shm_list:
+        shm.close()
+        if unlink == 1:
+            fcshm.unlink_shm(shm)
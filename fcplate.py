@@ -0,0 +1,332 @@
+# ----------------------------------------------------------------------------
+# -- Plates to print
+# -- comps library
+# -- Places the pieces to print on the bed of the printer, making as few
+# -- plates as possible, and exports each plate to STL or 3MF
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The pieces are STL files (already oriented to print, as exported by
+# export_stl) or shapes. The shapes of the parts (SinglePart) are oriented
+# with their prnt_ax, see part_mesh_src
+#
+# The footprint of each piece is the rectangle of its bounding box, and the
+# rectangles are packed in shelves (First Fit Decreasing Height):
+# the rectangles are sorted from the deepest, and each one goes to the first
+# shelf that has space for it, in any plate. If there is no space, a new
+# shelf is opened, and if there is no space for the shelf, a new plate.
+# Each rectangle is turned 90 degrees if it is deeper than wide, so the
+# shelves are lower
+#
+#       bed_w
+#    ________________________
+#   |  ___    _              |
+#   | |   |  | |             |  shelf 2
+#   | |___|  |_|             |
+#   |  _______   ______   __ |
+#   | |       | |      | |  ||  shelf 1
+#   | |       | |      | |__||
+#   | |_______| |______|     |
+#   |________________________| bed_d
+#  0
+
+import os
+import sys
+import logging
+
+import FreeCAD
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import kcomp
+import kparts
+import fcexport
+
+from fcfun import V0, VZ
+
+logger = logging.getLogger(__name__)
+
+
+def shp_prnt_orient (shp, prnt_ax):
+    """ Copy of a shape, oriented to be printed
+
+    Parameters:
+    -----------
+    shp : TopoShape
+    prnt_ax : FreeCAD.Vector
+        axis of the shape that will be vertical (pointing up)
+
+    Returns:
+    --------
+    TopoShape: new shape, rotated
+    """
+    shp_prnt = shp.copy()
+    rotation = FreeCAD.Rotation(prnt_ax, VZ)
+    shp_prnt.transformShape(FreeCAD.Placement(V0, rotation).toMatrix(), True)
+    return shp_prnt
+
+
+def part_mesh_src (part_list):
+    """ Shapes to print of a list of parts, oriented with their prnt_ax.
+    The sets of parts (PartsSet) are taken part by part
+
+    Parameters:
+    -----------
+    part_list : list of SinglePart or PartsSet
+
+    Returns:
+    --------
+    list of TopoShape
+    """
+    shp_list = []
+    for part in part_list:
+        sub_parts = part.get_parts()
+        if sub_parts:
+            shp_list.extend(part_mesh_src(sub_parts))
+        else:
+            shp_list.append(shp_prnt_orient(part.shp, part.prnt_ax))
+    return shp_list
+
+
+def mesh_src_bbox (mesh_src):
+    """ Bounding box of a shape or of a STL file
+
+    Returns:
+    --------
+    tuple: (xmin, ymin, zmin, xmax, ymax, zmax)
+    """
+    if isinstance(mesh_src, str):
+        x_list = []
+        y_list = []
+        z_list = []
+        for tri in fcexport.stl_read(mesh_src):
+            x_list.append(min(tri[0], tri[3], tri[6]))
+            x_list.append(max(tri[0], tri[3], tri[6]))
+            y_list.append(min(tri[1], tri[4], tri[7]))
+            y_list.append(max(tri[1], tri[4], tri[7]))
+            z_list.append(min(tri[2], tri[5], tri[8]))
+            z_list.append(max(tri[2], tri[5], tri[8]))
+        return (min(x_list), min(y_list), min(z_list),
+                max(x_list), max(y_list), max(z_list))
+    bbox = mesh_src.BoundBox
+    return (bbox.XMin, bbox.YMin, bbox.ZMin, bbox.XMax, bbox.YMax, bbox.ZMax)
+
+
+def pack_rects (rect_list,
+                bed_w = kcomp.PRNT_BED_W,
+                bed_d = kcomp.PRNT_BED_D,
+                space = kcomp.PRNT_BED_SPACE):
+    """ Packs rectangles on plates, in shelves
+
+    Parameters:
+    -----------
+    rect_list : list of tuples (w, d)
+        width (x) and depth (y) of each rectangle
+    bed_w : float
+        width of the bed (x)
+    bed_d : float
+        depth of the bed (y)
+    space : float
+        space between the rectangles
+
+    Returns:
+    --------
+    list with a tuple (plate_i, x, y, rot) for each rectangle:
+        plate_i: index of the plate, from 0
+        x, y: position of the corner of the rectangle on the plate
+        rot: 1 if it is turned 90 degrees: its width goes along y
+    None for the rectangles that don't fit on the bed
+    """
+    # the space is added to each rectangle, and so to the bed, because the
+    # last one doesn't need space
+    bed_ws = bed_w + space
+    bed_ds = bed_d + space
+    # rectangles with space, and the orientation to pack them
+    rect_pack = []
+    for rect_i, (rect_w, rect_d) in enumerate(rect_list):
+        rect_ws = rect_w + space
+        rect_ds = rect_d + space
+        # lower shelves if they are wider than deeper
+        rot_list = [0, 1] if rect_ws >= rect_ds else [1, 0]
+        for rot in rot_list:
+            if rot == 1:
+                dims = (rect_ds, rect_ws)
+            else:
+                dims = (rect_ws, rect_ds)
+            if dims[0] <= bed_ws and dims[1] <= bed_ds:
+                rect_pack.append((dims[1], dims[0], rot, rect_i))
+                break
+        else:
+            logger.error('piece %d: %.1f x %.1f does not fit on the bed',
+                         rect_i, rect_w, rect_d)
+    # deepest first, then widest
+    rect_pack.sort(reverse = True)
+
+    pos_list = [None] * len(rect_list)
+    # for each plate: depth used by its shelves
+    plate_d_list = []
+    # shelves: [plate_i, y, depth, width used]
+    shelf_list = []
+    for rect_ds, rect_ws, rot, rect_i in rect_pack:
+        for shelf in shelf_list:
+            if rect_ds <= shelf[2] and shelf[3] + rect_ws <= bed_ws:
+                break
+        else:
+            # new shelf, on the first plate that has space
+            for plate_i, plate_d in enumerate(plate_d_list):
+                if plate_d + rect_ds <= bed_ds:
+                    break
+            else:
+                plate_i = len(plate_d_list)
+                plate_d_list.append(0)
+            shelf = [plate_i, plate_d_list[plate_i], rect_ds, 0]
+            plate_d_list[plate_i] += rect_ds
+            shelf_list.append(shelf)
+        pos_list[rect_i] = (shelf[0], shelf[3], shelf[1], rot)
+        shelf[3] += rect_ws
+    return pos_list
+
+
+def place_matrix (bbox, x, y, rot):
+    """ Matrix to place a piece on the plate
+
+    Parameters:
+    -----------
+    bbox : tuple (xmin, ymin, zmin, xmax, ymax, zmax)
+        bounding box of the piece
+    x, y : float
+        position of the corner of the piece on the plate
+    rot : int
+        1: turned 90 degrees on the vertical axis
+
+    Returns:
+    --------
+    FreeCAD.Matrix
+    """
+    xmin, ymin, zmin, xmax, ymax, zmax = bbox
+    fc_matrix = FreeCAD.Matrix()
+    if rot == 1:
+        # (x, y) -> (-y, x)
+        fc_matrix.A11 = 0
+        fc_matrix.A12 = -1
+        fc_matrix.A21 = 1
+        fc_matrix.A22 = 0
+        fc_matrix.A14 = x + ymax
+        fc_matrix.A24 = y - xmin
+    else:
+        fc_matrix.A14 = x - xmin
+        fc_matrix.A24 = y - ymin
+    # on the bed
+    fc_matrix.A34 = - zmin
+    return fc_matrix
+
+
+def _place_tri (mesh_src, fc_matrix, tolerance):
+    """ Triangles of a shape or of a STL file, placed with a matrix that
+    only turns on the vertical axis
+
+    Returns:
+    --------
+    generator of tuples of 9 floats
+    """
+    a11 = fc_matrix.A11
+    a12 = fc_matrix.A12
+    a21 = fc_matrix.A21
+    a22 = fc_matrix.A22
+    a14 = fc_matrix.A14
+    a24 = fc_matrix.A24
+    a34 = fc_matrix.A34
+    for points, triangles in fcexport.mesh_faces(mesh_src, tolerance):
+        points = [(a11 * px + a12 * py + a14,
+                   a21 * px + a22 * py + a24,
+                   pz + a34) for px, py, pz in points]
+        for i1, i2, i3 in triangles:
+            yield points[i1] + points[i2] + points[i3]
+
+
+def _plate_tri (plate_list, tolerance):
+    for mesh_src, fc_matrix in plate_list:
+        for tri in _place_tri(mesh_src, fc_matrix, tolerance):
+            yield tri
+
+
+def plate_export (mesh_src_list, file_prefix, fmt = 'stl',
+                  bed_w = kcomp.PRNT_BED_W,
+                  bed_d = kcomp.PRNT_BED_D,
+                  space = kcomp.PRNT_BED_SPACE,
+                  tolerance = kparts.LIN_DEFL):
+    """ Places the pieces on the plates and exports each plate to a file
+
+    Parameters:
+    -----------
+    mesh_src_list : list of TopoShape or str
+        pieces to print: shapes oriented to print (see part_mesh_src), or
+        names of STL files. The same STL file can be several times in the
+        list, to print several pieces
+    file_prefix : str
+        the files will be file_prefix + '_1.stl', file_prefix + '_2.stl', ...
+    fmt : str
+        'stl' or '3mf'. In a 3MF file, the pieces that are the same STL
+        file are stored once
+    bed_w : float
+        width of the bed (x)
+    bed_d : float
+        depth of the bed (y)
+    space : float
+        space between the pieces
+    tolerance : float
+        linear deflection of the tessellation of the shapes
+
+    Returns:
+    --------
+    list of str: names of the files of the plates
+    """
+    bbox_list = []
+    # the bounding box of each STL file is read once
+    bbox_dict = {}
+    for mesh_src in mesh_src_list:
+        if isinstance(mesh_src, str):
+            if mesh_src not in bbox_dict:
+                bbox_dict[mesh_src] = mesh_src_bbox(mesh_src)
+            bbox_list.append(bbox_dict[mesh_src])
+        else:
+            bbox_list.append(mesh_src_bbox(mesh_src))
+    pos_list = pack_rects([(bbox[3] - bbox[0], bbox[4] - bbox[1])
+                           for bbox in bbox_list],
+                          bed_w, bed_d, space)
+    # list of the pieces of each plate: (mesh_src, matrix)
+    plates = []
+    for mesh_src, bbox, pos in zip(mesh_src_list, bbox_list, pos_list):
+        if pos is None:
+            continue
+        plate_i, x, y, rot = pos
+        while len(plates) <= plate_i:
+            plates.append([])
+        plates[plate_i].append((mesh_src, place_matrix(bbox, x, y, rot)))
+
+    file_list = []
+    for plate_i, plate_list in enumerate(plates, 1):
+        file_path = '%s_%d.%s' % (file_prefix, plate_i, fmt)
+        if fmt == '3mf':
+            # the same STL file, or the same shape, is stored once
+            obj_list = []
+            obj_dict = {}
+            for mesh_src, fc_matrix in plate_list:
+                key = mesh_src if isinstance(mesh_src, str) else id(mesh_src)
+                if key not in obj_dict:
+                    obj_dict[key] = (mesh_src, [])
+                    obj_list.append(obj_dict[key])
+                obj_dict[key][1].append(fc_matrix)
+            fcexport.write_3mf(file_path, obj_list, tolerance)
+        else:
+            fcexport.stl_write_tri(file_path,
+                                   _plate_tri(plate_list, tolerance))
+        logger.info('%s: %d pieces', file_path, len(plate_list))
+        file_list.append(file_path)
+    return file_list
@@ -0,0 +1,310 @@
+# ----------------------------------------------------------------------------
+# -- Profile of the construction of the shapes
+# -- comps library
+# -- Measures the time of the shape functions of fcfun and of the operations
+# -- of the shapes, for each component
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The python profiler shows the time of the operations of OpenCascade
+# inside the python function that calls them, but not which operation and
+# on which shape. This module records each call to:
+#  - the functions shp_* and fuseshplist of fcfun
+#  - the methods of the shapes in PROF_SHP_METHODS: fuse, cut, ...
+#  - the functions in PROF_FUNCTIONS: meshFromShape
+# with its time, the number of faces of the shapes it takes and returns, and
+# the classes of the components that are being built (the classes of the
+# objects of the methods that are in the call stack).
+#
+# It is made with sys.setprofile, so nothing is changed in the code of the
+# library, and nothing is done until start is called:
+#
+# fcprof.start()
+# parts.NemaMotorHolder(...)
+# fcprof.stop()
+# fcprof.write_report('prof.json', 'prof.folded')
+#
+# The number of faces that the methods of the shapes return is not known,
+# because the profiler doesn't get the value returned by the C functions,
+# so faces_out is only in the report for the functions of fcfun.
+# The stack file can be converted to a flame graph with flamegraph.pl:
+# flamegraph.pl prof.folded > prof.svg
+
+import os
+import sys
+import time
+import json
+import logging
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import fcfun
+
+logger = logging.getLogger(__name__)
+
+# methods of the shapes that are recorded
+PROF_SHP_METHODS = ('fuse', 'cut', 'common', 'multiFuse',
+                    'makeFillet', 'makeChamfer', 'removeSplitter')
+# functions of the C modules that are recorded
+PROF_FUNCTIONS = ('meshFromShape',)
+
+# name of the component when a call is not made by a component
+NO_COMP = '-'
+
+# list of the calls recorded, see _Call
+CALL_LIST = []
+# calls that haven't returned
+_OPEN_LIST = []
+# file of the fcfun functions
+_FCFUN_FILE = os.path.splitext(os.path.abspath(fcfun.__file__))[0]
+# code of the fcfun functions that are recorded
+_FCFUN_CODE = set()
+
+
+class _Call (object):
+    """ A recorded call
+
+    Attributes:
+    -----------
+    op : str
+        name of the function or of the method
+    comp : str
+        class of the component that makes the call
+    stack : list of str
+        classes of the components and the recorded calls, from the outer
+        one to this call
+    t_tot : float
+        time of the call, in seconds
+    t_child : float
+        time of the recorded calls made inside this call
+    outer : int
+        1: it is not inside another recorded call
+    faces_in : int
+        faces of the shapes taken by the call. None if it doesn't take shapes
+    faces_out : int
+        faces of the shape returned by the call. None if it is not known:
+        the methods of the shapes and the C functions
+    """
+    def __init__ (self, op, comp, stack, faces_in, outer):
+        self.op = op
+        self.outer = outer
+        self.comp = comp
+        self.stack = stack
+        self.faces_in = faces_in
+        self.faces_out = None
+        self.t_child = 0.
+        self.t_tot = 0.
+        self.t_start = time.perf_counter()
+
+
+def _n_faces (obj):
+    """ Number of faces of a shape, or of a list of shapes.
+    None if they are not shapes
+    """
+    if isinstance(obj, (list, tuple)):
+        n_list = [_n_faces(item) for item in obj]
+        n_list = [n_faces for n_faces in n_list if n_faces is not None]
+        if n_list:
+            return sum(n_list)
+        return None
+    try:
+        return len(obj.Faces)
+    except Exception:
+        return None
+
+
+def _comp_stack (frame):
+    """ Classes of the components in the call stack, from the outer one.
+    The methods of the same object are taken once, so a class and the
+    classes that it inherits are one component
+    """
+    comp_list = []
+    prev_id = None
+    while frame is not None:
+        obj = frame.f_locals.get('self')
+        if obj is not None and id(obj) != prev_id:
+            prev_id = id(obj)
+            comp_list.append(type(obj).__name__)
+        frame = frame.f_back
+    comp_list.reverse()
+    return comp_list
+
+
+def _open_call (op, frame, faces_in):
+    comp_list = _comp_stack(frame)
+    if comp_list:
+        comp = comp_list[-1]
+    else:
+        comp = NO_COMP
+    if _OPEN_LIST:
+        stack = _OPEN_LIST[-1].stack + [op]
+        outer = 0
+    else:
+        stack = comp_list + [op]
+        outer = 1
+    _OPEN_LIST.append(_Call(op, comp, stack, faces_in, outer))
+
+
+def _close_call (faces_out = None):
+    call = _OPEN_LIST.pop()
+    call.t_tot = time.perf_counter() - call.t_start
+    call.faces_out = faces_out
+    if _OPEN_LIST:
+        _OPEN_LIST[-1].t_child += call.t_tot
+    CALL_LIST.append(call)
+
+
+def _profile (frame, event, arg):
+    if event == 'call':
+        if frame.f_code in _FCFUN_CODE:
+            _open_call('fcfun.' + frame.f_code.co_name, frame.f_back,
+                       _n_faces(list(frame.f_locals.values())))
+    elif event == 'return':
+        if frame.f_code in _FCFUN_CODE and _OPEN_LIST:
+            _close_call(_n_faces(arg))
+    elif event == 'c_call':
+        name = getattr(arg, '__name__', None)
+        if name in PROF_SHP_METHODS:
+            shp = getattr(arg, '__self__', None)
+            faces_in = _n_faces(shp)
+            if faces_in is not None:
+                _open_call(name, frame, faces_in)
+                # to know which c_return is of this call
+                _OPEN_LIST[-1].c_func = arg
+        elif name in PROF_FUNCTIONS:
+            _open_call(name, frame, None)
+            _OPEN_LIST[-1].c_func = arg
+    else:
+        # c_return and c_exception
+        if (_OPEN_LIST and
+            getattr(_OPEN_LIST[-1], 'c_func', None) is arg):
+            _close_call()
+
+
+def start ():
+    """ Starts recording the calls, the previous calls are deleted
+    """
+    del CALL_LIST[:]
+    del _OPEN_LIST[:]
+    _FCFUN_CODE.clear()
+    for name, func in vars(fcfun).items():
+        if ((name.startswith('shp_') or name == 'fuseshplist')
+            and hasattr(func, '__code__')
+            and os.path.splitext(os.path.abspath(
+                      func.__code__.co_filename))[0] == _FCFUN_FILE):
+            _FCFUN_CODE.add(func.__code__)
+    sys.setprofile(_profile)
+
+
+def stop ():
+    """ Stops recording the calls
+
+    Returns:
+    --------
+    list of _Call: the recorded calls
+    """
+    sys.setprofile(None)
+    if _OPEN_LIST:
+        logger.debug('%d calls without return', len(_OPEN_LIST))
+        del _OPEN_LIST[:]
+    return CALL_LIST
+
+
+def comp_summary (call_list = None):
+    """ Time of the calls of each component, for each operation
+
+    Parameters:
+    -----------
+    call_list : list of _Call
+        None: the last recorded calls
+
+    Returns:
+    --------
+    dict: component -> operation -> dict with:
+        'n' : number of calls
+        't_tot' : time of the calls, including the recorded calls inside
+        't_self' : time of the calls, without the recorded calls inside
+        'faces_in' : faces of the shapes taken
+        'faces_out' : faces of the shapes returned. Only for the
+                      operations whose result is known (fcfun)
+    """
+    if call_list is None:
+        call_list = CALL_LIST
+    summary = {}
+    for call in call_list:
+        op_dict = summary.setdefault(call.comp, {})
+        op_sum = op_dict.setdefault(call.op, {'n' : 0,
+                                              't_tot' : 0.,
+                                              't_self' : 0.,
+                                              'faces_in' : 0})
+        op_sum['n'] += 1
+        op_sum['t_tot'] += call.t_tot
+        op_sum['t_self'] += call.t_tot - call.t_child
+        if call.faces_in is not None:
+            op_sum['faces_in'] += call.faces_in
+        if call.faces_out is not None:
+            op_sum['faces_out'] = op_sum.get('faces_out', 0) + call.faces_out
+    return summary
+
+
+def _call_report (call):
+    """ Dictionary of a call for the report, without faces_out if it is
+    not known
+    """
+    call_dict = {'op' : call.op,
+                 'comp' : call.comp,
+                 'stack' : ';'.join(call.stack),
+                 't_tot' : call.t_tot,
+                 'faces_in' : call.faces_in}
+    if call.faces_out is not None:
+        call_dict['faces_out'] = call.faces_out
+    return call_dict
+
+
+def write_report (json_path, stack_path = '', n_worst = 20,
+                  call_list = None):
+    """ Writes the report of the recorded calls
+
+    Parameters:
+    -----------
+    json_path : str
+        JSON file with the summary of each component (see comp_summary) and
+        the n_worst slowest calls
+    stack_path : str
+        file with the stacks of the calls, in the format of flamegraph.pl:
+        one line for each stack, with the time in microseconds that is
+        not in the calls inside. '': it is not written
+    n_worst : int
+        number of the slowest calls in the report
+    call_list : list of _Call
+        None: the last recorded calls
+    """
+    if call_list is None:
+        call_list = CALL_LIST
+    worst_list = sorted(call_list, key = lambda call: call.t_tot,
+                        reverse = True)[:n_worst]
+    report = {
+        'n_calls' : len(call_list),
+        # time of the calls that are not inside other recorded calls
+        't_tot' : sum([call.t_tot for call in call_list if call.outer]),
+        'components' : comp_summary(call_list),
+        'worst' : [_call_report(call) for call in worst_list]}
+    with open(json_path, 'w') as json_file:
+        json.dump(report, json_file, indent = 2, sort_keys = True)
+
+    if stack_path:
+        stack_dict = {}
+        for call in call_list:
+            stack = ';'.join(call.stack)
+            t_self = call.t_tot - call.t_child
+            stack_dict[stack] = stack_dict.get(stack, 0.) + t_self
+        with open(stack_path, 'w') as stack_file:
+            for stack in sorted(stack_dict):
+                stack_file.write('%s %d\n'
+                                 % (stack, round(stack_dict[stack] * 1e6)))
@@ -0,0 +1,796 @@
+# ----------------------------------------------------------------------------
+# -- Geometry regression
+# -- comps library
+# -- Builds the components over a matrix of parameters and compares their
+# -- geometry with the golden values, to know that a change has not
+# -- changed the pieces
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Each entry of REGRESS_LIST is a dictionary:
+#  'module' : module of the class
+#  'cls'    : class (or function) that makes the component
+#  'params' : parameters that are the same in all the cases. The constants
+#             of kcomp, kcomp_optic and kparts can be given with
+#             fcbuild.KRef
+#  'matrix' : optional. Parameter -> list of values. There is a case for
+#             each combination of the values
+#  'local'  : optional. 1: the cases are built in this process, not in the
+#             pool: the sets with sched = 1 use the pool themselves
+#  'base_drop' : optional. Options that don't change the shape, they are
+#             left out when the golden values are recorded from a tree that
+#             doesn't have them (--base). The arguments that have their
+#             default value are also left out
+#  'golden_cls' : optional. The golden values are the ones of the case of
+#             this class with the same matrix values, they are not recorded
+#             (tol_variant has to make the same shapes as the class)
+#
+# Each case is built in a new document, in the warm pool of fcsched,
+# without GUI. The features of its shape (fchash.shp_features: volume,
+# area, bounding box, number of faces, types of faces and edges, ...) and
+# its fingerprint are compared with the ones in REGRESS_GOLDEN.
+# The numbers are compared with a relative tolerance (REGRESS_REL_TOL).
+# If the features are the same but the fingerprint is not, it is just
+# logged, a number can be on the limit of the rounding of the fingerprint.
+#
+# The golden values are recorded from a revision that is known to be good,
+# built with its own modules in a git worktree (see fcgolden):
+#   python fcregress.py --base b0c913b
+# The cases that the revision can't build (arguments that it doesn't have
+# and change the shape) are recorded from this tree, once they have been
+# checked:
+#   python fcregress.py --update -k LinBearHouse-d_lbearhousing=SCUU.10-tol
+# After changing the library:
+#   python fcregress.py              # exit status 1 if a case is different,
+#                                    # can't be built or has no golden value
+#   python fcregress.py -k NemaMotor # only the cases with NemaMotor
+# When a piece has been changed on purpose, its golden values are updated
+# with --update and the name of the cases
+
+import os
+import sys
+import json
+import shutil
+import inspect
+import logging
+import tempfile
+import itertools
+import importlib
+import multiprocessing
+import traceback
+import subprocess
+
+import FreeCAD
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import kparts
+import fcfun
+import fchash
+import fcgolden
+import fcsched
+import fcserve
+from fcbuild import KRef
+
+logger = logging.getLogger(__name__)
+
+PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# golden values: name of the case -> {'features' : ..., 'fprint' : ...}
+REGRESS_GOLDEN = os.path.join(PKG_DIR, 'golden_fprint.json')
+
+# revision of the golden values, see --base
+REGRESS_BASE = 'b0c913b'
+
+# relative tolerance of the numbers of the features
+REGRESS_REL_TOL = fchash.FPRINT_REL_TOL
+
+V0 = FreeCAD.Vector(0,0,0)
+VX = FreeCAD.Vector(1,0,0)
+VY = FreeCAD.Vector(0,1,0)
+VZ = FreeCAD.Vector(0,0,1)
+VXN = FreeCAD.Vector(-1,0,0)
+VZN = FreeCAD.Vector(0,0,-1)
+
+REGRESS_LIST = [
+    # shp_clss
+    {'module' : 'shp_clss',
+     'cls'    : 'ShpCyl',
+     'params' : {'r' : 5., 'h' : 20.},
+     'matrix' : {'axis_h' : [VZ, VX],
+                 'pos_h' : [0, 1],
+                 'xtr_top' : [0, 1.]}},
+
+    {'module' : 'shp_clss',
+     'cls'    : 'ShpCylHole',
+     'params' : {'r_out' : 8., 'r_in' : 3., 'h' : 10., 'axis_d' : VX},
+     'matrix' : {'pos_h' : [0, 1],
+                 'pos_d' : [0, 1, 2],
+                 'xtr_r_in' : [0, 0.5]}},
+
+    {'module' : 'shp_clss',
+     'cls'    : 'ShpPrismHole',
+     'params' : {'r_out' : 6., 'h' : 4., 'r_in' : 2., 'axis_d' : VX},
+     'matrix' : {'n_sides' : [4, 6],
+                 'axis_d_apo' : [0, 1],
+                 'pos_h' : [0, 1]}},
+
+    {'module' : 'shp_clss',
+     'cls'    : 'ShpBolt',
+     'params' : {'shank_r' : 1.5, 'shank_l' : 16., 'head_r' : 2.75,
+                 'head_l' : 3., 'axis_d' : VX},
+     'matrix' : {'head_type' : [0, 1],
+                 'pos_h' : [0, 1, 2],
+                 'shank_out' : [0, 0.5]}},
+
+    # fcfun
+    {'module' : 'fcfun',
+     'cls'    : 'shp_regprism',
+     'params' : {'n_sides' : 6, 'radius' : 4., 'length' : 10.},
+     'matrix' : {'centered' : [0, 1],
+                 'n_axis' : ['z', 'x'],
+                 'pos' : [V0, FreeCAD.Vector(5, 2, 1)]}},
+
+    # not centered: centered = 1 failed in b0c913b (a float added to a
+    # FreeCAD.Vector), it is the centered shp_regprism of the cases above
+    # on a moved pos
+    {'module' : 'fcfun',
+     'cls'    : 'shp_regprism_xtr',
+     'params' : {'n_sides' : 6, 'radius' : 4., 'length' : 10.,
+                 'xtr_top' : 1., 'xtr_bot' : 0.5},
+     'matrix' : {'pos' : [V0, FreeCAD.Vector(5, 2, 1)]}},
+
+    # comps
+    {'module' : 'comps',
+     'cls'    : 'Sk_dir',
+     'params' : {'wfco' : 1, 'pillow' : 0},
+     'matrix' : {'size' : [6, 8, 10, 12],
+                 'tol' : [0, 0.3],
+                 'ref_hr' : [0, 1]}},
+
+    {'module' : 'comps',
+     'cls'    : 'Sk_dir',
+     'params' : {'wfco' : 1, 'pillow' : 1},
+     'matrix' : {'size' : [8, 12]}},
+
+    {'module' : 'comps',
+     'cls'    : 'PartNemaMotor',
+     'params' : {},
+     'matrix' : {'nema_size' : [11, 14, 17, 23],
+                 'rear_shaft_l' : [0, 10.],
+                 'pos_h' : [0, 1]}},
+
+    {'module' : 'comps',
+     'cls'    : 'PartGtPulley',
+     'params' : {},
+     'matrix' : {'n_teeth' : [16, 20],
+                 'bot_flange_h' : [0, 1.],
+                 'tol' : [0, 0.3]}},
+
+    {'module' : 'comps',
+     'cls'    : 'PartAluProf',
+     'params' : {'depth' : 50.},
+     'matrix' : {'aluprof_dict' : [KRef('kcomp', 'ALU_MOTEDIS_20I5'),
+                                   KRef('kcomp', 'ALU_MOTEDIS_30B8')],
+                 'model_type' : [0, 1],
+                 'pos_d' : [0, 1]}},
+
+    {'module' : 'comps',
+     'cls'    : 'PartLinGuideRail',
+     'params' : {'rail_d' : 100.},
+     'matrix' : {'rail_dict' : [KRef('kcomp', 'SEB8_R'),
+                                KRef('kcomp', 'SEB15A_R')],
+                 'boltend_sep' : [0, 5.]}},
+
+    # parts
+    {'module' : 'parts',
+     'cls'    : 'LinBearHouse',
+     'params' : {},
+     'matrix' : {'d_lbearhousing' : [KRef('kcomp', 'SCUU', 8),
+                                     KRef('kcomp', 'SCUU', 10),
+                                     KRef('kcomp', 'SCUU', 12)],
+                 'mid_center' : [0, 1]}},
+
+    {'module' : 'parts',
+     'cls'    : 'LinBearHouse',
+     'params' : {},
+     'matrix' : {'d_lbearhousing' : [KRef('kcomp', 'SCUU', 8),
+                                     KRef('kcomp', 'SCUU', 12)],
+                 'axis_center' : [0, 1],
+                 'mirror_build' : [0, 1]},
+     'base_drop' : ['mirror_build']},
+
+    # tol = None: the tolerance of the class
+    {'module' : 'parts',
+     'cls'    : 'LinBearHouse',
+     'params' : {},
+     'matrix' : {'d_lbearhousing' : [KRef('kcomp', 'SCUU', 10)],
+                 'tol' : [None, 0.2, 0.3]}},
+
+    {'module' : 'parts',
+     'cls'    : 'ThinLinBearHouse',
+     'params' : {},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 8),
+                              KRef('kcomp', 'LMEUU', 10),
+                              KRef('kcomp', 'LMEUU', 12)],
+                 'axis_center' : [0, 1],
+                 'bolt_center' : [0, 1]}},
+
+    {'module' : 'parts',
+     'cls'    : 'ThinLinBearHouse',
+     'params' : {},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 8),
+                              KRef('kcomp', 'LMEUU', 12)],
+                 'mid_center' : [0, 1],
+                 'mirror_build' : [0, 1]},
+     'base_drop' : ['mirror_build']},
+
+    {'module' : 'parts',
+     'cls'    : 'ThinLinBearHouse',
+     'params' : {},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 10)],
+                 'tol' : [None, 0.2, 0.3]}},
+
+    {'module' : 'parts',
+     'cls'    : 'ThinLinBearHouse1rail',
+     'params' : {},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 10),
+                              KRef('kcomp', 'LMEUU', 12)],
+                 'mid_center' : [0, 1]}},
+
+    # tol = kcomp.TOL is the tolerance of b0c913b
+    {'module' : 'parts',
+     'cls'    : 'ThinLinBearHouse1rail',
+     'params' : {},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 10)],
+                 'tol' : [0.2, 0.3, KRef('kcomp', 'TOL')]}},
+
+    {'module' : 'parts',
+     'cls'    : 'ThinLinBearHouseAsim',
+     'params' : {'fc_fro_ax' : VX, 'fc_bot_ax' : VZN, 'fc_sid_ax' : VY},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 10),
+                              KRef('kcomp', 'LMEUU', 12)],
+                 'refcen_dep' : [0, 1],
+                 'mirror_build' : [0, 1]},
+     'base_drop' : ['mirror_build']},
+
+    {'module' : 'parts',
+     'cls'    : 'ThinLinBearHouseAsim',
+     'params' : {'fc_fro_ax' : VX, 'fc_bot_ax' : VZN, 'fc_sid_ax' : VY},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 10)],
+                 'tol' : [0.2, 0.3, KRef('kcomp', 'TOL')]}},
+
+    {'module' : 'parts',
+     'cls'    : 'NemaMotorHolder',
+     'params' : {'fc_axis_h' : VZN, 'fc_axis_n' : VX, 'wfco' : 1},
+     'matrix' : {'nema_size' : [11, 14, 17],
+                 'motor_max_h' : [20., 55.],
+                 'rail' : [0, 1]}},
+
+    {'module' : 'parts',
+     'cls'    : 'PartNemaMotorHolder',
+     'params' : {},
+     'matrix' : {'nema_size' : [11, 14, 17],
+                 'rail' : [0, 1],
+                 'pos_h' : [0, 1]}},
+
+    {'module' : 'parts',
+     'cls'    : 'AluProfBracketPerp',
+     'params' : {'wfco' : 1},
+     'matrix' : {'alusize_lin' : [20., 30.],
+                 'alusize_perp' : [20., 30.],
+                 'reinforce' : [0, 1]}},
+
+    # their bolt holes are tools of shp_fastener
+    {'module' : 'parts',
+     'cls'    : 'AluProfBracketPerpFlap',
+     'params' : {'wfco' : 1},
+     'matrix' : {'alusize_lin' : [20., 30.],
+                 'alusize_perp' : [20., 30.],
+                 'nbolts_lin' : [1, 2],
+                 'flap' : [0, 1]}},
+
+    {'module' : 'parts',
+     'cls'    : 'AluProfBracketPerpTwin',
+     'params' : {'alu_sep' : 60., 'wfco' : 1},
+     'matrix' : {'alusize_lin' : [20., 30.],
+                 'alusize_perp' : [20., 30.],
+                 'nbolts_lin' : [1, 2],
+                 'bolt_perp_line' : [0, 1]}},
+
+    {'module' : 'parts',
+     'cls'    : 'IdlePulleyHolder',
+     'params' : {'profile_size' : 20., 'pulleybolt_d' : 3.,
+                 'holdbolt_d' : 5},
+     'matrix' : {'above_h' : [30., 40.],
+                 'rail' : [0, 1],
+                 'attach_dir' : ['-y', 'x']}},
+
+    {'module' : 'parts',
+     'cls'    : 'SimpleEndstopHolder',
+     'params' : {'wfco' : 1},
+     'matrix' : {'d_endstop' : [KRef('kcomp', 'ENDSTOP_A'),
+                                KRef('kcomp', 'ENDSTOP_B')],
+                 'rail_l' : [0, 15]}},
+
+    # partset
+    {'module' : 'partset',
+     'cls'    : 'BearWashSet',
+     'params' : {'axis_h' : VZ},
+     'matrix' : {'metric' : [3, 4],
+                 'pos_h' : [0, 1, 3]}},
+
+    {'module' : 'partset',
+     'cls'    : 'Din912BoltWashSet',
+     'params' : {'axis_d' : VX},
+     'matrix' : {'metric' : [3, 4, 5],
+                 'shank_l' : [10., 20.],
+                 'wide_washer' : [0, 1]}},
+
+    {'module' : 'partset',
+     'cls'    : 'Din934NutWashSet',
+     'params' : {'axis_d' : VX},
+     'matrix' : {'metric' : [3, 4, 5],
+                 'axis_d_apo' : [0, 1]}},
+
+    {'module' : 'partset',
+     'cls'    : 'NemaMotorPulleySet',
+     'params' : {},
+     'matrix' : {'nema_size' : [14, 17],
+                 'sched' : [0, 1]},
+     'local'  : 1,
+     'base_drop' : ['sched']},
+
+    {'module' : 'partset',
+     'cls'    : 'NemaMotorPulleyHolderSet',
+     'params' : {},
+     'matrix' : {'nema_size' : [14, 17],
+                 'sched' : [0, 1]},
+     'local'  : 1,
+     'base_drop' : ['sched']},
+
+    # beltcl
+    {'module' : 'beltcl',
+     'cls'    : 'BeltClamp',
+     'params' : {'fc_fro_ax' : VX, 'fc_top_ax' : VZ, 'wfco' : 1},
+     'matrix' : {'bolt_d' : [3, 4],
+                 'bolt_csunk' : [0, 2],
+                 'base_h' : [0, 2]}},
+
+    {'module' : 'beltcl',
+     'cls'    : 'DoubleBeltClamp',
+     'params' : {'wfco' : 1},
+     'matrix' : {'bolt_d' : [3, 4],
+                 'base_h' : [0, 2],
+                 'mirror_build' : [0, 1]},
+     'base_drop' : ['mirror_build']},
+
+    # comp_optic
+    {'module' : 'comp_optic',
+     'cls'    : 'f_cagecube',
+     'params' : {'d_cagecube' : KRef('kcomp_optic', 'CAGE_CUBE_60')},
+     'matrix' : {'axis_thru_rods' : ['x', 'z'],
+                 'axis_thru_hole' : ['y'],
+                 'sym_build' : [0, 1]},
+     'base_drop' : ['sym_build']},
+
+    {'module' : 'comp_optic',
+     'cls'    : 'f_cagecubehalf',
+     'params' : {'d_cagecubehalf' : KRef('kcomp_optic',
+                                         'CAGE_CUBE_HALF_60')},
+     'matrix' : {'axis_1' : ['x', 'z'],
+                 'sym_build' : [0, 1]},
+     'base_drop' : ['sym_build']},
+
+    {'module' : 'comp_optic',
+     'cls'    : 'Lb1cPlate',
+     'params' : {'d_plate' : KRef('kcomp_optic', 'LB1CM_PLATE')},
+     'matrix' : {'ref_in' : [0, 1],
+                 'fc_axis_l' : [VX, VY]}},
+
+    {'module' : 'comp_optic',
+     'cls'    : 'SM1TubelensSm2',
+     'params' : {},
+     'matrix' : {'sm1l_size' : [5, 10, 30],
+                 'ring' : [0, 1]}},
+
+    # tolerance variants (fcvariant), the same shapes as the pieces built
+    # one by one
+    {'module' : 'fcregress',
+     'cls'    : 'tol_variant',
+     'params' : {'var_module' : 'parts', 'var_cls' : 'LinBearHouse'},
+     'matrix' : {'d_lbearhousing' : [KRef('kcomp', 'SCUU', 10)],
+                 'tol' : [0.2, 0.3]},
+     'golden_cls' : 'LinBearHouse'},
+
+    {'module' : 'fcregress',
+     'cls'    : 'tol_variant',
+     'params' : {'var_module' : 'parts', 'var_cls' : 'ThinLinBearHouse'},
+     'matrix' : {'d_lbear' : [KRef('kcomp', 'LMEUU', 10)],
+                 'tol' : [0.2, 0.3]},
+     'golden_cls' : 'ThinLinBearHouse'},
+
+    {'module' : 'fcregress',
+     'cls'    : 'tol_variant',
+     'params' : {'var_module' : 'comps', 'var_cls' : 'Sk_dir',
+                 'wfco' : 1, 'pillow' : 0},
+     'matrix' : {'size' : [8, 12],
+                 'tol' : [0, 0.3],
+                 'ref_hr' : [1]},
+     'golden_cls' : 'Sk_dir'},
+]
+
+
+def tol_variant (var_module, var_cls, tol, **kwargs):
+    """ Builds a piece with fcvariant.build_tol_variants: the tolerances of
+    kparts.TOL_STEPS that are smaller than tol, and then tol, so the piece
+    of tol takes the body of the first one
+
+    Parameters:
+    -----------
+    var_module, var_cls : str
+        module and class of the piece
+    tol : float
+        tolerance of the piece
+    kwargs :
+        the other arguments of the class
+
+    Returns:
+    --------
+    the object of tol
+    """
+    import fcvariant
+    cls = getattr(importlib.import_module(var_module), var_cls)
+    tol_list = [tol_i for tol_i in kparts.TOL_STEPS if tol_i < tol] + [tol]
+    kwargs.setdefault('name', var_cls.lower())
+    return fcvariant.build_tol_variants(cls, tol_list, **kwargs)[-1]
+
+
+def _value_name (value):
+    """ Short text of a parameter for the name of a case
+    """
+    if isinstance(value, FreeCAD.Vector):
+        return '(%g,%g,%g)' % (value.x, value.y, value.z)
+    if isinstance(value, KRef):
+        return '.'.join([value.attr] + [str(key) for key in value.keys])
+    if isinstance(value, float):
+        return '%g' % value
+    return str(value)
+
+
+def expand_cases (regress_list = None):
+    """ Cases of the regression: the combinations of the matrix of each
+    entry
+
+    Parameters:
+    -----------
+    regress_list : list of dict
+        see the beginning of this file. None: REGRESS_LIST
+
+    Returns:
+    --------
+    list of tuples (name, module, class, params, opts)
+    The name is the class and the values of the matrix:
+    'Sk_dir-ref_hr=0-size=8-tol=0.3'
+    opts is a dictionary with:
+        'local' : int, see the beginning of this file
+        'base_drop' : list of str
+        'golden' : name of the case of the golden values
+    """
+    if regress_list is None:
+        regress_list = REGRESS_LIST
+    case_list = []
+    for entry in regress_list:
+        matrix = entry.get('matrix', {})
+        key_list = sorted(matrix)
+        for value_list in itertools.product(*[matrix[key]
+                                              for key in key_list]):
+            params = dict(entry['params'])
+            params.update(zip(key_list, value_list))
+            matrix_name = ['%s=%s' % (key, _value_name(value))
+                           for key, value in zip(key_list, value_list)]
+            name = '-'.join([entry['cls']] + matrix_name)
+            opts = {'local' : entry.get('local', 0),
+                    'base_drop' : entry.get('base_drop', []),
+                    'golden' : '-'.join([entry.get('golden_cls',
+                                                   entry['cls'])]
+                                        + matrix_name)}
+            case_list.append((name, entry['module'], entry['cls'], params,
+                              opts))
+    return case_list
+
+
+def _case_worker (mod_name, cls_name, params_code):
+    """ Builds a case in a new document, in a process of the pool
+
+    Returns:
+    --------
+    tuple (features, error)
+    """
+    doc = None
+    try:
+        params = {}
+        for key, code in params_code.items():
+            value = fcsched.vec_decode(code)
+            if isinstance(value, KRef):
+                value = value.value()
+            params[key] = value
+        cls = getattr(importlib.import_module(mod_name), cls_name)
+        doc = FreeCAD.newDocument('fcregress')
+        with fcfun.doc_context(doc):
+            with fcfun.bulk_build(doc):
+                obj = cls(**params)
+            features = fchash.shp_features(fcserve.job_shape(obj))
+        return (features, '')
+    except Exception:
+        return (None, traceback.format_exc())
+    finally:
+        if doc is not None:
+            fcfun.clear_fco_view(doc)
+            FreeCAD.closeDocument(doc.Name)
+
+
+def run_cases (case_list, n_proc = None):
+    """ Builds the cases in the warm pool of fcsched, and the local ones
+    in this process, after them
+
+    Parameters:
+    -----------
+    case_list : list of tuples
+        from expand_cases
+    n_proc : int
+        number of processes. None: number of cpus
+
+    Returns:
+    --------
+    dict: name of the case -> tuple (features, error)
+    """
+    pool = fcsched.get_pool(n_proc)
+    result_list = []
+    local_list = []
+    for name, mod_name, cls_name, params, opts in case_list:
+        params_code = dict((key, fcsched.vec_encode(value))
+                           for key, value in params.items())
+        if opts['local'] == 1:
+            local_list.append((name, (mod_name, cls_name, params_code)))
+        else:
+            result_list.append((name,
+                                pool.apply_async(_case_worker,
+                                                 (mod_name, cls_name,
+                                                  params_code))))
+    result_dict = dict((name, result.get()) for name, result in result_list)
+    for name, case_args in local_list:
+        result_dict[name] = _case_worker(*case_args)
+    return result_dict
+
+
+def _base_drop (mod_name, cls_name, params, base_drop):
+    """ Parameters of a case that can be left out in the tree of the golden
+    values: the options of base_drop, and the ones with their default
+    value in this tree
+    """
+    drop_list = list(base_drop)
+    arg_dict = inspect.signature(
+                   getattr(importlib.import_module(mod_name),
+                           cls_name)).parameters
+    for key, value in params.items():
+        if isinstance(value, KRef):
+            value = value.value()
+        if key not in arg_dict:
+            continue
+        default = arg_dict[key].default
+        if (default is not arg_dict[key].empty
+            and type(value) == type(default) and value == default):
+            drop_list.append(key)
+    return drop_list
+
+
+def run_base_cases (case_list, base = REGRESS_BASE, n_proc = None):
+    """ Builds the cases with the modules of other revision of the library,
+    in a git worktree, see fcgolden
+
+    Parameters:
+    -----------
+    case_list : list of tuples
+        from expand_cases
+    base : str
+        git revision
+    n_proc : int
+        number of processes. None: number of cpus
+
+    Returns:
+    --------
+    dict: name of the case -> tuple (features, error)
+    """
+    if n_proc is None:
+        n_proc = multiprocessing.cpu_count()
+    work_dir = tempfile.mkdtemp(prefix = 'fcregress_')
+    base_dir = os.path.join(work_dir, 'base')
+    subprocess.check_call(['git', '-C', PKG_DIR, 'worktree', 'add',
+                           '--detach', base_dir, base])
+    try:
+        code_list = [{'name' : name, 'module' : mod_name, 'cls' : cls_name,
+                      'params' : dict((key, fcgolden.param_encode(value))
+                                      for key, value in params.items()),
+                      'drop' : _base_drop(mod_name, cls_name, params,
+                                          opts['base_drop'])}
+                     for name, mod_name, cls_name, params, opts in case_list]
+        proc_list = []
+        for proc_i in range(min(n_proc, len(code_list))):
+            cases_path = os.path.join(work_dir, 'cases%d.json' % proc_i)
+            result_path = os.path.join(work_dir, 'results%d.json' % proc_i)
+            with open(cases_path, 'w') as cases_file:
+                json.dump(code_list[proc_i::n_proc], cases_file)
+            proc = subprocess.Popen([fcsched.PYTHON_EXE or sys.executable,
+                                     os.path.join(PKG_DIR, 'fcgolden.py'),
+                                     base_dir, cases_path, result_path])
+            proc_list.append((proc, result_path))
+        result_dict = {}
+        for proc, result_path in proc_list:
+            proc.wait()
+            if os.path.isfile(result_path):
+                with open(result_path) as result_file:
+                    result_dict.update(
+                        (name, tuple(result))
+                        for name, result in json.load(result_file).items())
+        for name, mod_name, cls_name, params, opts in case_list:
+            if name not in result_dict:
+                result_dict[name] = (None, 'fcgolden did not end\n')
+        return result_dict
+    finally:
+        subprocess.call(['git', '-C', PKG_DIR, 'worktree', 'remove',
+                         '--force', base_dir])
+        shutil.rmtree(work_dir, ignore_errors = True)
+
+
+def read_golden (golden_path = REGRESS_GOLDEN):
+    """ Golden values, empty if there is no file
+    """
+    if not os.path.isfile(golden_path):
+        return {}
+    with open(golden_path) as golden_file:
+        return json.load(golden_file)
+
+
+def write_golden (golden_dict, golden_path = REGRESS_GOLDEN):
+    with open(golden_path, 'w') as golden_file:
+        json.dump(golden_dict, golden_file, indent = 1, sort_keys = True)
+        golden_file.write('\n')
+
+
+def check (pattern_list = None, update = 0, n_proc = None,
+           rel_tol = REGRESS_REL_TOL, golden_path = REGRESS_GOLDEN,
+           base = None):
+    """ Builds the cases and compares them with the golden values
+
+    Parameters:
+    -----------
+    pattern_list : list of str
+        only the cases whose names contain one of them. None: all the cases
+    update : int
+        1: the golden values of the cases are replaced by the new ones
+    n_proc : int
+        number of processes. None: number of cpus
+    rel_tol : float
+        relative tolerance of the numbers of the features
+    golden_path : str
+        file of the golden values
+    base : str
+        git revision. The golden values of the cases are recorded from it,
+        see run_base_cases
+
+    Returns:
+    --------
+    dict: name of the case -> status, one of:
+        'ok'
+        'diff: .volume, .bbox[3]' the features that are different
+        'error: ...' the case could not be built
+        'new' there is no golden value
+        'updated' with update = 1 or base
+    """
+    case_list = expand_cases()
+    if pattern_list:
+        case_list = [case for case in case_list
+                     if any([pattern in case[0] for pattern in pattern_list])]
+    golden_dict = read_golden(golden_path)
+    if base is not None:
+        # the cases of other golden values are not recorded
+        update = 1
+        case_list = [case for case in case_list
+                     if case[4]['golden'] == case[0]]
+        result_dict = run_base_cases(case_list, base, n_proc)
+    else:
+        result_dict = run_cases(case_list, n_proc)
+    golden_name_dict = dict((case[0], case[4]['golden']) for case in case_list)
+    status_dict = {}
+    # first the cases that have their own golden values, they may be
+    # updated before the others are compared with them
+    for name, (features, error) in sorted(
+                       result_dict.items(),
+                       key = lambda item: (golden_name_dict[item[0]]
+                                           != item[0], item[0])):
+        golden_name = golden_name_dict[name]
+        if features is None:
+            status_dict[name] = 'error: ' + error.strip().splitlines()[-1]
+            logger.error('%s not built: %s', name, error)
+            continue
+        fprint = fchash.features_fingerprint(features)
+        if update == 1 and golden_name == name:
+            golden_dict[name] = {'features' : features, 'fprint' : fprint}
+            status_dict[name] = 'updated'
+        elif golden_name not in golden_dict:
+            status_dict[name] = 'new'
+            logger.warning('%s has no golden value', name)
+        else:
+            golden = golden_dict[golden_name]
+            diff_list = fchash.features_diff(golden['features'], features,
+                                             rel_tol)
+            if diff_list:
+                status_dict[name] = 'diff: ' + ', '.join(diff_list)
+                logger.error('%s is different: %s', name,
+                             ', '.join(diff_list))
+            else:
+                status_dict[name] = 'ok'
+                if fprint != golden['fprint']:
+                    logger.info('%s: same features, other fingerprint', name)
+    if update == 1:
+        write_golden(golden_dict, golden_path)
+    return status_dict
+
+
+def n_failed (status_dict):
+    """ Number of cases that are different, could not be built or have no
+    golden value
+    """
+    return len([status for status in status_dict.values()
+                if status.startswith('diff') or status.startswith('error')
+                or status == 'new'])
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(
+                        description = 'geometry regression of the components')
+    parser.add_argument('-k', '--pattern', action = 'append', default = [],
+                        help = 'only the cases whose names contain it')
+    parser.add_argument('-u', '--update', action = 'store_true',
+                        help = 'record the golden values')
+    parser.add_argument('-j', '--jobs', type = int, default = None,
+                        help = 'number of processes')
+    parser.add_argument('--rel_tol', type = float, default = REGRESS_REL_TOL,
+                        help = 'relative tolerance of the numbers')
+    parser.add_argument('-l', '--list', action = 'store_true',
+                        help = 'only print the names of the cases')
+    parser.add_argument('--base', default = None,
+                        help = 'record the golden values from this git'
+                               ' revision, e.g. ' + REGRESS_BASE)
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.INFO)
+    sys.path.append(PKG_DIR)
+    # the functions of the pool and the KRef class have to be taken from
+    # the modules, not from __main__
+    import fcregress
+    if args.list:
+        for case in fcregress.expand_cases():
+            print(case[0])
+        sys.exit(0)
+    if (not os.path.isfile(fcregress.REGRESS_GOLDEN) and not args.update
+        and args.base is None):
+        logger.error('There are no golden values (%s), all the cases will'
+                     ' fail. Record them with: python fcregress.py --base %s',
+                     fcregress.REGRESS_GOLDEN, REGRESS_BASE)
+    status_dict = fcregress.check(args.pattern or None, int(args.update),
+                                  args.jobs, args.rel_tol,
+                                  base = args.base)
+    fcsched.close_pool()
+    for name, status in sorted(status_dict.items()):
+        print('%-60s %s' % (name, status))
+    n_fail = fcregress.n_failed(status_dict)
+    print('%d cases, %d failed' % (len(status_dict), n_fail))
+    sys.exit(1 if n_fail else 0)
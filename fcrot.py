@@ -0,0 +1,400 @@
+# ----------------------------------------------------------------------------
+# -- Rotation functions
+# -- comps library
+# -- Table driven rotations for the orthogonal directions, and quaternions
+# -- for any other direction
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Having an object with an orientation defined by 2 vectors:
+#  First vector (vec1) original direction (x,y,z) is (1,0,0)
+#  Second vector (vec2) original direction (x,y,z) is (0,0,-1)
+# The rotation is the one that takes (1,0,0) to vec1 and (0,0,-1) to vec2
+# If vec1 is (0,0,0), means that it doesn't matter that vector.
+#
+# When both vectors are on the axis (x, -x, y, -y, z, -z), the rotation is
+# taken from a table that has been computed when the module is imported.
+# Otherwise, the rotation is computed with quaternions.
+# See fcfun.calc_rot for the drawings of yaw, pitch and roll
+
+import math
+import logging
+import FreeCAD
+
+
+logger = logging.getLogger(__name__)
+
+# equal to fcfun.EQUAL_TOL, cannot import fcfun since fcfun imports this
+EQUAL_TOL = 0.001
+
+# yaw, pitch and roll for each pair of base vectors (vec1, vec2).
+# These are the same values that fcfun.calc_rot has always used, so the
+# rotations are exactly the same as before.
+# The 24 orientations of a cube, and the 6 where vec1 doesn't matter
+YPR_TABLE = {
+    # vec1 = x
+    ((1,0,0),(0,1,0))   : (0, 0, 90),
+    ((1,0,0),(0,-1,0))  : (0, 0, -90),
+    ((1,0,0),(0,0,1))   : (0, 0, 180),
+    ((1,0,0),(0,0,-1))  : (0, 0, 0),
+    # vec1 = -x
+    ((-1,0,0),(0,1,0))  : (180, 0, -90),  # negative because of the yaw
+    ((-1,0,0),(0,-1,0)) : (180, 0, 90),   # positive because of the yaw
+    ((-1,0,0),(0,0,1))  : (180, 0, 180),
+    ((-1,0,0),(0,0,-1)) : (180, 0, 0),
+    # vec1 = y
+    ((0,1,0),(1,0,0))   : (90, 0, -90),
+    ((0,1,0),(-1,0,0))  : (90, 0, 90),
+    ((0,1,0),(0,0,1))   : (90, 0, 180),
+    ((0,1,0),(0,0,-1))  : (90, 0, 0),
+    # vec1 = -y
+    ((0,-1,0),(1,0,0))  : (-90, 0, 90),
+    ((0,-1,0),(-1,0,0)) : (-90, 0, -90),
+    ((0,-1,0),(0,0,1))  : (-90, 0, 180),
+    ((0,-1,0),(0,0,-1)) : (-90, 0, 0),
+    # vec1 = z
+    ((0,0,1),(1,0,0))   : (0, -90, 0),
+    ((0,0,1),(-1,0,0))  : (0, -90, 180),
+    ((0,0,1),(0,1,0))   : (0, -90, 90),
+    ((0,0,1),(0,-1,0))  : (0, -90, -90),
+    # vec1 = -z
+    ((0,0,-1),(1,0,0))  : (0, 90, 180),
+    ((0,0,-1),(-1,0,0)) : (0, 90, 0),
+    ((0,0,-1),(0,1,0))  : (0, 90, 90),
+    ((0,0,-1),(0,-1,0)) : (0, 90, -90),
+    # it doesn't matter the direction of vec1
+    ((0,0,0),(1,0,0))   : (0, -90, 0),
+    ((0,0,0),(-1,0,0))  : (0, 90, 0),
+    ((0,0,0),(0,1,0))   : (0, 0, 90),
+    ((0,0,0),(0,-1,0))  : (0, 0, -90),
+    ((0,0,0),(0,0,1))   : (0, 0, 180),
+    ((0,0,0),(0,0,-1))  : (0, 0, 0),   # the same position
+}
+
+# FreeCAD.Rotation of each entry of YPR_TABLE. Keys are tuples, and since
+# (1.,0.,0.) == (1,0,0) and hash(-0.) == hash(0), tuples of floats also work
+ROT_TABLE = dict((vecs, FreeCAD.Rotation(ypr[0], ypr[1], ypr[2]))
+                  for vecs, ypr in YPR_TABLE.items())
+
+# FreeCAD.Matrix of each entry of YPR_TABLE
+MATRIX_TABLE = dict((vecs, rot.toMatrix())
+                     for vecs, rot in ROT_TABLE.items())
+
+
+# Displacement for calc_desp_ncen: the key is the index of the axis of
+# vec1 (-1 if vec1 is (0,0,0)) and the index of the axis of vec2.
+# The value is the index of the dimension (Length, Width, Height) that goes
+# to each axis (x, y, z)
+DESP_TABLE = {
+    (0, 1) : (0, 2, 1),
+    (0, 2) : (0, 1, 2),
+    (1, 0) : (2, 0, 1),
+    (1, 2) : (1, 0, 2),
+    (2, 0) : (2, 1, 0),
+    (2, 1) : (1, 2, 0),
+    # vec1 doesn't matter
+    (-1, 0) : (2, 1, 0), # pitch = -90. in calc_rot
+    (-1, 1) : (0, 2, 1), # roll = +-90. in calc_rot
+    (-1, 2) : (1, 0, 2), # nothing. roll 0 or 180
+}
+
+
+def vec_tup (vec):
+    """ Gets a tuple of 3 elements from a FreeCAD.Vector or a tuple
+
+    Parameters:
+    -----------
+    vec : FreeCAD.Vector or tuple (or list) of 3 elements
+
+    Returns:
+    --------
+    tuple of 3 elements
+    """
+    if isinstance(vec, FreeCAD.Vector):
+        return (vec.x, vec.y, vec.z)
+    return (vec[0], vec[1], vec[2])
+
+
+def axis_index (vec):
+    """ Gets the index of the axis of a vector that is on an axis,
+    that is, with a 1 or -1 component.
+
+    Parameters:
+    -----------
+    vec : tuple of 3 elements
+
+    Returns:
+    --------
+    0, 1, 2: x, y, z
+    -1: if it is (0,0,0)
+    None: if it is not on an axis
+    """
+    for i in range(3):
+        if abs(vec[i]) == 1:
+            return i
+    if vec[0] == 0 and vec[1] == 0 and vec[2] == 0:
+        return -1
+    return None
+
+
+def _normalize (vec):
+    length = math.sqrt(vec[0]*vec[0] + vec[1]*vec[1] + vec[2]*vec[2])
+    return (vec[0]/length, vec[1]/length, vec[2]/length), length
+
+def _cross (a, b):
+    return (a[1]*b[2] - a[2]*b[1],
+            a[2]*b[0] - a[0]*b[2],
+            a[0]*b[1] - a[1]*b[0])
+
+def _dot (a, b):
+    return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]
+
+
+def quat_shortest (vec, ref):
+    """ Quaternion of the shortest rotation between two vectors.
+    It has the same result as DraftVecUtils.getRotation(vec, ref), and it
+    does not work when the vectors are opposite, since there are infinite
+    rotations
+
+    Parameters:
+    -----------
+    vec : tuple of 3 elements
+    ref : tuple of 3 elements
+
+    Returns:
+    --------
+    tuple (x, y, z, w) of the quaternion
+    """
+    c = _cross(vec, ref)
+    c_len = math.sqrt(_dot(c, c))
+    if c_len < 1e-7:  # DraftVecUtils.isNull: the vectors are parallel
+        return (0, 0, 0, 1.0)
+    q1 = math.sqrt(_dot(vec, vec) * _dot(ref, ref))
+    q2 = _dot(vec, ref)
+    q_w = math.sqrt((q1 + q2) / 2.)
+    c_mul = math.sqrt((q1 - q2) / 2.) / c_len
+    return (c[0]*c_mul, c[1]*c_mul, c[2]*c_mul, q_w)
+
+
+def quat_matrix (col_x, col_y, col_z):
+    """ Quaternion of a rotation matrix given by its columns, that is,
+    the vectors where x, y and z go after the rotation
+
+    Parameters:
+    -----------
+    col_x, col_y, col_z : tuples of 3 elements, orthonormal
+
+    Returns:
+    --------
+    tuple (x, y, z, w) of the quaternion
+    """
+    m00, m10, m20 = col_x
+    m01, m11, m21 = col_y
+    m02, m12, m22 = col_z
+    trace = m00 + m11 + m22
+    if trace > 0:
+        s = 2. * math.sqrt(trace + 1.)
+        return ((m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s, s / 4.)
+    elif m00 > m11 and m00 > m22:
+        s = 2. * math.sqrt(1. + m00 - m11 - m22)
+        return (s / 4., (m01 + m10) / s, (m02 + m20) / s, (m21 - m12) / s)
+    elif m11 > m22:
+        s = 2. * math.sqrt(1. + m11 - m00 - m22)
+        return ((m01 + m10) / s, s / 4., (m12 + m21) / s, (m02 - m20) / s)
+    else:
+        s = 2. * math.sqrt(1. + m22 - m00 - m11)
+        return ((m02 + m20) / s, (m12 + m21) / s, s / 4., (m10 - m01) / s)
+
+
+def quat_2vec (vec1, vec2):
+    """ Quaternion of the rotation that takes (1,0,0) to vec1 and (0,0,-1)
+    to vec2, for any direction of the vectors.
+    The vectors don't need to be normalized, but they have to be
+    perpendicular. If vec1 is (0,0,0), the shortest rotation from (0,0,-1)
+    to vec2 is taken
+
+    Parameters:
+    -----------
+    vec1 : tuple of 3 elements
+    vec2 : tuple of 3 elements
+
+    Returns:
+    --------
+    tuple (x, y, z, w) of the quaternion
+    None if the vectors are not valid
+    """
+    nv2, len2 = _normalize(vec2)
+    if len2 < EQUAL_TOL:
+        logger.error('vec2 cannot be (0,0,0)')
+        return None
+    if _dot(vec1, vec1) < EQUAL_TOL * EQUAL_TOL:
+        # it doesn't matter vec1
+        if nv2[2] > 1 - 1e-9: # from -z to z: 180 degrees on x
+            return (1., 0, 0, 0)
+        return quat_shortest((0, 0, -1), nv2)
+    nv1, len1 = _normalize(vec1)
+    if abs(_dot(nv1, nv2)) > EQUAL_TOL:
+        logger.error('vec1 and vec2 are not perpendicular')
+        return None
+    # x goes to vec1, z goes to -vec2, and y = z cross x
+    col_z = (-nv2[0], -nv2[1], -nv2[2])
+    col_y = _cross(col_z, nv1)
+    return quat_matrix(nv1, col_y, col_z)
+
+
+def calc_rot (vec1, vec2):
+    """ Calculates the rotation that takes (1,0,0) to vec1 and (0,0,-1)
+    to vec2.
+    If both vectors are on the axis, the rotation is taken from ROT_TABLE,
+    otherwise it is calculated with quaternions
+
+    Parameters:
+    -----------
+    vec1 : tuple of 3 elements or FreeCAD.Vector
+        if (0,0,0) it doesn't matter where (1,0,0) goes
+    vec2 : tuple of 3 elements or FreeCAD.Vector
+
+    Returns:
+    --------
+    FreeCAD.Rotation
+        A new FreeCAD.Rotation, so it can be modified
+    """
+    vec1 = vec_tup(vec1)
+    vec2 = vec_tup(vec2)
+    try:
+        return FreeCAD.Rotation(ROT_TABLE[(vec1, vec2)])
+    except KeyError:
+        pass
+    quat = quat_2vec(vec1, vec2)
+    if quat is None:
+        logger.error('error in rotation: ' + str(vec1) + ' ' + str(vec2))
+        raise ValueError('Not valid vectors for a rotation')
+    return FreeCAD.Rotation(quat[0], quat[1], quat[2], quat[3])
+
+
+def calc_matrix (vec1, vec2):
+    """ Same as calc_rot, but returns a FreeCAD.Matrix
+
+    Parameters:
+    -----------
+    vec1 : tuple of 3 elements or FreeCAD.Vector
+    vec2 : tuple of 3 elements or FreeCAD.Vector
+
+    Returns:
+    --------
+    FreeCAD.Matrix
+    """
+    try:
+        return FreeCAD.Matrix(MATRIX_TABLE[(vec_tup(vec1), vec_tup(vec2))])
+    except KeyError:
+        return calc_rot(vec1, vec2).toMatrix()
+
+
+def calc_rot_list (vec_pairs, matrix = 0):
+    """ Calculates the rotations of a list of pairs of vectors
+    Each different pair is only calculated once
+
+    Parameters:
+    -----------
+    vec_pairs : list of tuples (vec1, vec2)
+        each vector is a tuple of 3 elements or a FreeCAD.Vector
+        See calc_rot
+    matrix : int
+        0: returns FreeCAD.Rotation
+        1: returns FreeCAD.Matrix
+
+    Returns:
+    --------
+    list of FreeCAD.Rotation (or FreeCAD.Matrix), one for each pair,
+    each one a different object
+    """
+    if matrix == 1:
+        calc = calc_matrix
+        copy = FreeCAD.Matrix
+    else:
+        calc = calc_rot
+        copy = FreeCAD.Rotation
+    done = {}
+    rot_list = []
+    for vec1, vec2 in vec_pairs:
+        key = (vec_tup(vec1), vec_tup(vec2))
+        try:
+            rot_list.append(copy(done[key]))
+        except KeyError:
+            rot = calc(key[0], key[1])
+            done[key] = rot
+            rot_list.append(copy(rot))
+    return rot_list
+
+
+def get_rot (v1, v2):
+    """ Calculate the rotation from v1 to v2, for any direction, including
+    opposite vectors, where the rotation is 180 degrees on X.
+
+    Parameters:
+    -----------
+    v1 : FreeCAD.Vector or tuple
+    v2 : FreeCAD.Vector or tuple
+
+    Returns:
+    --------
+    tuple representing a quaternion rotation between v2 and v1,
+    or FreeCAD.Rotation(VX, 180) if they are opposite
+    """
+    nv1, len1 = _normalize(vec_tup(v1))
+    nv2, len2 = _normalize(vec_tup(v2))
+    if (abs(nv1[0] + nv2[0]) < EQUAL_TOL and
+        abs(nv1[1] + nv2[1]) < EQUAL_TOL and
+        abs(nv1[2] + nv2[2]) < EQUAL_TOL):
+        return FreeCAD.Rotation(FreeCAD.Vector(1,0,0), 180)
+    return quat_shortest(nv1, nv2)
+
+
+def calc_desp_ncen (Length, Width, Height,
+                    vec1, vec2, cx=False, cy=False, cz=False):
+    """ Calculates the displacement, when we don't want to have all of the
+    dimensions centered, after the rotation given by calc_rot.
+    See fcfun.calc_desp_ncen
+
+    Parameters:
+    -----------
+    Length : float
+        original dimension on X
+    Width : float
+        original dimension on Y
+    Height : float
+        original dimension on Z
+    vec1 : tuple of 3 elements or FreeCAD.Vector
+        on the axis, or (0,0,0)
+    vec2 : tuple of 3 elements or FreeCAD.Vector
+        on the axis
+    cx, cy, cz : boolean
+        if centered on that axis, there is no displacement
+
+    Returns:
+    --------
+    FreeCAD.Vector
+    """
+    vec1 = vec_tup(vec1)
+    vec2 = vec_tup(vec2)
+    key = (axis_index(vec1), axis_index(vec2))
+    try:
+        dims_i = DESP_TABLE[key]
+    except KeyError:
+        logger.error('error in calc_desp_ncen: ' + str(vec1) + str(vec2))
+        return FreeCAD.Vector(0,0,0)
+    if key[0] == -1 and Width != Length:
+        # It doesnt matter vec1. Probably it is symetrical on plane XY.
+        # So Length and Width are the same
+        logger.error('Check rotation vec1=(0,0,0), and Length!=Width')
+    dims = (Length, Width, Height)
+    desp = [0, 0, 0]
+    for i, centered in enumerate((cx, cy, cz)):
+        if centered == False:
+            desp[i] = dims[dims_i[i]] / 2.0
+    return FreeCAD.Vector(desp[0], desp[1], desp[2])
@@ -0,0 +1,316 @@
+# ----------------------------------------------------------------------------
+# -- Parallel build of shapes
+# -- comps library
+# -- Builds independent shapes in a pool of processes, following the
+# -- dependencies between them
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# A component declares the shapes that it needs as a list of ShpTask: a
+# class of shp_clss.Obj3D (or a function that returns a shape) and its
+# arguments. The tasks that don't depend on other tasks are sent to the
+# pool, and when a task is done, the tasks that depend on it are sent.
+# Each process sends back the shape as a BREP string, that is read in
+# this process.
+#
+# The shapes of the Obj3D classes are kept in shp_clss.PREBUILT_SHP, with
+# the key of the class and its arguments. When the component creates the
+# object with the same arguments, the object takes the shape instead of
+# building it (see shp_clss.Obj3D.take_prebuilt). So the component is
+# built as usual, and if a task fails, the shape is built there.
+#
+# The pool is created the first time and kept (warm): the processes have
+# FreeCAD and the modules of the library already imported.
+# The processes are spawned, not forked. Inside the FreeCAD GUI,
+# sys.executable is FreeCAD, so the python of FreeCAD has to be set in
+# PYTHON_EXE
+
+import os
+import sys
+import time
+import logging
+import importlib
+import traceback
+import multiprocessing
+
+import FreeCAD
+import Part
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import shp_clss
+
+logger = logging.getLogger(__name__)
+
+# directory of the library, for the processes of the pool
+PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# modules imported by the processes when the pool is created
+WARM_MODULES = ('fcfun', 'shp_clss', 'comps', 'parts')
+
+# python to run the processes, None: sys.executable
+PYTHON_EXE = None
+
+# pool of processes, see get_pool
+POOL = None
+POOL_N_PROC = 0
+
+
+class TaskRef (object):
+    """ Argument of a ShpTask that is the shape built by another task
+    """
+    def __init__ (self, name):
+        self.name = name
+
+
+class ShpTask (object):
+    """ Task to build a shape
+
+    Parameters:
+    -----------
+    name : str
+        name of the task, unique in the list of tasks
+    mod_name : str
+        module of the class or function
+    func_name : str
+        name of the class (child of shp_clss.Obj3D) or of the function that
+        returns a TopoShape
+    kwargs : dict
+        arguments. The values that are TaskRef are replaced by the shape
+        built by that task
+    deps : list of str
+        names of other tasks that have to be done before. The tasks of the
+        TaskRef arguments are included
+    """
+    def __init__ (self, name, mod_name, func_name, kwargs, deps = []):
+        self.name = name
+        self.mod_name = mod_name
+        self.func_name = func_name
+        self.kwargs = kwargs
+        self.deps = set(deps)
+        for value in kwargs.values():
+            if isinstance(value, TaskRef):
+                self.deps.add(value.name)
+
+
+def vec_encode (value):
+    """ FreeCAD.Vector are sent as tuples
+    """
+    if isinstance(value, FreeCAD.Vector):
+        return ('vec', (value.x, value.y, value.z))
+    return ('val', value)
+
+
+def vec_decode (code):
+    if code[0] == 'vec':
+        return FreeCAD.Vector(code[1])
+    return code[1]
+
+
+def shp_from_brep (brep):
+    """ Reads a TopoShape from a BREP string
+    """
+    shp = Part.Shape()
+    shp.importBrepFromString(brep)
+    return shp
+
+
+def _init_worker (pkg_dir):
+    os.chdir(pkg_dir)
+    if pkg_dir not in sys.path:
+        sys.path.append(pkg_dir)
+    for mod_name in WARM_MODULES:
+        importlib.import_module(mod_name)
+
+
+def _build (task, dep_shp):
+    """ Builds the shape of a task
+
+    Parameters:
+    -----------
+    task : ShpTask
+    dep_shp : dict
+        name of the task -> TopoShape, of the tasks it depends on
+
+    Returns:
+    --------
+    tuple (shp_key, shp)
+        shp_key: key for shp_clss.PREBUILT_SHP, None if it is a function
+    """
+    func = getattr(importlib.import_module(task.mod_name), task.func_name)
+    kwargs = {}
+    for key, value in task.kwargs.items():
+        if isinstance(value, TaskRef):
+            value = dep_shp[value.name]
+        kwargs[key] = value
+    result = func(**kwargs)
+    if isinstance(result, shp_clss.Obj3D):
+        return (result.shp_key, result.shp)
+    return (None, result)
+
+
+def _run_worker (name, mod_name, func_name, kwargs_code, deps, dep_brep):
+    """ Builds the shape of a task in a process of the pool
+
+    Returns:
+    --------
+    tuple (name, shp_key, brep, error)
+    """
+    try:
+        task = ShpTask(name, mod_name, func_name,
+                       dict((key, vec_decode(code))
+                            for key, code in kwargs_code.items()),
+                       deps)
+        dep_shp = dict((dep_name, shp_from_brep(brep))
+                       for dep_name, brep in dep_brep.items())
+        shp_key, shp = _build(task, dep_shp)
+        return (name, shp_key, shp.exportBrepToString(), '')
+    except Exception:
+        return (name, None, None, traceback.format_exc())
+
+
+def get_pool (n_proc = None):
+    """ Pool of processes, created the first time
+
+    Parameters:
+    -----------
+    n_proc : int
+        number of processes. None: number of cpus.
+        If it is different from the current pool, a new pool is created
+    """
+    global POOL, POOL_N_PROC
+    if n_proc is None:
+        n_proc = multiprocessing.cpu_count()
+    if POOL is not None and POOL_N_PROC != n_proc:
+        close_pool()
+    if POOL is None:
+        ctx = multiprocessing.get_context('spawn')
+        if PYTHON_EXE is not None:
+            ctx.set_executable(PYTHON_EXE)
+        POOL = ctx.Pool(processes = n_proc, initializer = _init_worker,
+                        initargs = (PKG_DIR,))
+        POOL_N_PROC = n_proc
+    return POOL
+
+
+def close_pool ():
+    global POOL, POOL_N_PROC
+    if POOL is not None:
+        POOL.close()
+        POOL.join()
+        POOL = None
+        POOL_N_PROC = 0
+
+
+def _check_tasks (task_list):
+    """ Checks that the dependencies are in the list and there are no
+    cycles
+
+    Returns:
+    --------
+    list of ShpTask in an order that follows the dependencies
+    None if there is an error
+    """
+    task_dict = dict((task.name, task) for task in task_list)
+    order_list = []
+    done = set()
+    pend_list = list(task_list)
+    while pend_list:
+        ready_list = [task for task in pend_list if task.deps <= done]
+        if not ready_list:
+            for task in pend_list:
+                missing = task.deps - set(task_dict)
+                if missing:
+                    logger.error('task %s depends on unknown tasks: %s',
+                                 task.name, ', '.join(sorted(missing)))
+                    return None
+            logger.error('cyclic dependency among tasks: %s',
+                         ', '.join([task.name for task in pend_list]))
+            return None
+        for task in ready_list:
+            order_list.append(task)
+            done.add(task.name)
+            pend_list.remove(task)
+    return order_list
+
+
+def run_tasks (task_list, n_proc = None):
+    """ Builds the shapes of a list of tasks. The shapes of the Obj3D classes
+    are also kept in shp_clss.PREBUILT_SHP
+
+    Parameters:
+    -----------
+    task_list : list of ShpTask
+    n_proc : int
+        number of processes. None: number of cpus.
+        1: the shapes are built in this process, one after another
+
+    Returns:
+    --------
+    dict: name of the task -> TopoShape
+    the tasks that failed, and those that depend on them, are not there
+    """
+    order_list = _check_tasks(task_list)
+    if order_list is None:
+        return {}
+    shp_dict = {}
+    if n_proc == 1:
+        for task in order_list:
+            if not task.deps <= set(shp_dict):
+                continue
+            try:
+                shp_key, shp = _build(task, shp_dict)
+            except Exception:
+                logger.error('task %s: %s', task.name, traceback.format_exc())
+                continue
+            shp_dict[task.name] = shp
+            if shp_key is not None:
+                shp_clss.PREBUILT_SHP[shp_key] = shp
+        return shp_dict
+
+    pool = get_pool(n_proc)
+    brep_dict = {}
+    failed = set()
+    pend_list = list(order_list)
+    running = {}
+    while pend_list or running:
+        for task in list(pend_list):
+            if task.deps & failed:
+                failed.add(task.name)
+                pend_list.remove(task)
+            elif task.deps <= set(brep_dict):
+                kwargs_code = dict((key, vec_encode(value))
+                                   for key, value in task.kwargs.items())
+                dep_brep = dict((dep_name, brep_dict[dep_name])
+                                for dep_name in task.deps)
+                running[task.name] = pool.apply_async(
+                                         _run_worker,
+                                         (task.name, task.mod_name,
+                                          task.func_name, kwargs_code,
+                                          task.deps, dep_brep))
+                pend_list.remove(task)
+        if not running:
+            break
+        ready_list = [name for name, result in running.items()
+                      if result.ready()]
+        if not ready_list:
+            time.sleep(0.005)
+            continue
+        for name in ready_list:
+            name, shp_key, brep, error = running.pop(name).get()
+            if error:
+                logger.error('task %s: %s', name, error)
+                failed.add(name)
+                continue
+            brep_dict[name] = brep
+            shp = shp_from_brep(brep)
+            shp_dict[name] = shp
+            if shp_key is not None:
+                shp_clss.PREBUILT_SHP[shp_key] = shp
+    return shp_dict
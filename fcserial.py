@@ -0,0 +1,211 @@
+# ----------------------------------------------------------------------------
+# -- Serialization of components
+# -- comps library
+# -- Converts the shape of a component and its reference points to bytes,
+# -- to send it to other processes, and makes a part from them
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Saving a FreeCAD document or a STEP file to pass a shape to another
+# process is slow, and STEP loses the reference points of the component.
+# The bytes of a component are:
+#
+#   MAGIC (4 bytes) | flags (1 byte) | length of the metadata (4 bytes)
+#   | metadata (JSON) | BREP of the shape (compressed with zlib if the
+#   flag SER_ZLIB is set)
+#
+# The metadata are the attributes of shp_clss.Obj3D: axes, pos, pos_o,
+# pos_d, pos_w, pos_h, d_o, w_o, h_o, ... (see SER_ATTRS), the name and the
+# class of the component. The vectors are lists [x, y, z].
+#
+# SerialPart makes a part (SinglePart) from the bytes, with the same
+# reference points, so it can be used as the original component.
+#
+# The bytes can also be passed in a shared memory block (see fcshm.to_shm
+# and fcshm.from_shm), so they are not copied through a pipe.
+#
+# Example:
+#   data = fcserial.dumps(part)          # in one process
+#   part2 = fcserial.SerialPart(data)    # in another process
+
+import os
+import sys
+import json
+import zlib
+import struct
+import logging
+
+import FreeCAD
+import Part
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import fc_clss
+import shp_clss
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'FCS1'
+# flags
+SER_ZLIB = 1
+# compression level of zlib, the fastest ones are good for the BREP text
+SER_ZLIB_LEVEL = 1
+
+# attributes of the components that are kept in the metadata
+SER_ATTRS = ('axis_d', 'axis_w', 'axis_h',
+             'pos', 'pos_o', 'pos_o_adjust',
+             'pos_d', 'pos_w', 'pos_h',
+             'd_o', 'w_o', 'h_o',
+             'prnt_ax', 'tot_d', 'tot_w', 'tot_h')
+
+_HEAD_STRUCT = struct.Struct('<4sBI')
+
+
+def _meta_encode (value):
+    """ Value of an attribute for the JSON metadata
+    """
+    if isinstance(value, FreeCAD.Vector):
+        return {'vec' : [value.x, value.y, value.z]}
+    if isinstance(value, dict):
+        # the keys of d_o, w_o, h_o are int
+        return {'dict' : [[key, _meta_encode(item)]
+                          for key, item in value.items()]}
+    return value
+
+
+def _meta_decode (value):
+    if isinstance(value, dict):
+        if 'vec' in value:
+            return FreeCAD.Vector(*value['vec'])
+        if 'dict' in value:
+            return dict((key, _meta_decode(item))
+                        for key, item in value['dict'])
+    return value
+
+
+def shp_dumps (shp, compress = 1):
+    """ BREP of a shape, as bytes
+
+    Parameters:
+    -----------
+    shp : TopoShape
+    compress : int
+        1: compressed with zlib
+
+    Returns:
+    --------
+    bytes
+    """
+    brep = shp.exportBrepToString().encode()
+    if compress == 1:
+        brep = zlib.compress(brep, SER_ZLIB_LEVEL)
+    return brep
+
+
+def shp_loads (brep, compress = 1):
+    """ Shape from the bytes of shp_dumps
+    """
+    if compress == 1:
+        brep = zlib.decompress(brep)
+    shp = Part.Shape()
+    shp.importBrepFromString(brep.decode())
+    return shp
+
+
+def dumps (obj, compress = 1):
+    """ Bytes of a component: its shape and its reference points
+
+    Parameters:
+    -----------
+    obj : shp_clss.Obj3D or SinglePart
+        it needs the attribute shp, or fco
+    compress : int
+        1: the BREP is compressed with zlib
+
+    Returns:
+    --------
+    bytes
+    """
+    shp = getattr(obj, 'shp', None)
+    if shp is None:
+        # the shape of the FreeCAD object, without its placement
+        shp = obj.fco.Shape.copy()
+        shp.Placement = FreeCAD.Placement()
+    meta = {'cls' : type(obj).__name__,
+            'name' : getattr(obj, 'name', '')}
+    for attr in SER_ATTRS:
+        if hasattr(obj, attr):
+            meta[attr] = _meta_encode(getattr(obj, attr))
+    fco = getattr(obj, 'fco', None)
+    if fco is not None:
+        meta['fco_base'] = _meta_encode(fco.Placement.Base)
+    meta_bytes = json.dumps(meta).encode()
+    flags = SER_ZLIB if compress == 1 else 0
+    return (_HEAD_STRUCT.pack(MAGIC, flags, len(meta_bytes))
+            + meta_bytes + shp_dumps(shp, compress))
+
+
+def loads (data):
+    """ Shape and metadata from the bytes of dumps
+
+    Returns:
+    --------
+    tuple (TopoShape, dict of the metadata)
+
+    Raises ValueError if the bytes are not from dumps
+    """
+    data = bytes(data)
+    if (len(data) < _HEAD_STRUCT.size
+        or _HEAD_STRUCT.unpack_from(data)[0] != MAGIC):
+        raise ValueError('the data are not a serialized component')
+    magic, flags, meta_len = _HEAD_STRUCT.unpack_from(data)
+    meta_end = _HEAD_STRUCT.size + meta_len
+    meta = json.loads(data[_HEAD_STRUCT.size:meta_end].decode())
+    meta = dict((key, _meta_decode(value)) for key, value in meta.items())
+    compress = 1 if flags & SER_ZLIB else 0
+    return (shp_loads(data[meta_end:], compress), meta)
+
+
+class SerialPart (fc_clss.SinglePart, shp_clss.Obj3D):
+    """ Part made from the bytes of a component (see dumps), with the
+    reference points of the component
+
+    Parameters:
+    -----------
+    data : bytes
+        from dumps
+    name : str
+        name of the part. '': the name of the component
+    doc : FreeCAD document
+        None: see fcfun.get_doc
+
+    Attributes:
+    -----------
+    src_cls : str
+        name of the class of the component
+    """
+    def __init__ (self, data, name = '', doc = None):
+        shp, meta = loads(data)
+        # the axes that were not defined are V0
+        axis_list = []
+        for axis in ('axis_d', 'axis_w', 'axis_h'):
+            if axis in meta and meta[axis].Length > 0:
+                axis_list.append(meta[axis])
+            else:
+                axis_list.append(None)
+        shp_clss.Obj3D.__init__(self, *axis_list)
+        for attr in SER_ATTRS:
+            if attr in meta:
+                setattr(self, attr, meta[attr])
+        self.src_cls = meta['cls']
+        self.shp = shp
+        self.set_name(name, meta['name'] or 'serialpart', change = 1)
+        fc_clss.SinglePart.__init__(self, doc)
+        if 'fco_base' in meta:
+            self.fco.Placement.Base = meta['fco_base']
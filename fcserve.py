@@ -0,0 +1,337 @@
+# ----------------------------------------------------------------------------
+# -- Build service
+# -- comps library
+# -- Builds components in a pool of processes that are already started,
+# -- and returns the shapes as BREP or STL bytes
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Starting FreeCAD and importing fcfun, kcomp, comps and parts takes more
+# time than building a small component. The jobs are run in the warm pool
+# of fcsched: the processes are started once, with the modules imported,
+# and each job is built in a new document that is closed at the end.
+# The caches of shapes (fcfun.REGPRISM_CACHE, shp_fastener.TOOL_CACHE,
+# comp_optic.CAGECUBE_CACHE and shp_clss.PREBUILT_SHP) are emptied after
+# each job, so nothing of a job is kept for the next ones.
+#
+# A job is a dictionary:
+#  'module' : module of the class, one of SERVE_MODULES
+#  'cls'    : class that makes the component, defined in the module, or a
+#             function of the module that makes a shape (shp_...)
+#  'params' : parameters of the class: python literals or FreeCAD.Vector
+#  'fmt'    : 'brep' (default) or 'stl'
+#  'tol'    : optional, linear deflection of the STL
+# The result is a tuple (data, error): data are the bytes of the BREP or
+# STL of the component, error is '' if there is no error
+#
+# In this process:
+#   fcserve.run_jobs([job1, job2])
+# From other processes, with a service on a local socket:
+#   python fcserve.py --new_key          # once, makes SERVE_KEY_FILE
+#   python fcserve.py --port 6543 &
+#   fcserve.request(job, port = 6543)
+# There is no default key: the key is taken from the environment variable
+# SERVE_KEY_ENV or from the file SERVE_KEY_FILE, and the service and the
+# clients don't start without one. The jobs are sent as python literals,
+# they are not unpickled by the service.
+
+import os
+import sys
+import ast
+import secrets
+import logging
+import threading
+import inspect
+import importlib
+import traceback
+from multiprocessing.connection import Listener, Client
+
+import FreeCAD
+import Part
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import kparts
+import fcfun
+import fcsched
+import fcexport
+
+logger = logging.getLogger(__name__)
+
+# address of the service
+SERVE_HOST = 'localhost'
+SERVE_PORT = 6543
+# key to accept the connections, has to be the same in the clients.
+# From the environment variable SERVE_KEY_ENV or the file SERVE_KEY_FILE
+SERVE_KEY_ENV = 'FCSERVE_AUTHKEY'
+SERVE_KEY_FILE = os.path.join(os.path.expanduser('~'), '.fcserve_key')
+# minimum length of the key
+SERVE_KEY_MIN_LEN = 16
+# modules of the components that can be built
+SERVE_MODULES = ('shp_clss', 'shp_fastener', 'fc_clss', 'comps', 'parts',
+                 'partset', 'beltcl', 'comp_optic', 'comp_elect')
+
+
+def get_authkey (authkey = None):
+    """ Key of the service: authkey if it is given, if not, the one of the
+    environment variable SERVE_KEY_ENV, and if not, the one of the file
+    SERVE_KEY_FILE
+
+    Returns:
+    --------
+    bytes
+
+    Raises ValueError if there is no key, or it is too short
+    """
+    if authkey is None:
+        authkey = os.environ.get(SERVE_KEY_ENV, '').encode()
+        if not authkey and os.path.isfile(SERVE_KEY_FILE):
+            with open(SERVE_KEY_FILE, 'rb') as keyfile:
+                authkey = keyfile.read().strip()
+    if len(authkey) < SERVE_KEY_MIN_LEN:
+        raise ValueError('no key of at least %d bytes for the build service,'
+                         ' set %s or make %s (python fcserve.py --new_key)'
+                         % (SERVE_KEY_MIN_LEN, SERVE_KEY_ENV,
+                            SERVE_KEY_FILE))
+    return authkey
+
+
+def new_authkey (path = SERVE_KEY_FILE):
+    """ Makes a random key in a new file, only readable by the user
+
+    Returns:
+    --------
+    bytes
+    """
+    authkey = secrets.token_hex(32).encode()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as keyfile:
+        keyfile.write(authkey)
+    return authkey
+
+
+def job_func (mod_name, cls_name):
+    """ Class or function of a job, if it is allowed: a class defined in a
+    module of SERVE_MODULES, or a function of the module that makes a shape
+
+    Returns:
+    --------
+    class or function
+
+    Raises ValueError if it is not allowed
+    """
+    if mod_name not in SERVE_MODULES:
+        raise ValueError('module not allowed: %s' % mod_name)
+    if cls_name.startswith('_'):
+        raise ValueError('class not allowed: %s.%s' % (mod_name, cls_name))
+    func = getattr(importlib.import_module(mod_name), cls_name, None)
+    if (getattr(func, '__module__', None) != mod_name
+        or not (inspect.isclass(func)
+                or (inspect.isfunction(func)
+                    and cls_name.startswith('shp_')))):
+        raise ValueError('class not allowed: %s.%s' % (mod_name, cls_name))
+    return func
+
+
+def _clear_caches ():
+    """ Empties the caches of shapes of the modules that are imported
+    """
+    fcfun.regprism_cache_clear()
+    if 'shp_fastener' in sys.modules:
+        sys.modules['shp_fastener'].tool_cache_clear()
+    if 'comp_optic' in sys.modules:
+        sys.modules['comp_optic'].cagecube_cache_clear()
+    if 'shp_clss' in sys.modules:
+        sys.modules['shp_clss'].PREBUILT_SHP.clear()
+
+
+def job_shape (obj):
+    """ Shape of a built component: its attribute shp, or the shapes of its
+    FreeCAD objects (fco, fco_top, fco_bot, ...), in a compound if there
+    are more than one
+
+    Returns:
+    --------
+    TopoShape
+    """
+    if isinstance(obj, Part.Shape):
+        return obj
+    shp = getattr(obj, 'shp', None)
+    if shp is not None:
+        return shp
+    shp_list = [value.Shape for attr, value in sorted(vars(obj).items())
+                if attr.startswith('fco') and hasattr(value, 'Shape')]
+    if len(shp_list) == 1:
+        return shp_list[0]
+    return Part.makeCompound(shp_list)
+
+
+def _run_job (mod_name, cls_name, params_code, fmt, tol):
+    """ Builds a component in a new document, in a process of the pool
+
+    Returns:
+    --------
+    tuple (data, error)
+    """
+    doc = None
+    try:
+        params = dict((key, fcsched.vec_decode(code))
+                      for key, code in params_code.items())
+        cls = job_func(mod_name, cls_name)
+        doc = FreeCAD.newDocument('fcserve')
+        with fcfun.doc_context(doc):
+            with fcfun.bulk_build(doc):
+                obj = cls(**params)
+            shp = job_shape(obj)
+            if fmt == 'stl':
+                data = fcexport.stl_bytes(shp, tol)
+            else:
+                data = shp.exportBrepToString().encode()
+        return (data, '')
+    except Exception:
+        return (b'', traceback.format_exc())
+    finally:
+        if doc is not None:
+            # the processes live long, nothing of the job is kept
+            fcfun.clear_fco_view(doc)
+            FreeCAD.closeDocument(doc.Name)
+        _clear_caches()
+
+
+def _job_args (job):
+    return (job['module'], job['cls'],
+            dict((key, fcsched.vec_encode(value))
+                 for key, value in job['params'].items()),
+            job.get('fmt', 'brep'),
+            job.get('tol', kparts.LIN_DEFL))
+
+
+def _read_job (job_bytes):
+    """ Arguments of _run_job from the bytes sent by a client: a python
+    literal, it is not unpickled
+    """
+    job_args = ast.literal_eval(job_bytes.decode())
+    if (not isinstance(job_args, tuple) or len(job_args) != 5
+        or not isinstance(job_args[0], str)
+        or not isinstance(job_args[1], str)
+        or not isinstance(job_args[2], dict)
+        or job_args[3] not in ('brep', 'stl')
+        or not isinstance(job_args[4], (int, float))):
+        raise ValueError('wrong job')
+    return job_args
+
+
+def run_jobs (job_list, n_proc = None):
+    """ Runs jobs in the warm pool (see fcsched.get_pool)
+
+    Parameters:
+    -----------
+    job_list : list of dict
+        jobs, see the beginning of this file
+    n_proc : int
+        number of processes of the pool. None: number of cpus
+
+    Returns:
+    --------
+    list of tuples (data, error), in the order of job_list
+    """
+    pool = fcsched.get_pool(n_proc)
+    result_list = [pool.apply_async(_run_job, _job_args(job))
+                   for job in job_list]
+    return [result.get() for result in result_list]
+
+
+def _serve_conn (conn, pool):
+    """ Runs the jobs of a client, one after another, until it closes the
+    connection
+    """
+    try:
+        while True:
+            try:
+                job_bytes = conn.recv_bytes()
+            except EOFError:
+                break
+            try:
+                result = pool.apply(_run_job, _read_job(job_bytes))
+            except Exception:
+                result = (b'', traceback.format_exc())
+            conn.send(result)
+    finally:
+        conn.close()
+
+
+def serve (port = SERVE_PORT, n_proc = None, authkey = None):
+    """ Service on a local socket. Each client is served in a thread, and
+    its jobs are run in the warm pool. It runs until it is interrupted
+
+    Parameters:
+    -----------
+    port : int
+        port of localhost
+    n_proc : int
+        number of processes of the pool. None: number of cpus
+    authkey : bytes
+        key of the clients. None: see get_authkey
+    """
+    authkey = get_authkey(authkey)
+    pool = fcsched.get_pool(n_proc)
+    listener = Listener((SERVE_HOST, port), authkey = authkey)
+    logger.info('serving on %s:%d', SERVE_HOST, port)
+    try:
+        while True:
+            conn = listener.accept()
+            conn_thread = threading.Thread(target = _serve_conn,
+                                           args = (conn, pool))
+            conn_thread.daemon = True
+            conn_thread.start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        fcsched.close_pool()
+
+
+def request (job, port = SERVE_PORT, authkey = None):
+    """ Sends a job to the service and waits for the result
+
+    Parameters:
+    -----------
+    job : dict
+        see the beginning of this file
+    authkey : bytes
+        key of the service. None: see get_authkey
+
+    Returns:
+    --------
+    tuple (data, error)
+    """
+    conn = Client((SERVE_HOST, port), authkey = get_authkey(authkey))
+    try:
+        conn.send_bytes(repr(_job_args(job)).encode())
+        return conn.recv()
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description = 'build service')
+    parser.add_argument('--port', type = int, default = SERVE_PORT)
+    parser.add_argument('--n_proc', type = int, default = None)
+    parser.add_argument('--new_key', action = 'store_true',
+                        help = 'makes a random key in ' + SERVE_KEY_FILE)
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.INFO)
+    if args.new_key:
+        new_authkey()
+        sys.exit(0)
+    # the functions of the pool have to be taken from the module fcserve,
+    # not from __main__
+    import fcserve
+    fcserve.serve(args.port, args.n_proc)
@@ -0,0 +1,110 @@
+# ----------------------------------------------------------------------------
+# -- Shared memory blocks
+# -- comps library
+# -- Blocks of shared memory to pass bytes and arrays to other processes,
+# -- without copying them through a pipe
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Only the standard library is imported, so the modules that pass data in
+# shared memory (fcserial, fcmesh) don't bring FreeCAD or the components
+# with them.
+#
+# A block is released by the process that reads it: the resource tracker
+# of python does not release it when the process that makes it ends
+# (python < 3.13 does it by default, see open_shm), so it is not lost if
+# that process ends before the block is read.
+#
+# Example:
+#   name, size = fcshm.to_shm(data)           # in one process
+#   data = fcshm.from_shm(name, size)         # in another process
+
+import os
+import sys
+import logging
+from multiprocessing import shared_memory, resource_tracker
+
+logger = logging.getLogger(__name__)
+
+# SharedMemory has the argument track (python >= 3.13), see open_shm
+SHM_TRACK_ARG = sys.version_info >= (3, 13)
+
+
+def open_shm (**kwargs):
+    """ Opens or makes a shared memory block that is not released when
+    this process ends: until python 3.13 (argument track), the resource
+    tracker releases the blocks that a process has made or opened.
+    It has to be released with unlink_shm
+
+    Parameters:
+    -----------
+    kwargs :
+        arguments of shared_memory.SharedMemory
+
+    Returns:
+    --------
+    shared_memory.SharedMemory
+    """
+    if SHM_TRACK_ARG:
+        return shared_memory.SharedMemory(track = False, **kwargs)
+    shm = shared_memory.SharedMemory(**kwargs)
+    if os.name == 'posix':
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def unlink_shm (shm):
+    """ Releases a shared memory block of open_shm
+    """
+    if not SHM_TRACK_ARG and os.name == 'posix':
+        # until python 3.13, unlink takes the block out of the tracker
+        resource_tracker.register(shm._name, 'shared_memory')
+    shm.unlink()
+
+
+def to_shm (data):
+    """ Copies bytes to a new shared memory block. The block has to be
+    released (unlink) by the process that reads it, see from_shm.
+    It is not released when this process ends
+
+    Returns:
+    --------
+    tuple (name of the block, size of the data)
+    """
+    shm = open_shm(create = True, size = max(len(data), 1))
+    shm.buf[:len(data)] = data
+    name = shm.name
+    shm.close()
+    return (name, len(data))
+
+
+def from_shm (name, size, unlink = 1):
+    """ Bytes of a shared memory block made with to_shm
+
+    Parameters:
+    -----------
+    name : str
+        name of the block
+    size : int
+        size of the data
+    unlink : int
+        1: the block is released
+        0: it is kept, also when this process ends
+
+    Returns:
+    --------
+    bytes
+    """
+    shm = open_shm(name = name)
+    try:
+        data = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+        if unlink == 1:
+            unlink_shm(shm)
+    return data
@@ -0,0 +1,99 @@
+# ----------------------------------------------------------------------------
+# -- Tolerance variants
+# -- comps library
+# -- Builds a piece with several tolerances in one run, sharing the
+# -- geometry that doesn't depend on the tolerance
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# To test the fit, the same piece is printed with several tolerances:
+# sk8_tol03, sk8_tol04, ...
+# The classes that have the argument tol build first the body that doesn't
+# depend on the tolerance, and then cut the holes that depend on it.
+# While build_tol_variants is running, the bodies are kept in BODY_CACHE,
+# so the body is built for the first tolerance and taken for the others.
+# Out of build_tol_variants nothing is kept
+#
+# Example:
+# fcvariant.build_tol_variants(comps.Sk_dir, name = 'sk8', size = 8)
+#   -> objects sk8_tol02, sk8_tol025, sk8_tol03, sk8_tol035, sk8_tol04
+
+import os
+import sys
+import logging
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import kparts
+
+logger = logging.getLogger(__name__)
+
+# key -> shape of the body. None when build_tol_variants is not running
+BODY_CACHE = None
+
+
+def tol_suffix (tol):
+    """ Suffix of the name of a tolerance variant: 0.3 -> '_tol03',
+    0.25 -> '_tol025'
+    """
+    return '_tol' + ('%g' % tol).replace('.', '')
+
+
+def body_key (cls_name, *args):
+    """ Key of a body in BODY_CACHE: name of the class and the values that
+    define the geometry of the body
+    """
+    return cls_name + repr(args)
+
+
+def get_body (key):
+    """ Shape of the body, None if it hasn't been built or
+    build_tol_variants is not running
+    """
+    if BODY_CACHE is None:
+        return None
+    return BODY_CACHE.get(key)
+
+
+def set_body (key, shp):
+    """ Keeps the shape of the body, if build_tol_variants is running
+    """
+    if BODY_CACHE is not None:
+        BODY_CACHE[key] = shp
+
+
+def build_tol_variants (cls, tol_list = kparts.TOL_STEPS, name = '',
+                        **kwargs):
+    """ Builds a piece with several tolerances
+
+    Parameters:
+    -----------
+    cls : class
+        class of the piece, it has to have the arguments tol and name
+    tol_list : list of float
+        tolerances of the variants
+    name : str
+        name of the piece, the name of each variant is name + tol_suffix
+    kwargs :
+        the other arguments of the class
+
+    Returns:
+    --------
+    list of the objects of the variants, in the order of tol_list
+    """
+    global BODY_CACHE
+    BODY_CACHE = {}
+    obj_list = []
+    try:
+        for tol in tol_list:
+            obj_list.append(cls(tol = tol, name = name + tol_suffix(tol),
+                                **kwargs))
+    finally:
+        BODY_CACHE = None
+    return obj_list
@@ -18,6 +18,12 @@ STOL = TOL / 2.0       # smaller tolerance
 # height of the layer to print. To make some supports, ie: bolt's head
 LAYER3D_H = 0.3  
 
+# printable area of the bed of the printer, to place the pieces (fcplate)
+PRNT_BED_W = 200.
+PRNT_BED_D = 200.
+# space between the pieces on the bed
+PRNT_BED_SPACE = 5.
+
 # ---------------------- linear Bearings
 
 #external diameter of the bearing 
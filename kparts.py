@@ -45,6 +45,19 @@ TOL_BEARING_L = 1.0 # reduced, good
 MTOL = kcomp.TOL # too tight for reducing the tolrances, it was too tolerant
 MLTOL = kcomp.TOL - 0.05 # reducing the tolrances, it was too tolerant :)
 
+# tolerances of the variants to test the fit, see fcvariant
+TOL_STEPS = (0.2, 0.25, 0.3, 0.35, 0.4)
+
 # default values for exporting to STL
 LIN_DEFL = 0.1
 ANG_DEFL = 0.523599 # 30 degree
+
+# adaptive values for exporting to STL, see fcexport.deflection_adaptive
+# linear deflection relative to the diagonal of the bounding box
+ADAPT_REL_DEFL = 0.0005
+# minimum and maximum linear deflection, relative to the layer height
+# (kcomp.LAYER3D_H). Smaller than the minimum cannot be printed
+ADAPT_MIN_DEFL_LAYER = 0.2
+ADAPT_MAX_DEFL_LAYER = 1.
+# angle of the segments on the curved faces of small radius
+ADAPT_ARC_ANG = 0.261799 # 15 degree
@@ -73,7 +73,7 @@ class BearWashGroup (object):
     def __init__ (self, holcyl_list,
                   name = "bearwashgr", 
                   normal = VZ, pos = V0):
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         self.holcyl_list = holcyl_list
         self.name = name
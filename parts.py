@@ -36,6 +36,8 @@ import comps
 import kparts
 import shp_clss
 import fc_clss
+import fcvariant
+import shp_fastener
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, addCyl_pos, fillet_len
 from fcfun import VXN, VYN, VZN
@@ -51,7 +53,7 @@ logger = logging.getLogger(__name__)
 
 # ----------- class AluProfBracketPerp -----------------------------------
 
-class AluProfBracketPerp (object):
+class AluProfBracketPerp (fc_clss.LeanShp):
 
     """ Bracket to join 2 aluminum profiles that are perpendicular,
         that is, they are not on the same plane
@@ -140,7 +142,7 @@ class AluProfBracketPerp (object):
                  wfco=1,
                  name = 'bracket'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.name = name
         # bolt lin dimensions
         boltli_dict = kcomp.D912[bolt_lin_d]
@@ -275,7 +277,7 @@ class AluProfBracketPerp (object):
         boltholes = []
         pos_boltpe =  (pos + DraftVecUtils.scale(axis_perp,alusize_perp/2.)
                      + DraftVecUtils.scale(axis_lin,br_perp_thick+boltpehead_l))
-        shp_boltpe = fcfun.shp_bolt_dir(r_shank = boltpeshank_r_tol,
+        shp_boltpe = shp_fastener.shp_bolt_dir(r_shank = boltpeshank_r_tol,
                             l_bolt = br_perp_thick + boltpehead_l,
                             r_head = boltpehead_r_tol + xtr_bolt_head_d/2.,
                             l_head = boltpehead_l,
@@ -310,7 +312,7 @@ class AluProfBracketPerp (object):
             boltholes.append(shp_railli)
         else: # holes for the bolts
             # first boltli hole , make a bolt, in case there is chamfer to cut
-            shp_boltli = fcfun.shp_bolt_dir(r_shank = boltlishank_r_tol,
+            shp_boltli = shp_fastener.shp_bolt_dir(r_shank = boltlishank_r_tol,
                             l_bolt = alusize_perp,
                             r_head = boltlihead_r_tol + kcomp.TOL/2., #extra TOL
                             l_head = alusize_perp-br_lin_thick,
@@ -346,10 +348,12 @@ class AluProfBracketPerp (object):
             fco_bracket = doc.addObject("Part::Feature", name )
             fco_bracket.Shape = shp_bracket
             self.fco = fco_bracket
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Bracket object with no fco")
         
@@ -476,7 +480,7 @@ class AluProfBracketPerp (object):
 
 # ----------- class AluProfBracketPerpWide -----------------------------------
 
-class AluProfBracketPerpFlap (object):
+class AluProfBracketPerpFlap (fc_clss.LeanShp):
 
     """ Bracket to join 2 aluminum profiles that are perpendicular,
         that is, they are not on the same plane
@@ -570,7 +574,7 @@ class AluProfBracketPerpFlap (object):
                  wfco=1,
                  name = 'bracket_flap'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.name = name
         boltli_dict = kcomp.D912[bolt_lin_d]
         boltlihead_r = boltli_dict['head_r']
@@ -744,7 +748,8 @@ class AluProfBracketPerpFlap (object):
                       + DraftVecUtils.scale(axis_perp,alusize_perp/2.)
                       + DraftVecUtils.scale(axis_lin,br_perp_thick+boltpehead_l)
                       + DraftVecUtils.scale(axis_wid, iboltpe))
-                shp_boltpe = fcfun.shp_bolt_dir(r_shank = boltpeshank_r_tol,
+                shp_boltpe = shp_fastener.shp_bolt_dir(
+                              r_shank = boltpeshank_r_tol,
                               l_bolt = br_perp_thick + boltpehead_l,
                               r_head = boltpehead_r_tol + kcomp.TOL, #extra TOL
                               l_head = boltpehead_l,
@@ -780,7 +785,7 @@ class AluProfBracketPerpFlap (object):
             boltholes.append(shp_railli)
         else :
             # first bolt hole:
-            shp_boltli = fcfun.shp_bolt_dir(r_shank = boltlishank_r_tol,
+            shp_boltli = shp_fastener.shp_bolt_dir(r_shank = boltlishank_r_tol,
                             l_bolt = alusize_perp,
                             r_head = boltlihead_r_tol + kcomp.TOL/2., #extra TOL
                             l_head = alusize_perp-br_lin_thick,
@@ -796,7 +801,8 @@ class AluProfBracketPerpFlap (object):
             for ibolt in range (1, nbolts_lin):
                 pos_boltli = (  pos_boltli
                                + DraftVecUtils.scale(axis_lin,bolts_lin_dist)) 
-                shp_boltli = fcfun.shp_bolt_dir(r_shank = boltlishank_r_tol,
+                shp_boltli = shp_fastener.shp_bolt_dir(
+                            r_shank = boltlishank_r_tol,
                             l_bolt = alusize_perp,
                             r_head = boltlihead_r_tol + kcomp.TOL/2., #extra TOL
                             l_head = alusize_perp-br_lin_thick,
@@ -822,10 +828,12 @@ class AluProfBracketPerpFlap (object):
             fco_bracket = doc.addObject("Part::Feature", name )
             fco_bracket.Shape = shp_bracket
             self.fco = fco_bracket
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Bracket object with no fco")
         
@@ -915,7 +923,7 @@ class AluProfBracketPerpFlap (object):
 
 # ----------- class AluProfBracketPerpTwin -----------------------------------
 
-class AluProfBracketPerpTwin (object):
+class AluProfBracketPerpTwin (fc_clss.LeanShp):
 
     """ Bracket to join 3 aluminum profiles that are perpendicular,
         that is, they are not on the same plane
@@ -1031,7 +1039,7 @@ class AluProfBracketPerpTwin (object):
                  wfco=1,
                  name = 'bracket_twin'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.name = name
 
         boltli_dict = kcomp.D912[bolt_lin_d]
@@ -1174,7 +1182,7 @@ class AluProfBracketPerpTwin (object):
                     + DraftVecUtils.scale(axis_perp,alusize_perp/2.)
                     + DraftVecUtils.scale(axis_lin,br_perp_thick+boltpehead_l)
                     + DraftVecUtils.scale(axis_wid, alu_sep/2.))
-            shp_boltpe = fcfun.shp_bolt_dir(r_shank = boltpeshank_r_tol,
+            shp_boltpe = shp_fastener.shp_bolt_dir(r_shank = boltpeshank_r_tol,
                             l_bolt = br_perp_thick + boltpehead_l,
                             r_head = boltpehead_r_tol + kcomp.TOL, #extra TOL
                             l_head = boltpehead_l,
@@ -1194,7 +1202,8 @@ class AluProfBracketPerpTwin (object):
                     + DraftVecUtils.scale(axis_perp,alusize_perp/2.)
                     + DraftVecUtils.scale(axis_lin,br_perp_thick+boltpehead_l)
                     + DraftVecUtils.scale(axis_wid, w_pos))
-                shp_boltpe = fcfun.shp_bolt_dir(r_shank = boltpeshank_r_tol,
+                shp_boltpe = shp_fastener.shp_bolt_dir(
+                            r_shank = boltpeshank_r_tol,
                             l_bolt = br_perp_thick + boltpehead_l,
                             r_head = boltpehead_r_tol + kcomp.TOL, #extra TOL
                             l_head = boltpehead_l,
@@ -1220,10 +1229,12 @@ class AluProfBracketPerpTwin (object):
             fco_bracket = doc.addObject("Part::Feature", name )
             fco_bracket.Shape = shp_bracket
             self.fco = fco_bracket
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Bracket object with no fco")
 
@@ -1394,7 +1405,7 @@ class IdlePulleyHolder (object):
                   endstop_posh = 0,
                   name = "idlepulleyhold"):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         self.profile_size = profile_size
         self.pulleybolt_d = pulleybolt_d
@@ -1652,7 +1663,7 @@ class IdlePulleyHolder (object):
         doc.recompute()
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
             
             
@@ -1785,7 +1796,7 @@ def endstopholder_rail ():
     #Part.show (box)
     return (box)
 
-class SimpleEndstopHolder (object):
+class SimpleEndstopHolder (fc_clss.LeanShp):
 
     """
         Very simple endstop holder to be attached to a alu profile and
@@ -1892,7 +1903,7 @@ class SimpleEndstopHolder (object):
         self.wfco = wfco
         self.name = name
         self.base_h = base_h,
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         # normalize the axis
         axis_h = DraftVecUtils.scaleTo(fc_axis_h,1)
         axis_d = DraftVecUtils.scaleTo(fc_axis_d,1)
@@ -2130,7 +2141,7 @@ class SimpleEndstopHolder (object):
         for fc_1_2_wi in [fc_1_2_w, fc_1_2_w.negative()]:
             pos_estpbolt = d1_w1_h1_pos + fc_1_4_d + fc_1_2_wi
             # hole with the nut hole
-            shp_estpbolt = fcfun.shp_bolt_dir (
+            shp_estpbolt = shp_fastener.shp_bolt_dir (
                              r_shank= (estp_bolt_d+TOL)/2.,
                              l_bolt = tot_h,
                            # 1 TOL didnt fit
@@ -2146,7 +2157,7 @@ class SimpleEndstopHolder (object):
             if estop_2ndbolt_topdist >0:
                 pos_estp_top_bolt =  d1_w1_h1_pos + fc_1_6_d + fc_1_2_wi
                 # hole with the nut hole
-                shp_estpbolt = fcfun.shp_bolt_dir (
+                shp_estpbolt = shp_fastener.shp_bolt_dir (
                              r_shank= (estp_bolt_d+TOL)/2.,
                              l_bolt = tot_h,
                            # 1 TOL didnt fit
@@ -2205,10 +2216,12 @@ class SimpleEndstopHolder (object):
             fco = doc.addObject("Part::Feature", name )
             fco.Shape = self.shp
             self.fco = fco
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Object with no fco")
 
@@ -2307,6 +2320,10 @@ class ThinLinBearHouse1rail (object):
         axis_center = See picture, indicates the reference point
         mid_center  = See picture, indicates the reference point
         pos = position of the reference point,
+        tol = tolerance of the holes of the bolts (kcomp.TOL by default).
+              The hole of the bearing keeps its difference with the holes
+              of the bolts (kparts.MTOL - kparts.MLTOL), see fcvariant to
+              build it with several tolerances
 
     Useful Attributes:
         n1_slide_axis: FreeCAD.Vector
@@ -2375,7 +2392,8 @@ class ThinLinBearHouse1rail (object):
                  axis_center = 1,
                  mid_center  = 1,
                  pos = V0,
-                 name = 'thinlinbearhouse1rail'
+                 name = 'thinlinbearhouse1rail',
+                 tol = TOL
                 ):
 
         # normalize, just in case
@@ -2394,14 +2412,15 @@ class ThinLinBearHouse1rail (object):
         else:
             BOLT_D = 3  # M3 bolts
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         MIN_SEP_WALL = self.MIN_SEP_WALL
         MIN2_SEP_WALL = self.MIN2_SEP_WALL
         OUT_SEP_H = self.OUT_SEP_H
         # bolt dimensions:
-        MTOL = self.MTOL
-        MLTOL = self.MLTOL
+        # the bearing keeps its difference with the bolts
+        MLTOL = tol - (self.MTOL - self.MLTOL)
+        MTOL = tol
         BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
         BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
         BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL # More toler/2.0 
@@ -2415,9 +2434,9 @@ class ThinLinBearHouse1rail (object):
         bearing_l     = d_lbear['L'] 
         bearing_l_tol = bearing_l + self.TOL_BEARING_L
         bearing_d     = d_lbear['De']
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
+        bearing_d_tol = bearing_d + 2.0 * MLTOL
         bearing_r     = bearing_d / 2.0
-        bearing_r_tol = bearing_r + self.MLTOL
+        bearing_r_tol = bearing_r + MLTOL
 
         #There are two basic pieces: the base and the housing for the linear
         # bearing
@@ -2550,6 +2569,7 @@ class ThinLinBearHouse1rail (object):
 
 
 
+        bolt_pos_list = []
         for vec_axis in [DraftVecUtils.scale(n1_slide_axis,boltcen_axis_dist),
                          DraftVecUtils.scale(n1_slide_axis,-boltcen_axis_dist)]:
             for vec_perp in [DraftVecUtils.scale(n1_perp,
@@ -2557,9 +2577,10 @@ class ThinLinBearHouse1rail (object):
                              DraftVecUtils.scale(n1_perp,
                                                  -boltcen_perp_dist)]:
                 pos_i = botcenter_pos + vec_axis + vec_perp
-                # the nut hole will be on the bottom side,
-                
-                shp_bolt = fcfun.shp_boltnut_dir_hole (
+                bolt_pos_list.append(pos_i)
+        # the nut hole will be on the bottom side,
+        # the 4 bolts are the same, made once and placed 4 times
+        shp_bolts = shp_fastener.shp_boltnut_dir_hole_compound (
                                   r_shank = BOLT_SHANK_R_TOL,
                                   l_bolt  = housing_h,
                                   r_head  = BOLT_HEAD_R_TOL,
@@ -2567,14 +2588,14 @@ class ThinLinBearHouse1rail (object):
                                   r_nut  = BOLT_NUT_R_TOL,
                                   # more space, because we want it well inside
                                   l_nut  = 1.5*BOLT_NUT_L,
+                                  pos_list = bolt_pos_list,
                                   hex_head = 0,
                                   xtr_head=1,     xtr_nut=1,
                                   supp_head=1,    supp_nut=1,
                                   headstart=0,
                                   fc_normal = n1_bot_axis_neg,
-                                  fc_verx1=V0,
-                                  pos = pos_i)
-                bolt_holes.append(shp_bolt)
+                                  fc_verx1=V0)
+        bolt_holes.append(shp_bolts)
 
         # ----------------- Attributes
         self.n1_slide_axis = n1_slide_axis
@@ -2627,8 +2648,8 @@ class ThinLinBearHouse1rail (object):
         self.fco_bot = fco_lbear_bot
 
     def color (self, color = (1,1,1)):
-        self.fco_top.ViewObject.ShapeColor = color
-        self.fco_bot.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco_top, ShapeColor = color)
+        fcfun.set_fco_view(self.fco_bot, ShapeColor = color)
 
 
 
@@ -2716,6 +2737,15 @@ class ThinLinBearHouse (object):
         bolt_center  = See picture, indicates the reference point, if it is
                        on the bolt or on the axis
         pos = position of the reference point,
+        mirror_build = 1: if the top and bottom parts have the same height,
+                       the bottom part is made and the top part is its
+                       mirror image, the bolts are cut from both.
+                       It should give the same piece, it is checked
+                       against the pieces built without mirroring by
+                       fcregress
+        tol = None: tolerance of the holes of the bearing and the bolts,
+                    None: MTOL. The dimensions of the housing don't change,
+                    see fcvariant to build it with several tolerances
 
     Useful Attributes:
         n1_slide_axis: FreeCAD.Vector
@@ -2796,7 +2826,9 @@ class ThinLinBearHouse (object):
                  mid_center  = 1,
                  bolt_center  = 0,
                  pos = V0,
-                 name = 'thinlinbearhouse'
+                 name = 'thinlinbearhouse',
+                 mirror_build = 0,
+                 tol = None
                 ):
 
         self.name = name
@@ -2823,7 +2855,7 @@ class ThinLinBearHouse (object):
         else:
             BOLT_D = 3  # M3 bolts
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         MIN_SEP_WALL = self.MIN_SEP_WALL
         MIN2_SEP_WALL = self.MIN2_SEP_WALL
@@ -2831,6 +2863,10 @@ class ThinLinBearHouse (object):
         # bolt dimensions:
         MTOL = self.MTOL
         MLTOL = self.MLTOL
+        if tol is not None:
+            # the bearing keeps its difference with the bolts
+            MLTOL = tol - (self.MTOL - self.MLTOL)
+            MTOL = tol
         BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
         BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
         BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
@@ -2840,9 +2876,9 @@ class ThinLinBearHouse (object):
         bearing_l     = d_lbear['L'] 
         bearing_l_tol = bearing_l + self.TOL_BEARING_L
         bearing_d     = d_lbear['De']
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
+        bearing_d_tol = bearing_d + 2.0 * MLTOL
         bearing_r     = bearing_d / 2.0
-        bearing_r_tol = bearing_r + self.MLTOL
+        bearing_r_tol = bearing_r + MLTOL
 
         # dimensions of the housing:
         # length on the direction of the sliding rod
@@ -2935,31 +2971,52 @@ class ThinLinBearHouse (object):
         topcenter_pos = botcenter_pos + DraftVecUtils.scale(n1_bot_axis_neg,
                                                             housing_h)
 
-        shp_housing = fcfun.shp_box_dir(box_w = housing_w,
-                                     box_d = housing_l, #dir of n1_slide_axis
-                                     box_h = housing_h,
-                                     fc_axis_h = n1_bot_axis_neg,
-                                     fc_axis_d = n1_slide_axis,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = botcenter_pos)
-        # fillet, small
-        shp_block = fcfun.shp_filletchamfer_dir(shp_housing,
-                                                fc_axis=fc_bot_axis,
-                                                radius=2)
-
-        # the rod hole
-        shp_rod = fcfun.shp_cylcenxtr(r = rod_r + kparts.ROD_SPACE_MIN,
-                                      h = housing_l,
-                                      normal = n1_slide_axis,
-                                      ch = 1, xtr_top = 1, xtr_bot=1,
-                                      pos = axiscenter_pos)
+        # the top and the bottom parts are mirror images, apart from the
+        # bolts, if they have the same height. Then, only the bottom
+        # part is made, and the top part is its mirror image
+        if (mirror_build == 1 and
+            abs(housing_h - 2 * axis_h) > fcfun.EQUAL_TOL):
+            logger.debug("top and bottom parts have different height,"
+                         " they are not made by mirroring")
+            mirror_build = 0
+        if mirror_build == 1:
+            block_h = axis_h
+        else:
+            block_h = housing_h
+
+        # the block with the rod hole doesn't depend on the tolerance,
+        # it is shared by the tolerance variants, see fcvariant
+        body_key = fcvariant.body_key('ThinLinBearHouse',
+                                      housing_w, housing_l, block_h,
+                                      n1_slide_axis, n1_bot_axis,
+                                      botcenter_pos, axiscenter_pos, rod_r)
+        shp_body = fcvariant.get_body(body_key)
+        if shp_body is None:
+            shp_housing = fcfun.shp_box_dir(box_w = housing_w,
+                                      box_d = housing_l, #dir of n1_slide_axis
+                                      box_h = block_h,
+                                      fc_axis_h = n1_bot_axis_neg,
+                                      fc_axis_d = n1_slide_axis,
+                                      cw= 1, cd=1, ch=0,
+                                      pos = botcenter_pos)
+            # fillet, small
+            shp_block = fcfun.shp_filletchamfer_dir(shp_housing,
+                                                    fc_axis=fc_bot_axis,
+                                                    radius=2)
+            # the rod hole
+            shp_rod = fcfun.shp_cylcenxtr(r = rod_r + kparts.ROD_SPACE_MIN,
+                                          h = housing_l,
+                                          normal = n1_slide_axis,
+                                          ch = 1, xtr_top = 1, xtr_bot=1,
+                                          pos = axiscenter_pos)
+            shp_body = shp_block.cut(shp_rod)
+            fcvariant.set_body(body_key, shp_body)
         # the linear bearing hole
         shp_lbear = fcfun.shp_cylcenxtr(r = bearing_r_tol,
                                         h = bearing_l_tol,
                                         normal = n1_slide_axis,
                                         ch = 1, xtr_top = 1, xtr_bot=1,
                                         pos = axiscenter_pos)
-        shp_rodlbear = shp_rod.fuse(shp_lbear)
 
         # 4 bolts 
         
@@ -2974,7 +3031,7 @@ class ThinLinBearHouse (object):
                 pos_i = topcenter_pos + vec_axis + vec_perp
                 # the nut hole will be on the bottom side,
                 
-                shp_bolt = fcfun.shp_bolt_dir (
+                shp_bolt = shp_fastener.shp_bolt_dir (
                                   r_shank = BOLT_SHANK_R_TOL,
                                   l_bolt  = housing_h,
                                   r_head  = BOLT_HEAD_R_TOL,
@@ -2987,35 +3044,46 @@ class ThinLinBearHouse (object):
                                   pos = pos_i)
                 bolt_holes.append(shp_bolt)
 
-        shp_holes = shp_rodlbear.multiFuse(bolt_holes)       
-        shp_lbear_housing = shp_block.cut(shp_holes)
-        doc.recompute()
-        # making 2 parts, intersection with 2 boxes:
-        shp_box_top = fcfun.shp_box_dir(
-                                     box_w = housing_w + 2,
-                                     box_d = housing_l + 2, 
-                                     box_h = housing_h - axis_h + 1,
-                                     fc_axis_h = n1_bot_axis_neg,
-                                     fc_axis_d = n1_slide_axis,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = axiscenter_pos)
-        shp_lbear_housing_top = shp_lbear_housing.common(shp_box_top)
-        shp_lbear_housing_top = shp_lbear_housing_top.removeSplitter() 
+        if mirror_build == 1:
+            # the bottom part is made with the holes of the rod and
+            # the bearing, the top part is its mirror image.
+            # Then the bolts are cut from both
+            shp_half = shp_body.cut(shp_lbear)
+            shp_lbear_housing_bot, shp_lbear_housing_top = (
+                fcfun.shp_mirror_halves(shp_half,
+                                        fc_normal = n1_bot_axis,
+                                        pos = axiscenter_pos,
+                                        shp_tool_list = bolt_holes))
+        else:
+            shp_holes = shp_lbear.multiFuse(bolt_holes)       
+            shp_lbear_housing = shp_body.cut(shp_holes)
+            doc.recompute()
+            # making 2 parts, intersection with 2 boxes:
+            shp_box_top = fcfun.shp_box_dir(
+                                         box_w = housing_w + 2,
+                                         box_d = housing_l + 2, 
+                                         box_h = housing_h - axis_h + 1,
+                                         fc_axis_h = n1_bot_axis_neg,
+                                         fc_axis_d = n1_slide_axis,
+                                         cw= 1, cd=1, ch=0,
+                                         pos = axiscenter_pos)
+            shp_lbear_housing_top = shp_lbear_housing.common(shp_box_top)
+            shp_lbear_housing_top = shp_lbear_housing_top.removeSplitter() 
+
+
+            shp_box_bot = fcfun.shp_box_dir(
+                                         box_w = housing_w + 2,
+                                         box_d = housing_l + 2,
+                                         # larger, just in case
+                                         box_h = axis_h + 1,
+                                         fc_axis_h = n1_bot_axis,
+                                         fc_axis_d = n1_slide_axis,
+                                         cw= 1, cd=1, ch=0,
+                                         pos = axiscenter_pos)
+            shp_lbear_housing_bot = shp_lbear_housing.common(shp_box_bot)
+            shp_lbear_housing_bot = shp_lbear_housing_bot.removeSplitter()
         fco_lbear_top = doc.addObject("Part::Feature", name + '_top') 
         fco_lbear_top.Shape = shp_lbear_housing_top
-
-
-        shp_box_bot = fcfun.shp_box_dir(
-                                     box_w = housing_w + 2,
-                                     box_d = housing_l + 2,
-                                     # larger, just in case
-                                     box_h = axis_h + 1,
-                                     fc_axis_h = n1_bot_axis,
-                                     fc_axis_d = n1_slide_axis,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = axiscenter_pos)
-        shp_lbear_housing_bot = shp_lbear_housing.common(shp_box_bot)
-        shp_lbear_housing_bot = shp_lbear_housing_bot.removeSplitter()
         fco_lbear_bot = doc.addObject("Part::Feature", name + '_bot') 
         fco_lbear_bot.Shape = shp_lbear_housing_bot
 
@@ -3029,8 +3097,8 @@ class ThinLinBearHouse (object):
         self.fco_bot.Placement.Base = vpos
 
     def color (self, color = (1,1,1)):
-        self.fco_top.ViewObject.ShapeColor = color
-        self.fco_bot.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco_top, ShapeColor = color)
+        fcfun.set_fco_view(self.fco_bot, ShapeColor = color)
 
     def export_stl (self, name = ""):
         #filepath = os.getcwd()
@@ -3130,6 +3198,16 @@ class LinBearHouse (object):
         4: axis_center=1
            mid_center =0
 
+        mirror_build = 1: if the top and bottom parts have the same height,
+                       the bottom part is made and the top part is its
+                       mirror image, the bolts are cut from both.
+                       It should give the same piece, it is checked
+                       against the pieces built without mirroring by
+                       fcregress
+        tol = None: tolerance of the holes of the bearing and the bolts,
+                    None: MTOL. The dimensions of the housing don't change,
+                    see fcvariant to build it with several tolerances
+
     """
 
 
@@ -3146,7 +3224,9 @@ class LinBearHouse (object):
                  axis_center = 1,
                  mid_center  = 1,
                  pos = V0,
-                 name = 'linbearhouse'
+                 name = 'linbearhouse',
+                 mirror_build = 0,
+                 tol = None
                 ):
 
         housing_l = d_lbearhousing['L']
@@ -3177,10 +3257,14 @@ class LinBearHouse (object):
         self.bear_r = d_lbear['Di']
         bolt_d = d_lbearhousing['bolt_d']
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         # bolt dimensions:
         MTOL = self.MTOL
         MLTOL = self.MLTOL
+        if tol is not None:
+            # the bearing keeps its difference with the bolts
+            MLTOL = tol - (self.MTOL - self.MLTOL)
+            MTOL = tol
         BOLT_HEAD_R = kcomp.D912_HEAD_D[bolt_d] / 2.0
         BOLT_HEAD_L = kcomp.D912_HEAD_L[bolt_d] + MTOL
         BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
@@ -3190,9 +3274,9 @@ class LinBearHouse (object):
         bearing_l     = d_lbear['L']
         bearing_l_tol = bearing_l + self.TOL_BEARING_L
         bearing_d     = d_lbear['De']
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
+        bearing_d_tol = bearing_d + 2.0 * MLTOL
         bearing_r     = bearing_d / 2.0
-        bearing_r_tol = bearing_r + self.MLTOL
+        bearing_r_tol = bearing_r + MLTOL
 
         cenbolt_dist_l = d_lbearhousing['bolt_sep_l']/2.
         cenbolt_dist_w = d_lbearhousing['bolt_sep_w']/2.
@@ -3222,32 +3306,52 @@ class LinBearHouse (object):
         topcenter_pos = botcenter_pos + DraftVecUtils.scale(n1_bot_axis_neg,
                                                             housing_h)
 
-        shp_housing = fcfun.shp_box_dir(box_w = housing_w,
-                                     box_d = housing_l, #dir of n1_slide_axis
-                                     box_h = housing_h,
-                                     fc_axis_h = n1_bot_axis_neg,
-                                     fc_axis_d = n1_slide_axis,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = botcenter_pos)
-
-        # fillet the base:
-        shp_housing_fllt = fcfun.shp_filletchamfer_dir(shp_housing,
+        # the top and the bottom parts are mirror images, apart from the
+        # bolts, if they have the same height. Then, only the bottom
+        # part is made, and the top part is its mirror image
+        if (mirror_build == 1 and
+            abs(housing_h - 2 * axis_h) > fcfun.EQUAL_TOL):
+            logger.debug("top and bottom parts have different height,"
+                         " they are not made by mirroring")
+            mirror_build = 0
+        if mirror_build == 1:
+            block_h = axis_h
+        else:
+            block_h = housing_h
+
+        # the block with the rod hole doesn't depend on the tolerance,
+        # it is shared by the tolerance variants, see fcvariant
+        body_key = fcvariant.body_key('LinBearHouse',
+                                      housing_w, housing_l, block_h,
+                                      n1_slide_axis, n1_bot_axis,
+                                      botcenter_pos, axiscenter_pos, rod_r)
+        shp_body = fcvariant.get_body(body_key)
+        if shp_body is None:
+            shp_housing = fcfun.shp_box_dir(box_w = housing_w,
+                                      box_d = housing_l, #dir of n1_slide_axis
+                                      box_h = block_h,
+                                      fc_axis_h = n1_bot_axis_neg,
+                                      fc_axis_d = n1_slide_axis,
+                                      cw= 1, cd=1, ch=0,
+                                      pos = botcenter_pos)
+            # fillet the base:
+            shp_housing_fllt = fcfun.shp_filletchamfer_dir(shp_housing,
                                                     fc_axis=fc_bot_axis,
                                                     radius=2)
-
-        # the rod hole
-        shp_rod = fcfun.shp_cylcenxtr(r = rod_r + kparts.ROD_SPACE_MIN,
-                                      h = housing_l,
-                                      normal = n1_slide_axis,
-                                      ch = 1, xtr_top = 1, xtr_bot=1,
-                                      pos = axiscenter_pos)
+            # the rod hole
+            shp_rod = fcfun.shp_cylcenxtr(r = rod_r + kparts.ROD_SPACE_MIN,
+                                          h = housing_l,
+                                          normal = n1_slide_axis,
+                                          ch = 1, xtr_top = 1, xtr_bot=1,
+                                          pos = axiscenter_pos)
+            shp_body = shp_housing_fllt.cut(shp_rod)
+            fcvariant.set_body(body_key, shp_body)
         # the linear bearing hole
         shp_lbear = fcfun.shp_cylcenxtr(r = bearing_r_tol,
                                         h = bearing_l_tol,
                                         normal = n1_slide_axis,
                                         ch = 1, xtr_top = 1, xtr_bot=1,
                                         pos = axiscenter_pos)
-        shp_rodlbear = shp_rod.fuse(shp_lbear)
 
         # 4 bolts to join the upper and lower parts
         # distance of the bolts to the center, on n1_slide_axis dir
@@ -3263,7 +3367,7 @@ class LinBearHouse (object):
                 pos_i = topcenter_pos + vec_axis + vec_perp
                 # the nut hole will be on the bottom side,
                 
-                shp_bolt = fcfun.shp_bolt_dir (
+                shp_bolt = shp_fastener.shp_bolt_dir (
                                   r_shank = BOLT_SHANK_R_TOL,
                                   l_bolt  = housing_h,
                                   r_head  = BOLT_HEAD_R_TOL,
@@ -3276,35 +3380,46 @@ class LinBearHouse (object):
                                   pos = pos_i)
                 bolt_holes.append(shp_bolt)
 
-        shp_holes = shp_rodlbear.multiFuse(bolt_holes)       
-        shp_lbear_housing = shp_housing_fllt.cut(shp_holes)
-        #Part.show(shp_lbear_housing)
-        doc.recompute()
-        # making 2 parts, intersection with 2 boxes:
-        shp_box_top = fcfun.shp_box_dir(
-                                     box_w = housing_w + 2,
-                                     box_d = housing_l + 2, 
-                                     box_h = housing_h - axis_h + 2,
-                                     fc_axis_h = n1_bot_axis_neg,
-                                     fc_axis_d = n1_slide_axis,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = axiscenter_pos)
-        shp_lbear_housing_top = shp_lbear_housing.common(shp_box_top)
-        shp_lbear_housing_top = shp_lbear_housing_top.removeSplitter() 
+        if mirror_build == 1:
+            # the bottom part is made with the holes of the rod and
+            # the bearing, the top part is its mirror image.
+            # Then the bolts are cut from both
+            shp_half = shp_body.cut(shp_lbear)
+            shp_lbear_housing_bot, shp_lbear_housing_top = (
+                fcfun.shp_mirror_halves(shp_half,
+                                        fc_normal = n1_bot_axis,
+                                        pos = axiscenter_pos,
+                                        shp_tool_list = bolt_holes))
+        else:
+            shp_holes = shp_lbear.multiFuse(bolt_holes)       
+            shp_lbear_housing = shp_body.cut(shp_holes)
+            #Part.show(shp_lbear_housing)
+            doc.recompute()
+            # making 2 parts, intersection with 2 boxes:
+            shp_box_top = fcfun.shp_box_dir(
+                                         box_w = housing_w + 2,
+                                         box_d = housing_l + 2, 
+                                         box_h = housing_h - axis_h + 2,
+                                         fc_axis_h = n1_bot_axis_neg,
+                                         fc_axis_d = n1_slide_axis,
+                                         cw= 1, cd=1, ch=0,
+                                         pos = axiscenter_pos)
+            shp_lbear_housing_top = shp_lbear_housing.common(shp_box_top)
+            shp_lbear_housing_top = shp_lbear_housing_top.removeSplitter() 
+
+            shp_box_bot = fcfun.shp_box_dir(
+                                         box_w = housing_w + 2,
+                                         box_d = housing_l + 2,
+                                         # larger, just in case
+                                         box_h = axis_h + 2,
+                                         fc_axis_h = n1_bot_axis,
+                                         fc_axis_d = n1_slide_axis,
+                                         cw= 1, cd=1, ch=0,
+                                         pos = axiscenter_pos)
+            shp_lbear_housing_bot = shp_lbear_housing.common(shp_box_bot)
+            shp_lbear_housing_bot = shp_lbear_housing_bot.removeSplitter()
         fco_lbear_top = doc.addObject("Part::Feature", name + '_top') 
         fco_lbear_top.Shape = shp_lbear_housing_top
-
-        shp_box_bot = fcfun.shp_box_dir(
-                                     box_w = housing_w + 2,
-                                     box_d = housing_l + 2,
-                                     # larger, just in case
-                                     box_h = axis_h + 2,
-                                     fc_axis_h = n1_bot_axis,
-                                     fc_axis_d = n1_slide_axis,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = axiscenter_pos)
-        shp_lbear_housing_bot = shp_lbear_housing.common(shp_box_bot)
-        shp_lbear_housing_bot = shp_lbear_housing_bot.removeSplitter()
         fco_lbear_bot = doc.addObject("Part::Feature", name + '_bot') 
         fco_lbear_bot.Shape = shp_lbear_housing_bot
 
@@ -3313,8 +3428,8 @@ class LinBearHouse (object):
         doc.recompute()
 
     def color (self, color = (1,1,1)):
-        self.fco_top.ViewObject.ShapeColor = color
-        self.fco_bot.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco_top, ShapeColor = color)
+        fcfun.set_fco_view(self.fco_bot, ShapeColor = color)
 
     def export_stl (self, name = ""):
         #filepath = os.getcwd()
@@ -3454,6 +3569,16 @@ class ThinLinBearHouseAsim (object):
         refcen_wid  = See picture, indicates the reference point, if it is
                        on the bolt or on the axis
         pos = position of the reference point,
+        mirror_build = 1: if the top and bottom parts have the same height,
+                       the bottom part is made and the top part is its
+                       mirror image, the bolts are cut from both.
+                       It should give the same piece, it is checked
+                       against the pieces built without mirroring by
+                       fcregress
+        tol = tolerance of the holes of the bolts (kcomp.TOL by default).
+              The hole of the bearing keeps its difference with the holes
+              of the bolts (kparts.MTOL - kparts.MLTOL), see fcvariant to
+              build it with several tolerances
 
     Useful Attributes:
         nfro_ax: FreeCAD.Vector normalized fc_fro_ax
@@ -3545,7 +3670,9 @@ class ThinLinBearHouseAsim (object):
                  bolt2cen_wid_n = 0,
                  bolt2cen_wid_p = 0,
                  pos = V0,
-                 name = 'thinlinbearhouse_asim'
+                 name = 'thinlinbearhouse_asim',
+                 mirror_build = 0,
+                 tol = TOL
                 ):
 
         self.name = name
@@ -3572,14 +3699,15 @@ class ThinLinBearHouseAsim (object):
         else:
             BOLT_D = 3  # M3 bolts
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         MIN_SEP_WALL = self.MIN_SEP_WALL
         MIN2_SEP_WALL = self.MIN2_SEP_WALL
         OUT_SEP_H = self.OUT_SEP_H
         # bolt dimensions:
-        MTOL = self.MTOL
-        MLTOL = self.MLTOL
+        # the bearing keeps its difference with the bolts
+        MLTOL = tol - (self.MTOL - self.MLTOL)
+        MTOL = tol
         BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
         BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
         BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
@@ -3589,9 +3717,9 @@ class ThinLinBearHouseAsim (object):
         bearing_l     = d_lbear['L'] 
         bearing_l_tol = bearing_l + self.TOL_BEARING_L
         bearing_d     = d_lbear['De']
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
+        bearing_d_tol = bearing_d + 2.0 * MLTOL
         bearing_r     = bearing_d / 2.0
-        bearing_r_tol = bearing_r + self.MLTOL
+        bearing_r_tol = bearing_r + MLTOL
 
         # dimensions of the housing:
         # length on the direction of the sliding rod
@@ -3720,9 +3848,22 @@ class ThinLinBearHouseAsim (object):
         topcenter_pos = botcenter_pos + DraftVecUtils.scale(nbot_ax_n,
                                                             housing_h)
 
+        # the top and the bottom parts are mirror images, apart from the
+        # bolts, if they have the same height. Then, only the bottom
+        # part is made, and the top part is its mirror image
+        if (mirror_build == 1 and
+            abs(housing_h - 2 * axis_h) > fcfun.EQUAL_TOL):
+            logger.debug("top and bottom parts have different height,"
+                         " they are not made by mirroring")
+            mirror_build = 0
+        if mirror_build == 1:
+            block_h = axis_h
+        else:
+            block_h = housing_h
+
         shp_housing = fcfun.shp_box_dir(box_w = housing_w,
                                         box_d = housing_d, #dir of nfro_ax
-                                        box_h = housing_h,
+                                        box_h = block_h,
                                         fc_axis_h = nbot_ax_n,
                                         fc_axis_d = nfro_ax,
                                         cw= 1, cd=1, ch=0,
@@ -3759,7 +3900,7 @@ class ThinLinBearHouseAsim (object):
                 pos_i = topcenter_pos + vec_axis + vec_perp
                 # the nut hole will be on the bottom side,
                 
-                shp_bolt = fcfun.shp_bolt_dir (
+                shp_bolt = shp_fastener.shp_bolt_dir (
                                   r_shank = BOLT_SHANK_R_TOL,
                                   l_bolt  = housing_h,
                                   r_head  = BOLT_HEAD_R_TOL,
@@ -3772,35 +3913,46 @@ class ThinLinBearHouseAsim (object):
                                   pos = pos_i)
                 bolt_holes.append(shp_bolt)
 
-        shp_holes = shp_rodlbear.multiFuse(bolt_holes)       
-        shp_lbear_housing = shp_block.cut(shp_holes)
-        doc.recompute()
-        # making 2 parts, intersection with 2 boxes:
-        shp_box_top = fcfun.shp_box_dir(
-                                     box_w = housing_w + 2,
-                                     box_d = housing_d + 2, 
-                                     box_h = housing_h - axis_h + 1,
-                                     fc_axis_h = nbot_ax_n,
-                                     fc_axis_d = nfro_ax,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = axishouscenter_pos)
-        shp_lbear_housing_top = shp_lbear_housing.common(shp_box_top)
-        shp_lbear_housing_top = shp_lbear_housing_top.removeSplitter() 
+        if mirror_build == 1:
+            # the bottom part is made with the holes of the rod and
+            # the bearing, the top part is its mirror image.
+            # Then the bolts are cut from both
+            shp_half = shp_block.cut(shp_rodlbear)
+            shp_lbear_housing_bot, shp_lbear_housing_top = (
+                fcfun.shp_mirror_halves(shp_half,
+                                        fc_normal = nbot_ax,
+                                        pos = axiscenter_pos,
+                                        shp_tool_list = bolt_holes))
+        else:
+            shp_holes = shp_rodlbear.multiFuse(bolt_holes)       
+            shp_lbear_housing = shp_block.cut(shp_holes)
+            doc.recompute()
+            # making 2 parts, intersection with 2 boxes:
+            shp_box_top = fcfun.shp_box_dir(
+                                         box_w = housing_w + 2,
+                                         box_d = housing_d + 2, 
+                                         box_h = housing_h - axis_h + 1,
+                                         fc_axis_h = nbot_ax_n,
+                                         fc_axis_d = nfro_ax,
+                                         cw= 1, cd=1, ch=0,
+                                         pos = axishouscenter_pos)
+            shp_lbear_housing_top = shp_lbear_housing.common(shp_box_top)
+            shp_lbear_housing_top = shp_lbear_housing_top.removeSplitter() 
+
+
+            shp_box_bot = fcfun.shp_box_dir(
+                                         box_w = housing_w + 2,
+                                         box_d = housing_d + 2,
+                                         # larger, just in case
+                                         box_h = axis_h + 1,
+                                         fc_axis_h = nbot_ax,
+                                         fc_axis_d = nfro_ax,
+                                         cw= 1, cd=1, ch=0,
+                                         pos = axishouscenter_pos)
+            shp_lbear_housing_bot = shp_lbear_housing.common(shp_box_bot)
+            shp_lbear_housing_bot = shp_lbear_housing_bot.removeSplitter()
         fco_lbear_top = doc.addObject("Part::Feature", name + '_top') 
         fco_lbear_top.Shape = shp_lbear_housing_top
-
-
-        shp_box_bot = fcfun.shp_box_dir(
-                                     box_w = housing_w + 2,
-                                     box_d = housing_d + 2,
-                                     # larger, just in case
-                                     box_h = axis_h + 1,
-                                     fc_axis_h = nbot_ax,
-                                     fc_axis_d = nfro_ax,
-                                     cw= 1, cd=1, ch=0,
-                                     pos = axishouscenter_pos)
-        shp_lbear_housing_bot = shp_lbear_housing.common(shp_box_bot)
-        shp_lbear_housing_bot = shp_lbear_housing_bot.removeSplitter()
         fco_lbear_bot = doc.addObject("Part::Feature", name + '_bot') 
         fco_lbear_bot.Shape = shp_lbear_housing_bot
 
@@ -3814,8 +3966,8 @@ class ThinLinBearHouseAsim (object):
         self.fco_bot.Placement.Base = vpos
 
     def color (self, color = (1,1,1)):
-        self.fco_top.ViewObject.ShapeColor = color
-        self.fco_bot.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco_top, ShapeColor = color)
+        fcfun.set_fco_view(self.fco_bot, ShapeColor = color)
 
     def export_stl (self, name = ""):
         #filepath = os.getcwd()
@@ -3855,7 +4007,7 @@ class ThinLinBearHouseAsim (object):
 
 
 # ----------- NemaMotorHolder
-class NemaMotorHolder (object):
+class NemaMotorHolder (fc_clss.LeanShp):
 
     """
     Creates a holder for a Nema motor
@@ -3986,7 +4138,7 @@ class NemaMotorHolder (object):
                   wfco = 1,
                   name = 'nema_holder'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
 
         # normalize de axis
         axis_h = DraftVecUtils.scaleTo(fc_axis_h,1)
@@ -4188,12 +4340,14 @@ class NemaMotorHolder (object):
             fco_motorholder = doc.addObject("Part::Feature", name )
             fco_motorholder.Shape = shp_motorholder
             self.fco = fco_motorholder
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
 
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Object with no fco")
 
@@ -4543,6 +4697,10 @@ class ShpNemaMotorHolder (shp_clss.Obj3D):
         # calculates the position of the origin, and keeps it in attribute pos_o
         self.set_pos_o()
 
+        # the shape may have been built in another process, see fcsched
+        if self.take_prebuilt('ShpNemaMotorHolder', args, values):
+            return
+
         # make the whole box, extra height and depth to cut all the way
         # back and down:
         shp_box = fcfun.shp_box_dir (box_w = self.tot_w,
@@ -5260,13 +5418,13 @@ class Plate3CageCubes (object):
         shp_plate = shp_box.cut(shp_holes)
 
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         fco_plate =  doc.addObject("Part::Feature", name) 
         fco_plate.Shape = shp_plate
         self.fco = fco_plate
 
     def color (self, color = (1,1,1)):
-        self.fco.ViewObject.ShapeColor = color
+        fcfun.set_fco_view(self.fco, ShapeColor = color)
 
     # exports the shape to STL format
     def export_stl (self, name = ""):
@@ -5303,7 +5461,7 @@ class Plate3CageCubes (object):
 #                pos = V0,
 #                name = 'Plate3CageCubes')
 
-class hallestop_holder (object):
+class hallestop_holder (fc_clss.LeanShp):
 
 
     def __init__(self,
@@ -5326,7 +5484,7 @@ class hallestop_holder (object):
                  wfco=1,
                  name = 'holder'):
 
-        doc = FreeCAD.ActiveDocument
+        doc = fcfun.get_doc()
         self.name = name
         # bolt lin dimensions
         boltli_dict = kcomp.D912[bolt_base_d]
@@ -5519,10 +5677,12 @@ class hallestop_holder (object):
             fco_bracket = doc.addObject("Part::Feature", name )
             fco_bracket.Shape = shp_bracket
             self.fco = fco_bracket
+            if fc_clss.LEAN_SHP == 1:
+                self.release_shp()
 
     def color (self, color = (1,1,1)):
         if self.wfco == 1:
-            self.fco.ViewObject.ShapeColor = color
+            fcfun.set_fco_view(self.fco, ShapeColor = color)
         else:
             logger.debug("Bracket object with no fco")
         
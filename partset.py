@@ -38,6 +38,7 @@ import comps
 import shp_clss
 import fc_clss
 import parts
+import fcsched
 
 from fcfun import V0, VX, VY, VZ
 from fcfun import VXN, VYN, VZN
@@ -738,6 +739,73 @@ class Din934NutWashSet (fc_clss.PartsSet):
 
 
 
+def nema_motor_pulley_kwargs (nema_size, base_l, shaft_l, shaft_r,
+                              circle_r, circle_h, chmf_r, rear_shaft_l,
+                              bolt_depth,
+                              pulley_pitch, pulley_n_teeth, pulley_toothed_h,
+                              pulley_top_flange_h, pulley_bot_flange_h,
+                              pulley_tot_h, pulley_flange_d, pulley_base_d,
+                              axis_d, axis_w, axis_h, pos):
+    """ Arguments of the motor (comps.ShpNemaMotor) and of the pulley
+    (comps.ShpGtPulley) of NemaMotorPulleySet, so the shapes can be built
+    before the set (see fcsched). The parameters are the same as in
+    NemaMotorPulleySet, axis_w cannot be None
+
+    Returns:
+    --------
+    tuple (motor_kw, pulley_kw): dictionaries of the arguments
+    """
+    # normalized as in PartsSet
+    axis_d = DraftVecUtils.scaleTo(axis_d, 1)
+    axis_w = DraftVecUtils.scaleTo(axis_w, 1)
+    axis_h = DraftVecUtils.scaleTo(axis_h, 1)
+    # shaft diameter of the motor, as in comps.ShpNemaMotor
+    if shaft_r == 0:
+        shaft_d = kcomp.NEMA_SHAFT_D[nema_size]
+    else:
+        shaft_d = 2 * shaft_r
+
+    # the motor is created at pos_d=pos_w = 0, pos_h = 0
+    motor_kw = dict(nema_size = nema_size,
+                    base_l = base_l,
+                    shaft_l = shaft_l,
+                    shaft_r = shaft_r,
+                    circle_r = circle_r,
+                    circle_h = circle_h,
+                    chmf_r = chmf_r, 
+                    rear_shaft_l= rear_shaft_l,
+                    bolt_depth = bolt_depth,
+                    bolt_out  = 0,
+                    cut_extra = 0,
+                    axis_d = axis_d,
+                    axis_w = axis_w,
+                    axis_h = axis_h,
+                    pos_d = 0,
+                    pos_w = 0,
+                    pos_h = 0,
+                    pos = pos)
+
+    # the pulley is located at pos_d,w,h = 0
+    pulley_kw = dict(pitch = pulley_pitch,
+                     n_teeth = pulley_n_teeth,
+                     toothed_h = pulley_toothed_h,
+                     top_flange_h = pulley_top_flange_h,
+                     bot_flange_h = pulley_bot_flange_h,
+                     tot_h = pulley_tot_h,
+                     flange_d = pulley_flange_d,
+                     base_d = pulley_base_d,
+                     shaft_d = shaft_d,
+                     tol = 0,
+                     axis_d = axis_d,
+                     axis_w = axis_w,
+                     axis_h = axis_h,
+                     pos_d = 0,
+                     pos_w = 0,
+                     pos_h = 0,
+                     pos = pos)
+    return (motor_kw, pulley_kw)
+
+
 class NemaMotorPulleySet (fc_clss.PartsSet):
     """ Set composed of a Nema Motor and a pulley
 
@@ -825,6 +893,10 @@ class NemaMotorPulleySet (fc_clss.PartsSet):
         0:  it is at the base of the shaft
         -1: the top of the pulley will be aligned with the end of the shaft
 
+    sched : int
+        1: the shapes of the motor and the pulley are built in parallel, in
+           the pool of processes of fcsched
+
     pos_d: int
         location of pos along the axis_d  see drawing
            Locations coinciding with the motor
@@ -891,7 +963,8 @@ class NemaMotorPulleySet (fc_clss.PartsSet):
                   pos_h = 1,
                   pos = V0,
                   group = 1,
-                  name = ''):
+                  name = '',
+                  sched = 0):
 
         default_name = 'nema' + str(nema_size) + '_pulley_set'
         self.set_name (name, default_name, change=0)
@@ -916,8 +989,7 @@ class NemaMotorPulleySet (fc_clss.PartsSet):
 
         # creation of the motor, we don't know all the relative positions
         # so we create it at pos_d=pos_w = 0, pos_h = 1
-
-        nema_motor = comps.PartNemaMotor (
+        motor_kw, pulley_kw = nema_motor_pulley_kwargs(
                               nema_size = nema_size,
                               base_l = base_l,
                               shaft_l = shaft_l,
@@ -927,15 +999,25 @@ class NemaMotorPulleySet (fc_clss.PartsSet):
                               chmf_r = chmf_r, 
                               rear_shaft_l= rear_shaft_l,
                               bolt_depth = bolt_depth,
-                              bolt_out  = 0,
-                              cut_extra = 0,
-                              axis_d = self.axis_d,
-                              axis_w = self.axis_w,
-                              axis_h = self.axis_h,
-                              pos_d = 0,
-                              pos_w = 0,
-                              pos_h = 0,
+                              pulley_pitch = pulley_pitch,
+                              pulley_n_teeth = pulley_n_teeth,
+                              pulley_toothed_h = pulley_toothed_h,
+                              pulley_top_flange_h = pulley_top_flange_h,
+                              pulley_bot_flange_h = pulley_bot_flange_h,
+                              pulley_tot_h = pulley_tot_h,
+                              pulley_flange_d = pulley_flange_d,
+                              pulley_base_d = pulley_base_d,
+                              axis_d = axis_d,
+                              axis_w = axis_w,
+                              axis_h = axis_h,
                               pos = pos)
+        if sched == 1:
+            fcsched.run_tasks(
+                   [fcsched.ShpTask('motor', 'comps', 'ShpNemaMotor', motor_kw),
+                    fcsched.ShpTask('pulley', 'comps', 'ShpGtPulley',
+                                    pulley_kw)])
+
+        nema_motor = comps.PartNemaMotor (**motor_kw)
 
         self.append_part(nema_motor)
         nema_motor.parent = self
@@ -945,25 +1027,9 @@ class NemaMotorPulleySet (fc_clss.PartsSet):
         self.circle_h = nema_motor.circle_h
 
         # creation of the pulley. Locate it at pos_d,w,h = 0
-        gt_pulley = comps.PartGtPulley (
-                              pitch = pulley_pitch,
-                              n_teeth = pulley_n_teeth,
-                              toothed_h = pulley_toothed_h,
-                              top_flange_h = pulley_top_flange_h,
-                              bot_flange_h = pulley_bot_flange_h,
-                              tot_h = pulley_tot_h,
-                              flange_d = pulley_flange_d,
-                              base_d = pulley_base_d,
-                              shaft_d = 2 * self.shaft_r,
-                              tol = 0,
-                              axis_d = self.axis_d,
-                              axis_w = self.axis_w,
-                              axis_h = self.axis_h,
-                              pos_d = 0,
-                              pos_w = 0,
-                              pos_h = 0,
-                              pos = pos,
-                              model_type = 1) # dimensional model
+        # its shaft_d is 2 * self.shaft_r
+        gt_pulley = comps.PartGtPulley (model_type = 1, # dimensional model
+                                        **pulley_kw)
 
         if pulley_pos_h < 0: #top of the pulley aligned with top of the shaft
             # shaft_l includes the length of the circle
@@ -1204,6 +1270,10 @@ class NemaMotorPulleyHolderSet (fc_clss.PartsSet):
         12: top of pulley toothed part
         13: end of pulley
 
+    sched : int
+        1: the shapes of the motor, the pulley and the holder are built in
+           parallel, in the pool of processes of fcsched
+
 
     """
 
@@ -1250,7 +1320,8 @@ class NemaMotorPulleyHolderSet (fc_clss.PartsSet):
                   pos_h = 1,
                   pos = V0,
                   group = 0,
-                  name = ''):
+                  name = '',
+                  sched = 0):
 
 
         default_name = 'nema_' + str(nema_size) + 'holer_motor_pulley_set'
@@ -1275,6 +1346,58 @@ class NemaMotorPulleyHolderSet (fc_clss.PartsSet):
         self.w0_cen = 1 #symmetric
         self.h0_cen = 0
 
+        # arguments of the shape of the holder
+        holder_kw = dict(nema_size = nema_size,
+                         wall_thick = hold_wall_thick,
+                         motorside_thick = hold_motorside_thick,
+                         reinf_thick = hold_reinf_thick,
+                         motor_min_h = hold_rail_min_h,
+                         motor_max_h = hold_rail_max_h,
+                         rail = hold_rail, 
+                         motor_xtr_space = hold_motor_xtr_space,
+                         bolt_wall_d = hold_bolt_wall_d,
+                         bolt_wall_sep = hold_bolt_wall_sep,
+                         chmf_r = hold_chmf_r,
+                         axis_h = axis_h.negative(), #pointing down
+                         axis_d = axis_d,
+                         axis_w = axis_w,
+                         # at the point of union with the motor
+                         pos_h = 0,
+                         pos_d = 0,
+                         pos_w = 0,
+                         pos = pos)
+
+        if sched == 1:
+            # the 3 shapes at the same time, the motor set doesn't build them
+            motor_kw, pulley_kw = nema_motor_pulley_kwargs(
+                  nema_size = nema_size,
+                  base_l = motor_base_l,
+                  shaft_l = motor_shaft_l,
+                  shaft_r = motor_shaft_r,
+                  circle_r = motor_circle_r,
+                  circle_h = motor_circle_h,
+                  chmf_r = motor_chmf_r, 
+                  rear_shaft_l = motor_rear_shaft_l,
+                  bolt_depth = motor_bolt_depth,
+                  pulley_pitch = pulley_pitch,
+                  pulley_n_teeth = pulley_n_teeth,
+                  pulley_toothed_h = pulley_toothed_h,
+                  pulley_top_flange_h = pulley_top_flange_h,
+                  pulley_bot_flange_h = pulley_bot_flange_h,
+                  pulley_tot_h = pulley_tot_h,
+                  pulley_flange_d = pulley_flange_d,
+                  pulley_base_d = pulley_base_d,
+                  axis_d = axis_d,
+                  axis_w = axis_w,
+                  axis_h = axis_h,
+                  pos = pos)
+            fcsched.run_tasks(
+                   [fcsched.ShpTask('motor', 'comps', 'ShpNemaMotor', motor_kw),
+                    fcsched.ShpTask('pulley', 'comps', 'ShpGtPulley',
+                                    pulley_kw),
+                    fcsched.ShpTask('holder', 'parts', 'ShpNemaMotorHolder',
+                                    holder_kw)])
+
         # creation of the motor with pulley
         nema_motor_pulley = NemaMotorPulleySet (
                   # motor parameters
@@ -1310,26 +1433,7 @@ class NemaMotorPulleyHolderSet (fc_clss.PartsSet):
         self.append_part(nema_motor_pulley)
         nema_motor_pulley.parent = self
 
-        nema_holder = parts.PartNemaMotorHolder(
-                  nema_size = nema_size,
-                  wall_thick = hold_wall_thick,
-                  motorside_thick = hold_motorside_thick,
-                  reinf_thick = hold_reinf_thick,
-                  motor_min_h = hold_rail_min_h,
-                  motor_max_h = hold_rail_max_h,
-                  rail = hold_rail, 
-                  motor_xtr_space = hold_motor_xtr_space,
-                  bolt_wall_d = hold_bolt_wall_d,
-                  bolt_wall_sep = hold_bolt_wall_sep,
-                  chmf_r = hold_chmf_r,
-                  axis_h = axis_h.negative(), #pointing down
-                  axis_d = axis_d,
-                  axis_w = axis_w,
-                  #pos_h = 0, # at the point of union with the motor
-                  pos_h = 0, # at the point of union with the motor
-                  pos_d = 0,
-                  pos_w = 0,
-                  pos = pos)
+        nema_holder = parts.PartNemaMotorHolder(**holder_kw)
 
         self.append_part(nema_holder)
         nema_holder.parent = self
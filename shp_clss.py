@@ -34,6 +34,63 @@ from fcfun import VXN, VYN, VZN
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# shapes that have been built in other processes (see fcsched), to be taken
+# by the object that would build them. See Obj3D.take_prebuilt
+PREBUILT_SHP = {}
+
+
+def prebuilt_key (cls_name, args, values):
+    """ Key of a shape in PREBUILT_SHP: the name of the class and the
+    arguments of its __init__
+
+    Parameters:
+    -----------
+    cls_name : str
+        name of the class that builds the shape
+    args, values :
+        from inspect.getargvalues of the __init__ of the class
+
+    Returns:
+    --------
+    str
+    """
+    return cls_name + repr([(arg, values[arg]) for arg in args
+                            if arg != 'self'])
+
+
+def init_args (obj, frame):
+    """ Classes of obj whose __init__ is being called, and the arguments
+    they have been called with. From the frame that calls Obj3D.__init__
+    outwards, so it only takes the __init__ that are nested calls on obj
+
+    Parameters:
+    -----------
+    obj : Obj3D
+        object that is being created
+    frame : frame
+        frame that calls Obj3D.__init__
+
+    Returns:
+    --------
+    list of tuples (cls, args), from the inner to the outer __init__
+        cls : class of the __init__
+        args : dict with the arguments of the __init__ (not self)
+    """
+    init_code = {}
+    for cls in type(obj).__mro__:
+        init = cls.__dict__.get('__init__')
+        if hasattr(init, '__code__'):
+            init_code[init.__code__] = cls
+    init_list = []
+    while frame is not None and frame.f_code in init_code:
+        args, _, _, values = inspect.getargvalues(frame)
+        if values.get(args[0]) is not obj:
+            break
+        init_list.append((init_code[frame.f_code],
+                          dict((arg, values[arg]) for arg in args[1:])))
+        frame = frame.f_back
+    return init_list
+
 
 class Obj3D (object):
     """ This is the the basic class, that provides reference axes and 
@@ -57,9 +114,24 @@ class Obj3D (object):
     pos_o_adjustment : FreeCAD.Vector
         if not V0 indicates that shape has not been placed at pos_o, so the FreeCAD object
         will need to be placed at pos_o_adjust
+
+    shp_init : list of tuples (cls, args)
+        the classes whose __init__ have built the object, and their
+        arguments, to build the shape again. See init_args. Only recorded
+        when fc_clss.LEAN_SHP == 1 (the shapes can be released), empty
+        if not, the arguments are not kept alive
             
     """
     def __init__(self, axis_d = None, axis_w = None, axis_h = None):
+        # the arguments of the classes that are building the object.
+        # fc_clss imports this module, it is taken from sys.modules
+        self.shp_init = []
+        fc_clss = sys.modules.get('fc_clss')
+        if fc_clss is not None and fc_clss.LEAN_SHP == 1:
+            frame = inspect.currentframe().f_back
+            self.shp_init = init_args(self, frame)
+            del frame
+
         # the TopoShape has an origin, and distance vectors from it to 
         # the different points along the coordinate system  
         self.d_o = {}  # along axis_d
@@ -380,6 +452,32 @@ class Obj3D (object):
         """
         return self.get_h_pos_o() + self.get_o_to_h(pos_h)
 
+    def take_prebuilt(self, cls_name, args, values):
+        """ Takes the shape if it has been built in another process
+        (see fcsched). To be called once the points (d_o, w_o, h_o) and pos_o
+        are calculated, before building the shape.
+        The key is kept in attribute shp_key, so the process that builds
+        the shape can send it with the shape
+
+        Parameters:
+        -----------
+        cls_name : str
+            name of the class that builds the shape
+        args, values :
+            from inspect.getargvalues of the __init__ of the class
+
+        Returns:
+        --------
+        1: the shape has been taken, it is in attribute shp
+        0: the shape has to be built
+        """
+        self.shp_key = prebuilt_key(cls_name, args, values)
+        shp = PREBUILT_SHP.pop(self.shp_key, None)
+        if shp is None:
+            return 0
+        self.shp = shp
+        return 1
+
 
 
 
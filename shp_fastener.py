@@ -0,0 +1,459 @@
+# ----------------------------------------------------------------------------
+# -- Fastener tools
+# -- comps library
+# -- Shapes (not FreeCAD objects) of the holes for bolts and nuts, made once
+# -- for each size, and then placed as many times as needed
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Each tool is made at the origin, with its own axes, by the same functions
+# of fcfun (shp_boltnut_dir_hole, ...), and kept in TOOL_CACHE.
+# To place a tool, a copy of the cached shape is moved with its Placement,
+# so the geometry is not made again.
+# The placed tools can be put together in a compound, and be cut from the
+# piece in one boolean difference
+#
+# The tools are made to be cut, they are not the final shape, so they are
+# moved changing their Placement. Do not use them as the shape of a FreeCAD
+# object
+#
+# If TOOL_CACHE_DIR is set (set_tool_cache_dir), the tools are also saved
+# there as BREP files, so the next sessions read them instead of making
+# them again. The name of the file includes a hash of the source code of
+# fcfun, the modules it takes the rotations from (fcrot, fcaxis) and this
+# module, so if they change, the tools are made again
+#
+# Axes of the tools at the origin:
+#
+#       bolt and nut (shp_boltnut_tool):
+#
+#          Z: axis of the bolt (fc_normal)
+#          :
+#         _:_
+#        |   |
+#        |   |
+#       _| * |_ ...X: first vertex of
+#      |       |      the hexagons
+#      |_______|
+#
+
+import os
+import sys
+import hashlib
+import logging
+import FreeCAD
+import Part
+import DraftVecUtils
+
+# directory this file is
+filepath = os.getcwd()
+# to get the components
+# In FreeCAD can be added: Preferences->General->Macro->Macro path
+sys.path.append(filepath)
+
+import kcomp
+import fcrot
+import fcaxis
+import fcfun
+
+from fcfun import V0, VX, VY, VZ
+
+
+logger = logging.getLogger(__name__)
+
+# cache of the tools at the origin. The key is the name of the function that
+# makes the tool and its arguments
+TOOL_CACHE = {}
+
+# directory to save the tools as BREP files. Empty: not saved on disk
+TOOL_CACHE_DIR = ''
+
+# hash of the source code that makes the tools, see get_source_hash
+_SOURCE_HASH = ''
+
+
+def tool_cache_clear (disk = 0):
+    """ Empties the cache of tools, for example, if kcomp.LAYER3D_H has
+    been changed
+
+    Parameters:
+    -----------
+    disk : int
+        1: the BREP files of TOOL_CACHE_DIR are also deleted
+    """
+    TOOL_CACHE.clear()
+    if disk == 1 and TOOL_CACHE_DIR and os.path.isdir(TOOL_CACHE_DIR):
+        for filename in os.listdir(TOOL_CACHE_DIR):
+            if filename.startswith('tool_') and filename.endswith('.brep'):
+                os.remove(os.path.join(TOOL_CACHE_DIR, filename))
+
+
+def set_tool_cache_dir (path):
+    """ Sets the directory to save the tools as BREP files. It is created
+    if it doesn't exist
+
+    Parameters:
+    -----------
+    path : str
+        Directory, empty to not save the tools on disk
+    """
+    global TOOL_CACHE_DIR
+    if path and not os.path.isdir(path):
+        os.makedirs(path)
+    TOOL_CACHE_DIR = path
+
+
+def get_source_hash ():
+    """ Gets a hash of the source code of fcfun, fcrot, fcaxis and this
+    module, that are the ones that make the tools
+    """
+    global _SOURCE_HASH
+    if not _SOURCE_HASH:
+        src_hash = hashlib.sha1()
+        for module in (fcfun, fcrot, fcaxis, sys.modules[__name__]):
+            src_path = os.path.splitext(module.__file__)[0] + '.py'
+            with open(src_path, 'rb') as src_file:
+                src_hash.update(src_file.read())
+        _SOURCE_HASH = src_hash.hexdigest()
+    return _SOURCE_HASH
+
+
+def get_tool_path (key):
+    """ Gets the path of the BREP file of a tool
+
+    Parameters:
+    -----------
+    key : tuple
+        key of the tool in TOOL_CACHE
+
+    Returns:
+    --------
+    str: path of the file, empty if TOOL_CACHE_DIR is not set
+    """
+    if not TOOL_CACHE_DIR:
+        return ''
+    key_hash = hashlib.sha1((get_source_hash() + repr(key)).encode('utf-8'))
+    return os.path.join(TOOL_CACHE_DIR,
+                        'tool_' + key[0] + '_' + key_hash.hexdigest() + '.brep')
+
+
+def get_tool (key, make_tool):
+    """ Gets a tool from the cache, first from memory (TOOL_CACHE), then
+    from the BREP files (TOOL_CACHE_DIR), and if it is in neither of them,
+    it is made and saved in both
+
+    Parameters:
+    -----------
+    key : tuple
+        First element is the name of the tool, and then all the values
+        that change its shape
+    make_tool : function without arguments that makes the tool
+
+    Returns:
+    --------
+    TopoShape: the tool, do not modify it
+    """
+    try:
+        return TOOL_CACHE[key]
+    except KeyError:
+        pass
+    tool_path = get_tool_path(key)
+    if tool_path and os.path.isfile(tool_path):
+        shp_tool = Part.Shape()
+        shp_tool.importBrep(tool_path)
+    else:
+        shp_tool = make_tool()
+        if tool_path:
+            # write to a temporary file, in case other process is reading it
+            tmp_path = tool_path + '.' + str(os.getpid()) + '.tmp'
+            shp_tool.exportBrep(tmp_path)
+            os.replace(tmp_path, tool_path)
+    TOOL_CACHE[key] = shp_tool
+    return shp_tool
+
+
+def fc_matrix_axes (fc_axis_x = VX, fc_axis_z = VZ, pos = V0):
+    """ Gets the FreeCAD.Matrix that takes axis X to fc_axis_x, axis Z to
+    fc_axis_z and the origin to pos
+
+    Parameters:
+    -----------
+    fc_axis_x : FreeCAD.Vector
+        Where axis X goes. Perpendicular to fc_axis_z. Doesn't have to be
+        normalized
+    fc_axis_z : FreeCAD.Vector
+        Where axis Z goes. Doesn't have to be normalized
+    pos : FreeCAD.Vector
+        Where the origin goes
+
+    Returns:
+    --------
+    FreeCAD.Matrix
+    """
+    naxis_x = DraftVecUtils.scaleTo(fc_axis_x, 1)
+    naxis_z = DraftVecUtils.scaleTo(fc_axis_z, 1)
+    if not fcfun.fc_isperp(naxis_x, naxis_z):
+        logger.error('Vectors are not perpendicular')
+    naxis_y = naxis_z.cross(naxis_x)
+    return FreeCAD.Matrix(naxis_x.x, naxis_y.x, naxis_z.x, pos.x,
+                          naxis_x.y, naxis_y.y, naxis_z.y, pos.y,
+                          naxis_x.z, naxis_y.z, naxis_z.z, pos.z,
+                          0, 0, 0, 1)
+
+
+def shp_tool_place (shp_tool, fc_axis_x = VX, fc_axis_z = VZ, pos = V0):
+    """ Gets a copy of a tool made at the origin, placed at pos with
+    its axis X on fc_axis_x and its axis Z on fc_axis_z
+
+    Parameters:
+    -----------
+    shp_tool : TopoShape
+        The tool at the origin, it is not modified
+    fc_axis_x : FreeCAD.Vector
+    fc_axis_z : FreeCAD.Vector
+    pos : FreeCAD.Vector
+
+    Returns:
+    --------
+    TopoShape
+    """
+    shp_placed = shp_tool.copy()
+    shp_placed.Placement = FreeCAD.Placement(
+                                fc_matrix_axes(fc_axis_x, fc_axis_z, pos))
+    return shp_placed
+
+
+def shp_tool_compound (shp_tool, place_list):
+    """ Places a tool made at the origin in many positions, and makes
+    a compound of all of them, to be cut in one operation
+
+    Parameters:
+    -----------
+    shp_tool : TopoShape
+        The tool at the origin, it is not modified
+    place_list : list of tuples (fc_axis_x, fc_axis_z, pos)
+        See shp_tool_place
+
+    Returns:
+    --------
+    TopoShape: a compound with all the tools placed
+    """
+    return Part.makeCompound([shp_tool_place(shp_tool, axis_x, axis_z, pos)
+                              for axis_x, axis_z, pos in place_list])
+
+
+def shp_cut_tools (shp, shp_tool_list):
+    """ Cuts from shp all the tools of the list in one operation
+
+    Parameters:
+    -----------
+    shp : TopoShape
+        The shape to be cut
+    shp_tool_list : list of TopoShape
+        The tools (or compounds of tools) to cut
+
+    Returns:
+    --------
+    TopoShape: shp without the tools
+    """
+    return shp.cut(Part.makeCompound(shp_tool_list))
+
+
+# ---------------------- bolt with the nut trap
+
+def get_verx1 (fc_normal, fc_verx1 = V0):
+    """ Gets the direction of the first vertex of the hexagons of a bolt,
+    the same way fcfun.shp_boltnut_dir_hole does: if fc_verx1 is not
+    perpendicular to fc_normal (or it is null), one perpendicular direction
+    is taken
+
+    Returns:
+    --------
+    FreeCAD.Vector normalized
+    """
+    nnormal = DraftVecUtils.scaleTo(fc_normal, 1)
+    if not fcfun.fc_isperp(nnormal, fc_verx1):
+        return fcfun.get_fc_perpend1(nnormal)
+    else:
+        return DraftVecUtils.scaleTo(fc_verx1, 1)
+
+
+def shp_boltnut_tool (r_shank,     l_bolt,
+                      r_head,      l_head,
+                      r_nut,       l_nut,
+                      hex_head = 0,
+                      xtr_head = 1, xtr_nut = 1,
+                      supp_head = 1, supp_nut = 1,
+                      headstart = 1):
+    """ Gets the shape of the hole of a bolt with its nut at the origin,
+    the same as fcfun.shp_boltnut_dir_hole with fc_normal = VZ,
+    fc_verx1 = VX and pos = V0.
+    The shape is made only once for each set of arguments (and
+    kcomp.LAYER3D_H, that is used for the supports), see get_tool.
+    Do not modify it, use shp_tool_place or shp_tool_compound to get
+    copies in their places, with fc_axis_x = verx1 (see get_verx1) and
+    fc_axis_z = fc_normal
+
+    Parameters:
+    -----------
+    See fcfun.shp_boltnut_dir_hole
+
+    Returns:
+    --------
+    TopoShape
+    """
+    key = ('shp_boltnut_tool', r_shank, l_bolt, r_head, l_head, r_nut, l_nut,
+           hex_head, xtr_head, xtr_nut, supp_head, supp_nut, headstart,
+           kcomp.LAYER3D_H)
+    return get_tool(key, lambda: fcfun.shp_boltnut_dir_hole(
+                                              r_shank = r_shank,
+                                              l_bolt = l_bolt,
+                                              r_head = r_head,
+                                              l_head = l_head,
+                                              r_nut = r_nut,
+                                              l_nut = l_nut,
+                                              hex_head = hex_head,
+                                              xtr_head = xtr_head,
+                                              xtr_nut = xtr_nut,
+                                              supp_head = supp_head,
+                                              supp_nut = supp_nut,
+                                              headstart = headstart,
+                                              fc_normal = VZ,
+                                              fc_verx1 = VX,
+                                              pos = V0))
+
+
+def shp_boltnut_dir_hole_compound (r_shank,     l_bolt,
+                                   r_head,      l_head,
+                                   r_nut,       l_nut,
+                                   pos_list,
+                                   hex_head = 0,
+                                   xtr_head = 1, xtr_nut = 1,
+                                   supp_head = 1, supp_nut = 1,
+                                   headstart = 1,
+                                   fc_normal = VZ, fc_verx1 = V0):
+    """ Compound of holes for bolts and nuts, as
+    fcfun.shp_boltnut_dir_hole in each position of pos_list, all with the
+    same direction
+
+    Parameters:
+    -----------
+    pos_list : list of FreeCAD.Vector
+        the positions, as argument pos of fcfun.shp_boltnut_dir_hole
+    The rest: see fcfun.shp_boltnut_dir_hole
+
+    Returns:
+    --------
+    TopoShape: compound
+    """
+    shp_tool = shp_boltnut_tool(r_shank, l_bolt, r_head, l_head, r_nut, l_nut,
+                                hex_head = hex_head,
+                                xtr_head = xtr_head, xtr_nut = xtr_nut,
+                                supp_head = supp_head, supp_nut = supp_nut,
+                                headstart = headstart)
+    nverx1 = get_verx1(fc_normal, fc_verx1)
+    return shp_tool_compound(shp_tool,
+                             [(nverx1, fc_normal, pos) for pos in pos_list])
+
+
+def shp_boltnut_dir_hole (r_shank,        l_bolt, 
+                          r_head,         l_head,
+                          r_nut,          l_nut,
+                          hex_head=0,   
+                          xtr_head=1,     xtr_nut=1,
+                          supp_head=1,    supp_nut=1,
+                          headstart=1,    
+                          fc_normal = VZ, fc_verx1=V0,
+                          pos = V0):
+    """ Same as fcfun.shp_boltnut_dir_hole, but the tool is taken from
+    the cache (shp_boltnut_tool) and placed, so it is only made once for
+    each size. The shape returned has a Placement, it is to be cut
+
+    Parameters:
+    -----------
+    See fcfun.shp_boltnut_dir_hole
+    """
+    shp_tool = shp_boltnut_tool(r_shank, l_bolt, r_head, l_head, r_nut, l_nut,
+                                hex_head = hex_head,
+                                xtr_head = xtr_head, xtr_nut = xtr_nut,
+                                supp_head = supp_head, supp_nut = supp_nut,
+                                headstart = headstart)
+    return shp_tool_place(shp_tool,
+                          fc_axis_x = get_verx1(fc_normal, fc_verx1),
+                          fc_axis_z = fc_normal,
+                          pos = pos)
+
+
+# ---------------------- bolts
+
+def shp_bolt_tool (r_shank, l_bolt, r_head, l_head,
+                   hex_head = 0,
+                   xtr_head = 1,
+                   xtr_shank = 1,
+                   support = 1,
+                   pos_n = 0):
+    """ Gets the shape of the hole of a bolt at the origin,
+    the same as fcfun.shp_bolt_dir with fc_normal = VZ,
+    fc_verx1 = VX and pos = V0.
+    The shape is made only once for each set of arguments (and
+    kcomp.LAYER3D_H, that is used for the supports), see get_tool.
+    Do not modify it, use shp_tool_place or shp_tool_compound to get
+    copies in their places, with fc_axis_x = verx1 (see get_verx1) and
+    fc_axis_z = fc_normal
+
+    Parameters:
+    -----------
+    See fcfun.shp_bolt_dir
+
+    Returns:
+    --------
+    TopoShape
+    """
+    key = ('shp_bolt_tool', r_shank, l_bolt, r_head, l_head, hex_head,
+           xtr_head, xtr_shank, support, pos_n, kcomp.LAYER3D_H)
+    return get_tool(key, lambda: fcfun.shp_bolt_dir(r_shank = r_shank,
+                                                    l_bolt = l_bolt,
+                                                    r_head = r_head,
+                                                    l_head = l_head,
+                                                    hex_head = hex_head,
+                                                    xtr_head = xtr_head,
+                                                    xtr_shank = xtr_shank,
+                                                    support = support,
+                                                    fc_normal = VZ,
+                                                    fc_verx1 = VX,
+                                                    pos_n = pos_n,
+                                                    pos = V0))
+
+
+def shp_bolt_dir (r_shank, l_bolt, r_head, l_head,
+                  hex_head = 0,
+                  xtr_head=1,
+                  xtr_shank=1,
+                  support=1,
+                  fc_normal = VZ,
+                  fc_verx1 = VX,
+                  pos_n = 0,
+                  pos = V0):
+    """ Same as fcfun.shp_bolt_dir, but the tool is taken from the cache
+    (shp_bolt_tool) and placed, so it is only made once for each size.
+    The shape returned has a Placement, it is to be cut
+
+    Parameters:
+    -----------
+    See fcfun.shp_bolt_dir
+    """
+    shp_tool = shp_bolt_tool(r_shank, l_bolt, r_head, l_head,
+                             hex_head = hex_head,
+                             xtr_head = xtr_head,
+                             xtr_shank = xtr_shank,
+                             support = support,
+                             pos_n = pos_n)
+    return shp_tool_place(shp_tool,
+                          fc_axis_x = get_verx1(fc_normal, fc_verx1),
+                          fc_axis_z = fc_normal,
+                          pos = pos)
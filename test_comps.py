@@ -20,7 +20,6 @@
 import os
 import sys
 import FreeCAD;
-import FreeCADGui;
 import Part;
 import Draft;
 import logging  # to avoid using print statements
@@ -157,9 +156,11 @@ T8moved.fco.Placement.Rotation = fcfun.calc_rot (
                                             vec2 = (-1,0,0))
 
 
-Gui.ActiveDocument = Gui.getDocument(doc.Label)
-guidoc = Gui.getDocument(doc.Label)
-Gui.ActiveDocument.ActiveView.setAxisCross(True)
+if FreeCAD.GuiUp:
+    import FreeCADGui as Gui
+    Gui.ActiveDocument = Gui.getDocument(doc.Label)
+    guidoc = Gui.getDocument(doc.Label)
+    Gui.ActiveDocument.ActiveView.setAxisCross(True)
 
 doc.recompute()
 
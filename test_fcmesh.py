@@ -0,0 +1,76 @@
+# ----------------------------------------------------------------------------
+# -- Test Mesh arrays
+# -- Test the meshes of fcmesh and their round trip through shared memory
+# ----------------------------------------------------------------------------
+# -- (c) Felipe Machado
+# -- Area of Electronic Technology. Rey Juan Carlos University (urjc.es)
+# -- https://github.com/felipe-m/fcad-comps
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# to test the meshes of fcmesh, execute from the command line on the
+# directory of the library:
+# freecadcmd test_fcmesh.py
+# It needs NumPy. It stops in the first assertion that fails
+
+import os
+import sys
+import logging
+
+import numpy as np
+
+import FreeCAD
+import Part
+
+filepath = os.getcwd()
+sys.path.append(filepath)
+
+import fcmesh
+
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+
+def mesh_round_trip (mesh):
+    """ Publishes a mesh in shared memory, attaches to it and checks that
+    the arrays are the same. The blocks are released at the end
+    """
+    mesh_desc = fcmesh.publish_mesh(mesh)
+    mesh_shm, shm_list = fcmesh.attach_mesh(mesh_desc)
+    try:
+        for arr, arr_shm in zip(mesh, mesh_shm):
+            assert arr_shm.shape == arr.shape
+            assert arr_shm.dtype == arr.dtype
+            assert np.array_equal(arr_shm, arr)
+    finally:
+        # the blocks can't be closed while there are arrays on them
+        mesh_shm = arr_shm = None
+        fcmesh.release_mesh(shm_list, unlink = 1)
+
+
+# empty mesh: an empty compound, and no meshes
+mesh_empty = fcmesh.shp_mesh_arrays(Part.makeCompound([]))
+assert [arr.shape for arr in mesh_empty] == [(0, 3), (0, 3), (0, 3)]
+mesh_round_trip(mesh_empty)
+mesh_round_trip(fcmesh.concat_mesh([]))
+
+# box: 8 vertices merged, 12 triangles
+shp_box = Part.makeBox(10, 20, 30)
+vertices, triangles, normals = fcmesh.shp_mesh_arrays(shp_box)
+assert vertices.shape == (8, 3)
+assert triangles.shape == (12, 3)
+assert np.allclose(np.linalg.norm(normals, axis = 1), 1.)
+mesh_round_trip((vertices, triangles, normals))
+
+# not merged: each face has its own 4 vertices
+vertices_face = fcmesh.shp_mesh_arrays(shp_box, merge = 0)[0]
+assert vertices_face.shape == (24, 3)
+
+# two boxes
+mesh_2box = fcmesh.concat_mesh([(vertices, triangles, normals),
+                                (vertices + 50., triangles, normals)])
+assert mesh_2box[1].max() == 15
+mesh_round_trip(mesh_2box)
+
+logger.info('fcmesh tests passed')